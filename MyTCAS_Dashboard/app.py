@@ -1,18 +1,11 @@
 # app.py - ไฟล์หลักของแอป
 
 import dash
-from dash import html
-from config import COLORS
 from data_utils import load_and_clean_data
-from layout import (
-    create_header, 
-    create_filters, 
-    create_map_section, 
-    create_details_section,
-    create_statistics_section, 
-    create_charts_section
-)
+from layout import create_layout, serve_layout
 from callbacks import register_callbacks
+from compression import install_compression
+from config import COMPRESSION_CONFIG
 
 # โหลดข้อมูล
 df_clean = load_and_clean_data()
@@ -21,39 +14,14 @@ df_clean = load_and_clean_data()
 app = dash.Dash(__name__, external_stylesheets=['assets/custom.css'])
 
 # กำหนด Layout หลัก
-app.layout = html.Div([
-    # Container หลักพร้อมพื้นหลัง gradient
-    html.Div([
-        # ส่วนหัว
-        create_header(),
-        
-        # ส่วนกรองข้อมูล
-        create_filters(df_clean),
-        
-        # เนื้อหาหลัก
-        html.Div([
-            # แถวแผนที่และรายละเอียด
-            html.Div([
-                create_map_section(),
-                create_details_section()
-            ], style={'marginBottom': '32px'}),
-            
-            # แถววิเคราะห์ข้อมูล
-            html.Div([
-                create_statistics_section(),
-                create_charts_section()
-            ])
-        ], className="fade-in")
-    ], style={
-        'background': COLORS['background'],
-        'minHeight': '100vh',
-        'padding': '40px 20px',
-        'fontFamily': "'Inter', -apple-system, BlinkMacSystemFont, sans-serif"
-    })
-], style={'margin': '0', 'padding': '0'})
+app.layout = serve_layout(create_layout(df_clean))
 
 # ลงทะเบียน callbacks
-register_callbacks(app, df_clean)
+filter_cache = register_callbacks(app, df_clean)
+
+# บีบอัด response (ติดตั้งหลัง register_callbacks เพื่อให้ metrics เห็นขนาดทั้งก่อนและหลังบีบอัด)
+if COMPRESSION_CONFIG['enabled']:
+    install_compression(app.server)
 
 # รันแอป
 if __name__ == '__main__':
@@ -0,0 +1,125 @@
+# artifact.py - เก็บข้อมูลที่ทำความสะอาดแล้วเป็นไฟล์ Feather (Arrow IPC) เพื่อให้แอปเริ่มเร็ว
+
+import hashlib
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow ไม่ได้ติดตั้ง แอปจะอ่านจาก CSV เหมือนเดิม
+    pa = None
+
+from config import DATA_CONFIG, REGION_CONFIG, PROGRAM_CONFIG, MAP_CONFIG
+
+# เพิ่มเลขนี้เมื่อเปลี่ยนวิธีคำนวณคอลัมน์ใน load_and_clean_data เพื่อให้ไฟล์เก่าถือว่าล้าสมัย
+ARTIFACT_VERSION = '2'
+
+# คอลัมน์ข้อความที่ค่าไม่ซ้ำกัน ไม่ต้องเก็บแบบ dictionary
+UNIQUE_TEXT_COLUMNS = ['unique_id', 'hover_text']
+
+# คอลัมน์ที่ถูกนับและจัดกลุ่ม (value_counts/nunique) แปลงกลับเป็นข้อความตอนโหลด
+# value_counts ของ categorical นับค่าที่ไม่มีในผลกรองเป็น 0 และเรียงตามลำดับ category แทนลำดับที่พบ
+# คอลัมน์ข้อความอื่นใช้แสดงผลเท่านั้น จึงคงเป็น categorical (ไม่ copy และใช้หน่วยความจำน้อยกว่า)
+OBJECT_COLUMNS = ['มหาวิทยาลัย', 'program_type']
+
+METADATA_KEY = b'tcas_artifact'
+
+def file_sha256(path):
+    """sha256 ของไฟล์"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def config_fingerprint():
+    """hash ของการตั้งค่าที่มีผลต่อคอลัมน์ที่คำนวณตอนโหลดข้อมูล
+
+    รวม sha256 ของไฟล์ขอบเขตภูมิภาค (ถ้ามี) แก้เนื้อหาไฟล์แล้ว artifact จึงล้าสมัยด้วย
+    """
+    boundary_file = REGION_CONFIG['boundary_file']
+    settings = {
+        'tuition_column': DATA_CONFIG['tuition_column'],
+        'region': REGION_CONFIG,
+        'boundary_sha256': file_sha256(boundary_file) if boundary_file and os.path.exists(boundary_file) else None,
+        'program': PROGRAM_CONFIG,
+        'offset_radius': MAP_CONFIG['offset_radius']
+    }
+    encoded = json.dumps(settings, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def source_metadata(source_path):
+    """ข้อมูลของไฟล์ต้นทางที่ใช้ตรวจว่าไฟล์ artifact ล้าสมัยหรือไม่"""
+    stat = os.stat(source_path)
+    return {
+        'version': ARTIFACT_VERSION,
+        'config': config_fingerprint(),
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_size': stat.st_size,
+        'source_sha256': file_sha256(source_path)
+    }
+
+def write_artifact(df, path, source_path):
+    """เขียน DataFrame ที่ทำความสะอาดแล้วเป็นไฟล์ Feather แบบไม่บีบอัด (memory-map ได้)"""
+    if pa is None:
+        raise ImportError('ต้องติดตั้ง pyarrow เพื่อสร้างไฟล์ artifact')
+
+    # คอลัมน์ข้อความส่วนใหญ่มีค่าซ้ำกันมาก เก็บแบบ dictionary (categorical) ในไฟล์
+    categorized = [column for column in df.columns
+                   if df[column].dtype == object and column not in UNIQUE_TEXT_COLUMNS]
+    table = pa.Table.from_pandas(df.astype({column: 'category' for column in categorized}),
+                                 preserve_index=True)
+
+    metadata = dict(source_metadata(source_path), categorized=categorized)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        METADATA_KEY: json.dumps(metadata).encode('utf-8')
+    })
+
+    tmp_path = path + '.tmp'
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+
+def read_artifact_metadata(path):
+    """อ่านเฉพาะ metadata ของไฟล์ artifact โดยไม่โหลดข้อมูล"""
+    with pa.memory_map(path) as source:
+        schema = pa.ipc.open_file(source).schema
+    return json.loads(schema.metadata[METADATA_KEY])
+
+def is_artifact_fresh(path, source_path):
+    """ไฟล์ artifact ยังตรงกับ CSV ต้นทางและการตั้งค่าปัจจุบันหรือไม่
+
+    ตรวจ mtime และขนาดก่อน ถ้าไม่ตรงจึงคำนวณ sha256 (เช่น ไฟล์ถูก touch แต่เนื้อหาเดิม)
+    """
+    if pa is None or not os.path.exists(path) or not os.path.exists(source_path):
+        return False
+
+    try:
+        metadata = read_artifact_metadata(path)
+    except (pa.ArrowInvalid, KeyError, ValueError, OSError):
+        return False
+
+    if metadata['version'] != ARTIFACT_VERSION or metadata['config'] != config_fingerprint():
+        return False
+
+    stat = os.stat(source_path)
+    if stat.st_mtime_ns == metadata['source_mtime_ns'] and stat.st_size == metadata['source_size']:
+        return True
+    return file_sha256(source_path) == metadata['source_sha256']
+
+def read_artifact(path):
+    """โหลดไฟล์ artifact แบบ memory-map คอลัมน์ตัวเลขไม่ต้อง copy
+
+    คอลัมน์ข้อความที่เก็บแบบ dictionary คงเป็น categorical ยกเว้น OBJECT_COLUMNS
+    ที่แปลงกลับเป็นข้อความให้ได้ dtype เดียวกับการโหลดจาก CSV
+    """
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    metadata = json.loads(table.schema.metadata[METADATA_KEY])
+
+    df = table.to_pandas(split_blocks=True)
+    for column in metadata['categorized']:
+        if column in OBJECT_COLUMNS:
+            df[column] = df[column].astype(object)
+    return df
@@ -0,0 +1,177 @@
+// clientside.js - callback ฝั่ง browser
+// debounce และ map_view ใช้ทุกโหมด ส่วนแผนที่และกราฟใช้ในโหมด clientside
+// ข้อมูลมาจาก dcc.Store id='client-data' ที่สร้างด้วย client_data.build_client_dataset
+// ผลลัพธ์ต้องตรงกับ create_map_figure, create_regional_chart และ create_program_distribution_chart
+
+(function () {
+    function clone(value) {
+        return JSON.parse(JSON.stringify(value));
+    }
+
+    // ปัดเศษแบบเดียวกับ pandas round(0) (ปัดครึ่งเข้าหาเลขคู่)
+    function roundHalfEven(value) {
+        var rounded = Math.round(value);
+        if (Math.abs(value % 1) === 0.5 && rounded % 2 !== 0) {
+            rounded -= 1;
+        }
+        return rounded;
+    }
+
+    // แถวที่ผ่านตัวกรอง (เหมือน filter_dataframe)
+    function filterRows(data, programType, region, tuitionRange) {
+        var columns = data.columns;
+        var programCode = programType === 'all' ? -1 : data.labels.program.indexOf(programType);
+        var regionCode = region === 'all' ? -1 : data.labels.region.indexOf(region);
+        var low = tuitionRange[0];
+        var high = tuitionRange[1];
+        var rows = [];
+
+        for (var i = 0; i < columns.tuition.length; i++) {
+            if (programType !== 'all' && columns.program[i] !== programCode) continue;
+            if (region !== 'all' && columns.region[i] !== regionCode) continue;
+            if (columns.tuition[i] < low || columns.tuition[i] > high) continue;
+            rows.push(i);
+        }
+        return rows;
+    }
+
+    // แบ่งแถวตามรหัส เรียงกลุ่มตามลำดับที่พบก่อน (เหมือน groupby(sort=False))
+    function groupRows(rows, codes) {
+        var groups = {};
+        var order = [];
+        for (var i = 0; i < rows.length; i++) {
+            var code = codes[rows[i]];
+            if (!(code in groups)) {
+                groups[code] = [];
+                order.push(code);
+            }
+            groups[code].push(rows[i]);
+        }
+        return order.map(function (code) { return {code: code, rows: groups[code]}; });
+    }
+
+    function pick(column, rows) {
+        return rows.map(function (row) { return column[row]; });
+    }
+
+    function updateMap(data, programType, region, tuitionRange) {
+        if (!data) return window.dash_clientside.no_update;
+        var rows = filterRows(data, programType, region, tuitionRange);
+        var templates = data.templates;
+        if (rows.length === 0) return clone(templates.map_empty);
+
+        var columns = data.columns;
+        var traces = groupRows(rows, columns.program).map(function (group) {
+            var trace = clone(templates.map.trace);
+            trace.marker.color = data.colors.program[group.code];
+            trace.lat = pick(columns.lat, group.rows);
+            trace.lon = pick(columns.lon, group.rows);
+            trace.text = pick(columns.unique_id, group.rows);
+            trace.hovertemplate = pick(columns.hover_text, group.rows);
+            trace.customdata = pick(columns.tuition, group.rows);
+            trace.name = data.labels.program[group.code];
+            return trace;
+        });
+        return {data: traces, layout: templates.map.layout};
+    }
+
+    function updateRegionalChart(data, programType, region, tuitionRange) {
+        if (!data) return window.dash_clientside.no_update;
+        var rows = filterRows(data, programType, region, tuitionRange);
+        var templates = data.templates;
+        if (rows.length === 0) return clone(templates.chart_empty);
+
+        var columns = data.columns;
+        var counts = data.labels.region.map(function () { return 0; });
+        var sums = data.labels.region.map(function () { return 0; });
+        for (var i = 0; i < rows.length; i++) {
+            counts[columns.region[rows[i]]] += 1;
+            sums[columns.region[rows[i]]] += columns.tuition[rows[i]];
+        }
+
+        // ภูมิภาคเรียงตาม categories และแสดงเฉพาะภูมิภาคที่มีข้อมูล (เหมือน groupby(observed=True))
+        var names = [], programCounts = [], avgTuition = [];
+        for (var code = 0; code < counts.length; code++) {
+            if (counts[code] === 0) continue;
+            names.push(data.labels.region[code]);
+            programCounts.push(counts[code]);
+            avgTuition.push(roundHalfEven(sums[code] / counts[code]));
+        }
+
+        var figure = clone(templates.regional);
+        figure.data[0].x = names;
+        figure.data[0].y = programCounts;
+        figure.data[0].text = programCounts;
+        figure.data[1].x = names;
+        figure.data[1].y = avgTuition;
+        return figure;
+    }
+
+    function updateProgramChart(data, programType, region, tuitionRange) {
+        if (!data) return window.dash_clientside.no_update;
+        var rows = filterRows(data, programType, region, tuitionRange);
+        var templates = data.templates;
+        if (rows.length === 0) return clone(templates.chart_empty);
+
+        // จำนวนมากไปน้อย จำนวนที่เท่ากันเรียงตามลำดับที่พบก่อน (เหมือน ranked_counts)
+        var groups = groupRows(rows, data.columns.program).map(function (group, position) {
+            return {code: group.code, count: group.rows.length, position: position};
+        });
+        groups.sort(function (a, b) { return b.count - a.count || a.position - b.position; });
+
+        var figure = clone(templates.distribution);
+        figure.data[0].labels = groups.map(function (group) { return data.labels.program[group.code]; });
+        figure.data[0].values = groups.map(function (group) { return group.count; });
+        figure.data[0].marker.colors = groups.map(function (group) { return data.colors.program[group.code]; });
+        figure.layout.annotations[0].text = 'Total<br>' + rows.length + '<br>Programs';
+        return figure;
+    }
+
+    // ส่งค่าเมื่อไม่มีค่าใหม่เข้ามาภายใน delay มิลลิวินาที ค่าที่ถูกแทนที่แล้วคืน no_update
+    var pendingValues = {};
+    function debounce(key, value, delay) {
+        if (value === null || value === undefined) return window.dash_clientside.no_update;
+        var token = {};
+        pendingValues[key] = token;
+        return new Promise(function (resolve) {
+            setTimeout(function () {
+                resolve(pendingValues[key] === token ? value : window.dash_clientside.no_update);
+            }, delay);
+        });
+    }
+
+    // ระดับซูมแบบจำนวนเต็มและขอบเขตที่มองเห็นจาก relayoutData ของแผนที่
+    // ขอบเขตถูกขยายออกหนึ่งช่องและปัดให้ตรงช่อง (กว้าง 90 / 2^ระดับ องศา) ค่าจึงเปลี่ยนเฉพาะเมื่อ
+    // ข้ามระดับซูมหรือเลื่อนออกนอกช่องเดิม การเลื่อนเล็กน้อยไม่ทำให้ server สร้างแผนที่ใหม่
+    function mapView(relayoutData, current) {
+        if (!relayoutData || !('mapbox.zoom' in relayoutData)) return window.dash_clientside.no_update;
+        var level = Math.floor(relayoutData['mapbox.zoom']);
+        var bounds = null;
+        var derived = relayoutData['mapbox._derived'];
+        if (derived && derived.coordinates) {
+            var step = 90 / Math.pow(2, level);
+            var lons = derived.coordinates.map(function (point) { return point[0]; });
+            var lats = derived.coordinates.map(function (point) { return point[1]; });
+            bounds = [
+                (Math.floor(Math.min.apply(null, lons) / step) - 1) * step,
+                (Math.floor(Math.min.apply(null, lats) / step) - 1) * step,
+                (Math.ceil(Math.max.apply(null, lons) / step) + 1) * step,
+                (Math.ceil(Math.max.apply(null, lats) / step) + 1) * step
+            ];
+        }
+        if (current && current.zoom === level && JSON.stringify(current.bounds) === JSON.stringify(bounds)) {
+            return window.dash_clientside.no_update;
+        }
+        return {zoom: level, bounds: bounds};
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        tcas: {
+            debounce: debounce,
+            map_view: mapView,
+            update_map: updateMap,
+            update_regional_chart: updateRegionalChart,
+            update_program_chart: updateProgramChart
+        }
+    });
+})();
@@ -0,0 +1,63 @@
+# build_dataset.py - สร้างไฟล์ข้อมูลที่ทำความสะอาดแล้ว (Feather) เพื่อให้แอปเริ่มเร็วขึ้น
+#
+# รัน: python build_dataset.py [--provinces provinces.geojson] [--name-property NAME]
+# ต้องรันใหม่เมื่อ CSV เปลี่ยน (แอปจะกลับไปอ่าน CSV เองถ้าไฟล์ล้าสมัย)
+#
+# --provinces สร้างไฟล์ขอบเขตภูมิภาคจาก GeoJSON ขอบเขตจังหวัด (ชื่อจังหวัดไทยหรืออังกฤษ) ก่อนสร้างข้อมูล
+# แอปใช้ไฟล์นี้เมื่อตั้ง REGION_CONFIG['boundary_file'] ไว้ มิฉะนั้นภูมิภาคถูกจัดด้วยกฎกรอบพิกัดเดิม
+
+import argparse
+import os
+import time
+import pandas as pd
+import artifact
+from config import DATA_CONFIG, REGION_CONFIG
+from data_utils import clean_csv_data
+from region_engine import build_region_geojson
+
+# ไฟล์ขอบเขตที่ --provinces เขียนเมื่อยังไม่ได้ตั้ง REGION_CONFIG['boundary_file']
+DEFAULT_BOUNDARY_FILE = 'data/thailand_regions.geojson'
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--provinces', help='GeoJSON ขอบเขตจังหวัด ใช้สร้างไฟล์ขอบเขตภูมิภาค')
+    parser.add_argument('--name-property', help='property ที่เก็บชื่อจังหวัด (ค่าเริ่มต้น: หาเอง)')
+    args = parser.parse_args()
+
+    boundary_file = REGION_CONFIG['boundary_file']
+    if args.provinces:
+        output = boundary_file or DEFAULT_BOUNDARY_FILE
+        counts = build_region_geojson(args.provinces, output, args.name_property,
+                                      REGION_CONFIG['region_property'])
+        print(f"✅ เขียน {output} ({sum(counts.values())} จังหวัด: "
+              + ', '.join(f'{region} {count}' for region, count in counts.items()) + ')')
+        if not boundary_file:
+            print(f"ตั้ง REGION_CONFIG['boundary_file'] = '{output}' ใน config.py แล้วรันสคริปต์นี้อีกครั้ง "
+                  f"เพื่อจัดภูมิภาคด้วยขอบเขตจังหวัด")
+    elif boundary_file and not os.path.exists(boundary_file):
+        print(f"⚠️ ไม่มี {boundary_file} ภูมิภาคจะถูกจัดด้วยกฎกรอบพิกัด (ใช้ --provinces เพื่อสร้าง)")
+
+    start = time.perf_counter()
+    df_clean = clean_csv_data()
+    csv_time = time.perf_counter() - start
+    
+    artifact.write_artifact(df_clean, DATA_CONFIG['artifact_file'], DATA_CONFIG['csv_file'])
+    
+    start = time.perf_counter()
+    assert artifact.is_artifact_fresh(DATA_CONFIG['artifact_file'], DATA_CONFIG['csv_file'])
+    df_loaded = artifact.read_artifact(DATA_CONFIG['artifact_file'])
+    artifact_time = time.perf_counter() - start
+    
+    # ข้อมูลที่โหลดจาก artifact ต้องเหมือนกับที่ได้จาก CSV ทุกค่า (คอลัมน์แสดงผลเป็น categorical)
+    categorical = [column for column in df_loaded.columns
+                   if df_loaded[column].dtype == 'category' and df_clean[column].dtype == object]
+    pd.testing.assert_frame_equal(df_loaded.astype({column: object for column in categorical}), df_clean)
+    
+    print(f"✅ เขียน {DATA_CONFIG['artifact_file']} ({len(df_clean):,} แถว)")
+    print(f"โหลดจาก CSV:      {csv_time * 1000:8.1f} ms")
+    print(f"โหลดจาก artifact: {artifact_time * 1000:8.1f} ms")
+    print(f"ประหยัดเวลาเริ่มแอป: {(csv_time - artifact_time) * 1000:8.1f} ms "
+          f"({csv_time / artifact_time:.1f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# cache.py - แคชผลลัพธ์ที่ใช้ร่วมกันระหว่าง callbacks
+
+import json
+import threading
+from collections import OrderedDict
+from data_utils import filter_dataframe, FilterIndex
+
+class LRUCache:
+    """แคชแบบ LRU จำกัดขนาด พร้อมตัวนับ hit/miss (thread-safe)"""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """คืนค่าจากแคช หรือคำนวณด้วย compute() ครั้งเดียวต่อ key"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+
+            # ถ้ามี callback อื่นกำลังคำนวณ key เดียวกันอยู่ ให้รอผลแทนการคำนวณซ้ำ
+            event = self._pending.get(key)
+            is_owner = event is None
+            if is_owner:
+                event = self._pending[key] = threading.Event()
+                self.misses += 1
+
+        if not is_owner:
+            event.wait()
+            with self._lock:
+                if key in self._data:
+                    self.hits += 1
+                    return self._data[key]
+                self.misses += 1
+            return compute()
+
+        try:
+            value = compute()
+            with self._lock:
+                self._data[key] = value
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                del self._pending[key]
+            event.set()
+
+    def cache_info(self):
+        """สถิติการใช้งานแคช"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize
+            }
+
+    def clear(self):
+        """ล้างแคชและรีเซ็ตตัวนับ"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+def make_filter_key(program_type, region, tuition_range):
+    """สร้าง key ของสถานะตัวกรอง (slider ส่งค่ามาเป็น list จึงต้องแปลงเป็น tuple)"""
+    return (program_type, region, tuple(tuition_range))
+
+class FilterCache(LRUCache):
+    """แคชผลการกรองข้อมูลที่ทุก callback ใช้ร่วมกัน
+
+    DataFrame ที่คืนไปถูกใช้ร่วมกันหลาย callback ห้ามแก้ไขค่าในตัว DataFrame
+    """
+
+    def __init__(self, df, maxsize=64, index=None):
+        super().__init__(maxsize)
+        self.df = df
+        self.index = index if index is not None else FilterIndex(df)
+
+    def filter(self, program_type, region, tuition_range):
+        key = make_filter_key(program_type, region, tuition_range)
+        return self.get_or_compute(
+            key,
+            lambda: filter_dataframe(self.df, program_type, region, tuition_range, index=self.index)
+        )
+
+def figure_to_json(fig):
+    """แปลง go.Figure เป็น dict ที่มีแต่ชนิดข้อมูลพื้นฐานของ JSON
+
+    Dash ส่ง dict นี้ออกไปได้ทันทีโดยไม่ต้องตรวจ schema ของ plotly ซ้ำทุกครั้ง
+    """
+    return json.loads(fig.to_json())
+
+class FigureCache(LRUCache):
+    """แคชรูปกราฟที่สร้างเสร็จแล้ว (JSON) ต่อชื่อกราฟและสถานะตัวกรอง
+
+    รูปที่คืนไปถูกใช้ร่วมกันหลาย request ห้ามแก้ไขค่าในตัว dict
+    """
+
+    def figure(self, name, program_type, region, tuition_range, build):
+        key = (name,) + make_filter_key(program_type, region, tuition_range)
+        return self.get_or_compute(key, lambda: figure_to_json(build()))
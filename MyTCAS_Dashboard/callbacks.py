@@ -1,83 +1,255 @@
 # callbacks.py - ฟังก์ชัน Callback สำหรับ Dash
 
-from dash import Input, Output, callback, html
-from data_utils import filter_dataframe, add_coordinate_offset
+from dash import Input, Output, State, ClientsideFunction, Patch, callback, html, no_update
 from charts import create_map_figure, create_regional_chart, create_program_distribution_chart
-from config import COLORS
+from cache import FilterCache, FigureCache, LRUCache, make_filter_key
+from stats_cube import StatsCube
+from data_utils import DetailsIndex, points_in_bounds
+from coalesce import PAGE_ID, RequestCoalescer
+from metrics import CallbackMetrics
+from config import COLORS, CACHE_CONFIG, CALLBACK_CONFIG, METRICS_CONFIG, MAP_CONFIG
 
 def register_callbacks(app, df_clean):
-    """ลงทะเบียน callback ทั้งหมด"""
+    """ลงทะเบียน callback ทั้งหมด และคืนแคชตัวกรองไว้สำหรับดูสถิติ hit/miss"""
+    # เวลาของแต่ละ callback และขั้นตอนย่อย ดูได้ที่ /metrics ของ server
+    # ถ้าปิด metrics ทั้ง timed และ stage ไม่บันทึกอะไร
+    metrics = CallbackMetrics(slow_log_size=METRICS_CONFIG['slow_log_size'],
+                              slow_threshold_ms=METRICS_CONFIG['slow_threshold_ms'],
+                              enabled=METRICS_CONFIG['enabled'])
+    timed = metrics.timed
+    if METRICS_CONFIG['enabled'] and hasattr(app, 'server'):
+        metrics.install(app.server)
     
-    @app.callback(
-        Output('thailand-map', 'figure'),
-        [Input('program-filter', 'value'),
-         Input('region-filter', 'value'),
-         Input('tuition-slider', 'value')]
+    # แคชผลการกรองที่ทุก callback ใช้ร่วมกัน สถานะตัวกรองเดียวกันจะถูกกรองเพียงครั้งเดียว
+    filter_cache = FilterCache(df_clean, maxsize=CACHE_CONFIG['filter_cache_size'])
+    
+    # สถิติสรุปตอบจาก cube ที่คำนวณล่วงหน้า และแคชไว้ให้ทุก callback ใช้ร่วมกัน
+    stats_cube = StatsCube(df_clean)
+    summary_cache = LRUCache(maxsize=CACHE_CONFIG['filter_cache_size'])
+    
+    def get_summary(program_type, region, tuition_range):
+        with metrics.stage('filter'):
+            return summary_cache.get_or_compute(
+                make_filter_key(program_type, region, tuition_range),
+                lambda: stats_cube.query(program_type, region, tuition_range)
+            )
+    
+    def get_filtered(program_type, region, tuition_range):
+        with metrics.stage('filter'):
+            return filter_cache.filter(program_type, region, tuition_range)
+    
+    # ดัชนีของแผงรายละเอียด: unique_id -> แถว, มหาวิทยาลัย -> โปรแกรม และอันดับ
+    details_index = DetailsIndex(df_clean)
+    
+    # รูปกราฟที่สร้างเสร็จแล้วต่อสถานะตัวกรอง callback ที่ถูกเรียกซ้ำจึงเป็นแค่การค้น dict
+    figure_cache = FigureCache(maxsize=CACHE_CONFIG['figure_cache_size'])
+    
+    def build_map(program_type, region, tuition_range, view=None):
+        """คืน (ชื่อรูปในแคช, รูปแผนที่) ตามตัวกรองและขอบเขตที่มองเห็น (store map-view)"""
+        zoom_level, bounds = map_view_of(view)
+        n_points = get_summary(program_type, region, tuition_range)['total_programs']
+        if n_points <= MAP_CONFIG['viewport_threshold']:
+            # จุดไม่มาก ส่งทุกจุดครั้งเดียว รูปเดียวกันทุกระดับซูมและทุกตำแหน่ง
+            name = 'map'
+            build = lambda: create_map_figure(get_filtered(program_type, region, tuition_range))
+        else:
+            # จุดจำนวนมาก ส่งเฉพาะจุดในขอบเขตที่มองเห็น (ทีละจุดถ้าน้อยพอ มิฉะนั้นรวมกลุ่มตามระดับซูม)
+            name = f'map-{zoom_level}-{bounds}'
+            build = lambda: create_map_figure(
+                points_in_bounds(get_filtered(program_type, region, tuition_range), bounds), zoom_level)
+        with metrics.stage('build'):
+            return name, figure_cache.figure(name, program_type, region, tuition_range, build)
+    
+    def update_map_figure(program_type, region, tuition_range, view, rendered):
+        name, figure = build_map(program_type, region, tuition_range, view)
+        return map_update(figure, [name, program_type, region, tuition_range], rendered)
+
+    def build_statistics(program_type, region, tuition_range):
+        summary = get_summary(program_type, region, tuition_range)
+        
+        with metrics.stage('build'):
+            if summary['total_programs'] == 0:
+                return html.Div([
+                    html.P("🔍 No data available for selected filters", 
+                           style={'textAlign': 'center', 'color': COLORS['text_secondary']})
+                ])
+            
+            return create_statistics_content(summary)
+
+    def build_regional_chart(program_type, region, tuition_range):
+        with metrics.stage('build'):
+            return figure_cache.figure(
+                'regional', program_type, region, tuition_range,
+                lambda: create_regional_chart(get_summary(program_type, region, tuition_range))
+            )
+
+    def build_program_chart(program_type, region, tuition_range):
+        with metrics.stage('build'):
+            return figure_cache.figure(
+                'distribution', program_type, region, tuition_range,
+                lambda: create_program_distribution_chart(get_summary(program_type, region, tuition_range))
+            )
+
+    # ช่วงค่าเล่าเรียนอ่านจาก store ที่ถูก debounce แล้ว แทนค่าของตัวเลื่อนโดยตรง
+    # value เปลี่ยนเมื่อปล่อยเมาส์ (updatemode='mouseup') debounce รวมการเปลี่ยนติดกัน
+    # (กดปุ่มลูกศรค้าง คลิกบนแถบหลายครั้ง) ให้เหลือ request เดียว จึงไม่ส่งมากกว่าการใช้ value โดยตรง
+    app.clientside_callback(
+        f"function(value) {{ return window.dash_clientside.tcas.debounce('tuition-range', value, "
+        f"{CALLBACK_CONFIG['slider_debounce_ms']}); }}",
+        Output('tuition-range', 'data'),
+        Input('tuition-slider', 'value')
     )
-    def update_map(program_type, region, tuition_range):
-        filtered_df = filter_dataframe(df_clean, program_type, region, tuition_range)
-        return create_map_figure(filtered_df)
+    
+    filter_inputs = [Input('program-filter', 'value'),
+                     Input('region-filter', 'value'),
+                     Input('tuition-range', 'data')]
+    
+    # ระดับซูมและขอบเขตที่มองเห็นของแผนที่ (ปัดขอบออกเป็นช่อง เปลี่ยนเมื่อเลื่อนออกนอกช่องเดิม)
+    app.clientside_callback(
+        ClientsideFunction('tcas', 'map_view'),
+        Output('map-view', 'data'),
+        Input('thailand-map', 'relayoutData'),
+        State('map-view', 'data')
+    )
+    map_inputs = filter_inputs + [Input('map-view', 'data')]
+    # map-render บอกว่า browser แสดงรูปใดอยู่ ใช้ตัดสินว่าส่ง Patch ได้หรือไม่
+    map_outputs = [Output('thailand-map', 'figure'), Output('map-render', 'data')]
+    map_state = [State('map-render', 'data')]
+    
+    # request ที่ถูกแทนที่ด้วย request ใหม่กว่าจากหน้าเดียวกันจะถูกทิ้งโดยไม่คำนวณ
+    # page-id (สร้างใหม่ทุกการโหลดหน้า) ส่งมาเป็น State สุดท้ายของ callback ที่ถูกรวม
+    coalescer = RequestCoalescer()
+    if CALLBACK_CONFIG['drop_superseded']:
+        latest_only = coalescer.latest_only
+        page_state = [State(PAGE_ID, 'data')]
+    else:
+        latest_only = lambda func: func
+        page_state = []
+
+    if CALLBACK_CONFIG['mode'] == 'combined':
+        # callback เดียวหลาย Output: หนึ่ง request ต่อการเปลี่ยนตัวกรอง แทนสี่ request
+        @app.callback(
+            map_outputs +
+            [Output('statistics-content', 'children'),
+             Output('regional-comparison', 'figure'),
+             Output('program-distribution', 'figure')],
+            map_inputs,
+            map_state + page_state
+        )
+        @timed
+        @latest_only
+        def update_dashboard(program_type, region, tuition_range, view=None, rendered=None):
+            map_outputs = update_map_figure(program_type, region, tuition_range, view, rendered)
+            # เลื่อนหรือซูมแผนที่อย่างเดียว (ตัวกรองเดิม) ไม่ต้องส่งสถิติและกราฟซ้ำ
+            if rendered is not None and rendered['key'][1:] == [program_type, region, tuition_range]:
+                return (*map_outputs, no_update, no_update, no_update)
+            return (*map_outputs,
+                    build_statistics(program_type, region, tuition_range),
+                    build_regional_chart(program_type, region, tuition_range),
+                    build_program_chart(program_type, region, tuition_range))
+    elif CALLBACK_CONFIG['mode'] == 'clientside':
+        # แผนที่และกราฟกรองข้อมูลใน browser จาก dcc.Store (assets/clientside.js)
+        # ฝั่ง server ตอบเฉพาะสถิติสรุปซึ่งตอบจาก cube และแคช
+        store_inputs = [Input('client-data', 'data')] + filter_inputs
+        app.clientside_callback(ClientsideFunction('tcas', 'update_map'),
+                                Output('thailand-map', 'figure'), store_inputs)
+        app.clientside_callback(ClientsideFunction('tcas', 'update_regional_chart'),
+                                Output('regional-comparison', 'figure'), store_inputs)
+        app.clientside_callback(ClientsideFunction('tcas', 'update_program_chart'),
+                                Output('program-distribution', 'figure'), store_inputs)
+
+        @app.callback(Output('statistics-content', 'children'), filter_inputs + page_state)
+        @timed
+        @latest_only
+        def update_statistics(program_type, region, tuition_range):
+            return build_statistics(program_type, region, tuition_range)
+    else:
+        @app.callback(map_outputs, map_inputs, map_state + page_state)
+        @timed
+        @latest_only
+        def update_map(program_type, region, tuition_range, view=None, rendered=None):
+            return update_map_figure(program_type, region, tuition_range, view, rendered)
+
+        @app.callback(Output('statistics-content', 'children'), filter_inputs + page_state)
+        @timed
+        @latest_only
+        def update_statistics(program_type, region, tuition_range):
+            return build_statistics(program_type, region, tuition_range)
+
+        @app.callback(Output('regional-comparison', 'figure'), filter_inputs + page_state)
+        @timed
+        @latest_only
+        def update_regional_chart(program_type, region, tuition_range):
+            return build_regional_chart(program_type, region, tuition_range)
+
+        @app.callback(Output('program-distribution', 'figure'), filter_inputs + page_state)
+        @timed
+        @latest_only
+        def update_program_chart(program_type, region, tuition_range):
+            return build_program_chart(program_type, region, tuition_range)
 
     @app.callback(
         Output('university-details', 'children'),
-        [Input('thailand-map', 'clickData'),
-         Input('program-filter', 'value'),
-         Input('region-filter', 'value'),
-         Input('tuition-slider', 'value')]
+        [Input('thailand-map', 'clickData')] + filter_inputs + page_state
     )
+    @timed
+    @latest_only
     def update_details(clickData, program_type, region, tuition_range):
         if clickData is None:
             return create_default_details()
         
-        filtered_df = filter_dataframe(df_clean, program_type, region, tuition_range)
-        filtered_df = add_coordinate_offset(filtered_df)
-        
-        # หาข้อมูลที่ถูกคลิก
-        clicked_unique_id = clickData['points'][0]['text']
-        try:
-            university_data = filtered_df[filtered_df['unique_id'] == clicked_unique_id].iloc[0]
-        except IndexError:
+        # หาข้อมูลที่ถูกคลิกจากดัชนี (ไม่ต้องกรองหรือสแกนทั้งตาราง)
+        # จุดของแผนที่แบบรวมกลุ่มไม่มี unique_id
+        clicked_unique_id = clickData['points'][0].get('text')
+        if clicked_unique_id is None:
+            return create_default_details()
+        with metrics.stage('filter'):
+            details = details_index.lookup(clicked_unique_id, program_type, region, tuition_range)
+        if details is None:
             return html.P("Program details not found", 
                          style={'textAlign': 'center', 'color': COLORS['text_secondary'], 'fontSize': '16px'})
         
-        return create_university_details(university_data, filtered_df)
+        with metrics.stage('build'):
+            return create_university_details(*details)
 
-    @app.callback(
-        Output('statistics-content', 'children'),
-        [Input('program-filter', 'value'),
-         Input('region-filter', 'value'),
-         Input('tuition-slider', 'value')]
-    )
-    def update_statistics(program_type, region, tuition_range):
-        filtered_df = filter_dataframe(df_clean, program_type, region, tuition_range)
-        
-        if len(filtered_df) == 0:
-            return html.Div([
-                html.P("🔍 No data available for selected filters", 
-                       style={'textAlign': 'center', 'color': COLORS['text_secondary']})
-            ])
-        
-        return create_statistics_content(filtered_df)
+    return filter_cache
 
-    @app.callback(
-        Output('regional-comparison', 'figure'),
-        [Input('program-filter', 'value'),
-         Input('region-filter', 'value'),
-         Input('tuition-slider', 'value')]
-    )
-    def update_regional_chart(program_type, region, tuition_range):
-        filtered_df = filter_dataframe(df_clean, program_type, region, tuition_range)
-        return create_regional_chart(filtered_df)
+# ข้อมูลของ trace แผนที่ที่เปลี่ยนตามตัวกรอง (ส่วนอื่นของรูปเหมือนเดิมเมื่อชุด trace เหมือนเดิม)
+MAP_PATCH_KEYS = ['lat', 'lon', 'text', 'hovertemplate', 'customdata']
+MAP_PATCH_MARKER_KEYS = ['size', 'color']
 
-    @app.callback(
-        Output('program-distribution', 'figure'),
-        [Input('program-filter', 'value'),
-         Input('region-filter', 'value'),
-         Input('tuition-slider', 'value')]
-    )
-    def update_program_chart(program_type, region, tuition_range):
-        filtered_df = filter_dataframe(df_clean, program_type, region, tuition_range)
-        return create_program_distribution_chart(filtered_df)
+def map_view_of(view):
+    """(ระดับซูม, ขอบเขต) จากข้อมูลของ store map-view ขอบเขตเป็น None ถ้ายังไม่รู้"""
+    view = view or {}
+    zoom = view.get('zoom')
+    bounds = view.get('bounds')
+    return (int(MAP_CONFIG['zoom']) if zoom is None else zoom), (tuple(bounds) if bounds else None)
+
+def map_update(figure, key, rendered):
+    """คืน (รูปแผนที่หรือ Patch, สถานะใหม่ของ map-render)
+
+    - รูปเดียวกับที่ browser แสดงอยู่ (key ตรงกัน): ไม่อัปเดต
+    - ชุด trace เดิม (ชื่อและลำดับเดียวกัน): Patch เฉพาะข้อมูลของแต่ละ trace ไม่ส่ง layout ซ้ำ
+    - มิฉะนั้นส่งรูปทั้งหมด
+    """
+    if rendered is not None and rendered['key'] == key:
+        return no_update, no_update
+    
+    traces = [trace.get('name') for trace in figure['data']]
+    state = {'key': key, 'traces': traces}
+    if not CALLBACK_CONFIG['map_patch'] or rendered is None or not traces or rendered['traces'] != traces:
+        return figure, state
+    
+    patch = Patch()
+    for i, trace in enumerate(figure['data']):
+        for name in MAP_PATCH_KEYS:
+            if name in trace:
+                patch['data'][i][name] = trace[name]
+        marker = trace.get('marker', {})
+        for name in MAP_PATCH_MARKER_KEYS:
+            if isinstance(marker.get(name), list):
+                patch['data'][i]['marker'][name] = marker[name]
+    return patch, state
 
 def create_default_details():
     """สร้างรายละเอียดเริ่มต้น"""
@@ -109,13 +281,8 @@ def create_default_details():
         'height': '300px'
     })
 
-def create_university_details(university_data, filtered_df):
-    """สร้างรายละเอียดมหาวิทยาลัย"""
-    # หาโปรแกรมอื่นๆ ในมหาวิทยาลัยเดียวกัน
-    same_university_programs = filtered_df[
-        filtered_df['มหาวิทยาลัย'] == university_data['มหาวิทยาลัย']
-    ]
-    
+def create_university_details(university_data, same_university_programs, rank):
+    """สร้างรายละเอียดมหาวิทยาลัย (same_university_programs คือโปรแกรมของมหาวิทยาลัยเดียวกันที่ผ่านตัวกรอง)"""
     return html.Div([
         # หัวข้อมหาวิทยาลัย
         html.Div([
@@ -295,7 +462,7 @@ def create_university_details(university_data, filtered_df):
                         'fontWeight': '500'
                     }),
                     html.Br(),
-                    html.Span(f"#{university_data.name + 1}", style={
+                    html.Span(f"#{rank}", style={
                         'fontSize': '14px',
                         'fontWeight': '600',
                         'color': COLORS['text_primary']
@@ -315,15 +482,14 @@ def create_university_details(university_data, filtered_df):
         ])
     ], style={'overflowY': 'auto', 'maxHeight': '400px'})
 
-def create_statistics_content(filtered_df):
-    """สร้างเนื้อหาสถิติ"""
-    # คำนวณสถิติ
-    total_programs = len(filtered_df)
-    total_universities = filtered_df['มหาวิทยาลัย'].nunique()
-    avg_tuition = filtered_df['final_tuition_fee'].mean()
-    min_tuition = filtered_df['final_tuition_fee'].min()
-    max_tuition = filtered_df['final_tuition_fee'].max()
-    regions_count = filtered_df['region'].nunique()
+def create_statistics_content(summary):
+    """สร้างเนื้อหาสถิติจากสรุปสถิติ (StatsCube.query หรือ summarize_dataframe)"""
+    total_programs = summary['total_programs']
+    total_universities = summary['total_universities']
+    avg_tuition = summary['avg_tuition']
+    min_tuition = summary['min_tuition']
+    max_tuition = summary['max_tuition']
+    regions_count = summary['regions_count']
     
     return html.Div([
         # เมตริกหลัก
@@ -367,7 +533,7 @@ def create_statistics_content(filtered_df):
             html.Div([
                 create_university_rank_item(idx, uni, count)
                 for idx, (uni, count) in enumerate(
-                    filtered_df['มหาวิทยาลัย'].value_counts().head(3).items()
+                    summary['university_counts'].head(3).items()
                 )
             ])
         ])
@@ -1,27 +1,71 @@
 # charts.py - ฟังก์ชันสร้างกราฟ
 
+import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 from config import COLORS, PROGRAM_COLORS, MAP_CONFIG
-from data_utils import add_coordinate_offset
+from data_utils import add_coordinate_offset, build_hover_text, cluster_cell_size, cluster_points
 
-def create_map_figure(filtered_df):
-    """สร้างแผนที่"""
+TEMPLATE_NAME = 'tcas'
+
+# ส่วนของแม่แบบ 'plotly' ที่กราฟของ dashboard ใช้ (แม่แบบเต็มมี trace ทุกชนิด ราว 7.5 KB ต่อรูป)
+BASE_LAYOUT_KEYS = ['autotypenumbers', 'colorway', 'hovermode', 'hoverlabel', 'coloraxis', 'xaxis', 'yaxis',
+                    'annotationdefaults']
+BASE_TRACE_TYPES = ['bar', 'pie', 'scatter', 'scattermapbox']
+
+def create_template():
+    """แม่แบบสไตล์ร่วมของทุกกราฟ (ฟอนต์ สีตัวอักษร พื้นหลังโปร่งใส) แทนการใส่ซ้ำในทุกรูป"""
+    base = pio.templates['plotly']
+    layout = {key: base.layout[key] for key in BASE_LAYOUT_KEYS}
+    data = {trace_type: base.data[trace_type] for trace_type in BASE_TRACE_TYPES}
+
+    template = go.layout.Template(layout=layout, data=data)
+    template.layout.update(
+        font=dict(family='Inter', color=COLORS['text_primary']),
+        title=dict(font=dict(size=16), x=0.5),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(color=COLORS['text_secondary']),
+        yaxis=dict(color=COLORS['text_secondary'])
+    )
+    return template
+
+# ลงทะเบียนครั้งเดียวตอน import รูปที่ใช้ template='tcas' จะได้สไตล์นี้
+pio.templates[TEMPLATE_NAME] = create_template()
+
+def create_empty_figure(text):
+    """รูปว่างพร้อมข้อความเมื่อไม่มีข้อมูลตามตัวกรอง"""
+    fig = go.Figure(layout=dict(template=TEMPLATE_NAME))
+    return fig.add_annotation(
+        text=text,
+        x=0.5, y=0.5, showarrow=False,
+        font=dict(size=16, color=COLORS['text_secondary'])
+    )
+
+def create_map_figure(filtered_df, zoom=None):
+    """สร้างแผนที่
+
+    ถ้ามีจุดเกิน MAP_CONFIG['cluster_threshold'] จะแสดงเป็นกลุ่มตามช่องกริดของระดับซูม zoom
+    (ค่าเริ่มต้นคือระดับซูมเริ่มต้นของแผนที่) แทนการแสดงทีละจุด
+    """
     if len(filtered_df) == 0:
-        return go.Figure().add_annotation(
-            text="No universities match the selected criteria",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color=COLORS['text_secondary'])
-        )
+        return create_empty_figure("No universities match the selected criteria")
+    
+    if len(filtered_df) > MAP_CONFIG['cluster_threshold']:
+        return create_cluster_map_figure(filtered_df, MAP_CONFIG['zoom'] if zoom is None else zoom)
     
-    # เพิ่มการเลื่อนพิกัดสำหรับมหาวิทยาลัยที่ซ้อนทับกัน
-    filtered_df = add_coordinate_offset(filtered_df)
+    # พิกัดแสดงผลคำนวณไว้ตอนโหลดข้อมูล คำนวณใหม่เฉพาะเมื่อ DataFrame ยังไม่มี
+    if 'display_lat' not in filtered_df.columns:
+        filtered_df = add_coordinate_offset(filtered_df)
+    
+    # ข้อความ hover สร้างไว้ตอนโหลดข้อมูลเช่นกัน
+    if 'hover_text' not in filtered_df.columns:
+        filtered_df = filtered_df.assign(hover_text=build_hover_text(filtered_df))
     
     fig = go.Figure()
     
     # เพิ่มจุดสำหรับแต่ละประเภทโปรแกรม
-    for prog_type in filtered_df['program_type'].unique():
-        prog_data = filtered_df[filtered_df['program_type'] == prog_type]
-        
+    for prog_type, prog_data in filtered_df.groupby('program_type', sort=False):
         fig.add_trace(go.Scattermapbox(
             lat=prog_data['display_lat'],
             lon=prog_data['display_lon'],
@@ -34,17 +78,51 @@ def create_map_figure(filtered_df):
                 sizemode='diameter'
             ),
             text=prog_data['unique_id'],
-            hovertemplate='<b>🏫 ' + prog_data['มหาวิทยาลัย'].astype(str) + '</b><br>' +
-                         '📚 ' + prog_data['program_type'].astype(str) + '<br>' +
-                         '🎓 ' + prog_data['หลักสูตร'].astype(str) + '<br>' +
-                         '🏢 ' + prog_data['วิทยาเขต'].astype(str) + '<br>' +
-                         '💰 Tuition: ฿' + prog_data['final_tuition_fee'].apply(lambda x: f"{x:,.0f}") + '<br>' +
-                         '<extra></extra>',
+            hovertemplate=prog_data['hover_text'],
             customdata=prog_data['final_tuition_fee'],
             name=prog_type
         ))
     
+    return apply_map_layout(fig)
+
+def create_cluster_map_figure(filtered_df, zoom):
+    """แผนที่แบบรวมกลุ่ม: หนึ่ง marker ต่อช่องกริด ขนาดตามจำนวนโปรแกรม สีตามค่าเล่าเรียนเฉลี่ย
+
+    ขนาดข้อมูลขึ้นกับจำนวนช่องที่มีจุด ไม่ใช่จำนวนโปรแกรม
+    """
+    clusters = cluster_points(filtered_df, cluster_cell_size(zoom))
+    
+    min_size, max_size = MAP_CONFIG['cluster_marker_size']
+    scale = np.sqrt(clusters['count'] / clusters['count'].max())
+    
+    fig = go.Figure(go.Scattermapbox(
+        lat=clusters['latitude'],
+        lon=clusters['longitude'],
+        mode='markers',
+        marker=dict(
+            size=(min_size + scale * (max_size - min_size)).round(1),
+            color=clusters['avg_tuition'].round(0),
+            colorscale='Viridis',
+            colorbar=dict(title=dict(text='Avg. Tuition'), thickness=12, x=0.98, len=0.6),
+            opacity=0.8,
+            sizemode='diameter'
+        ),
+        customdata=np.column_stack([clusters['count'], clusters['avg_tuition'].round(0)]),
+        hovertemplate=('<b>🎓 %{customdata[0]:,} programs</b><br>'
+                       '💰 Avg. tuition: ฿%{customdata[1]:,.0f}<br>'
+                       '🔍 Zoom in to see individual programs'
+                       '<extra></extra>'),
+        name='Clusters',
+        showlegend=False
+    ))
+    
+    return apply_map_layout(fig)
+
+def apply_map_layout(fig):
+    """สไตล์ของแผนที่ (uirevision คงตำแหน่งและระดับซูมที่ผู้ใช้เลื่อนไว้เมื่อรูปถูกอัปเดต)"""
     fig.update_layout(
+        template=TEMPLATE_NAME,
+        uirevision='thailand-map',
         mapbox=dict(
             style=MAP_CONFIG['style'],
             center=dict(lat=MAP_CONFIG['center_lat'], lon=MAP_CONFIG['center_lon']),
@@ -52,18 +130,15 @@ def create_map_figure(filtered_df):
         ),
         height=450,
         margin=dict(l=0, r=0, t=0, b=0),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(color=COLORS['text_primary'], family="Inter"),
         legend=dict(
-            title=dict(text='Program Types', font=dict(size=14, color=COLORS['text_primary'])),
+            title=dict(text='Program Types', font=dict(size=14)),
             orientation='v',
             x=0.02,
             y=0.98,
             bgcolor='rgba(255,255,255,0.95)',
             bordercolor='rgba(255,255,255,0.5)',
             borderwidth=1,
-            font=dict(size=12, color=COLORS['text_primary']),
+            font=dict(size=12),
             itemclick='toggleothers',
             itemdoubleclick='toggle'
         )
@@ -71,23 +146,12 @@ def create_map_figure(filtered_df):
     
     return fig
 
-def create_regional_chart(filtered_df):
-    """สร้างกราฟเปรียบเทียบภูมิภาค"""
-    if len(filtered_df) == 0:
-        return go.Figure().add_annotation(
-            text="No data available",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color=COLORS['text_secondary'])
-        )
+def create_regional_chart(summary):
+    """สร้างกราฟเปรียบเทียบภูมิภาคจากสรุปสถิติ (StatsCube.query หรือ summarize_dataframe)"""
+    if summary['total_programs'] == 0:
+        return create_empty_figure("No data available")
     
-    # คำนวณสถิติภูมิภาค
-    regional_stats = filtered_df.groupby('region').agg({
-        'final_tuition_fee': ['mean', 'count'],
-        'มหาวิทยาลัย': 'nunique'
-    }).round(0)
-    
-    regional_stats.columns = ['avg_tuition', 'program_count', 'university_count']
-    regional_stats = regional_stats.reset_index()
+    regional_stats = summary['regional_stats']
     
     fig = go.Figure()
     
@@ -100,7 +164,7 @@ def create_regional_chart(filtered_df):
         opacity=0.8,
         text=regional_stats['program_count'],
         textposition='auto',
-        textfont=dict(color='white', size=12, family='Inter'),
+        textfont=dict(color='white', size=12),
         hovertemplate='<b>%{x}</b><br>Programs: %{y}<extra></extra>'
     ))
     
@@ -117,34 +181,23 @@ def create_regional_chart(filtered_df):
     ))
     
     fig.update_layout(
-        title=dict(
-            text='Programs & Average Tuition by Region',
-            font=dict(size=16, color=COLORS['text_primary'], family='Inter'),
-            x=0.5
-        ),
-        xaxis=dict(title='Region', color=COLORS['text_secondary'], tickangle=45),
-        yaxis=dict(title='Number of Programs', color=COLORS['text_secondary'], side='left'),
-        yaxis2=dict(title='Average Tuition (฿)', color=COLORS['text_secondary'], overlaying='y', side='right'),
+        template=TEMPLATE_NAME,
+        title=dict(text='Programs & Average Tuition by Region'),
+        xaxis=dict(title='Region', tickangle=45),
+        yaxis=dict(title='Number of Programs', side='left'),
+        yaxis2=dict(title='Average Tuition (฿)', overlaying='y', side='right'),
         legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(family='Inter', color=COLORS['text_primary']),
         margin=dict(l=50, r=50, t=80, b=100)
     )
     
     return fig
 
-def create_program_distribution_chart(filtered_df):
-    """สร้างกราฟแสดงการกระจายโปรแกรม"""
-    if len(filtered_df) == 0:
-        return go.Figure().add_annotation(
-            text="No data available",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color=COLORS['text_secondary'])
-        )
+def create_program_distribution_chart(summary):
+    """สร้างกราฟแสดงการกระจายโปรแกรมจากสรุปสถิติ"""
+    if summary['total_programs'] == 0:
+        return create_empty_figure("No data available")
     
-    # คำนวณการกระจายโปรแกรม
-    program_counts = filtered_df['program_type'].value_counts()
+    program_counts = summary['program_counts']
     colors_list = [PROGRAM_COLORS.get(prog, COLORS['secondary']) for prog in program_counts.index]
     
     fig = go.Figure(data=[
@@ -156,24 +209,20 @@ def create_program_distribution_chart(filtered_df):
             textinfo='label+percent+value',
             textposition='auto',
             hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>',
-            textfont=dict(size=12, family='Inter')
+            textfont=dict(size=12)
         )
     ])
     
     fig.update_layout(
+        template=TEMPLATE_NAME,
         annotations=[
             dict(
                 text=f"Total<br>{program_counts.sum()}<br>Programs",
                 x=0.5, y=0.5,
                 font_size=14,
-                font_color=COLORS['text_primary'],
-                font_family='Inter',
                 showarrow=False
             )
         ],
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(family='Inter', color=COLORS['text_primary']),
         margin=dict(l=20, r=20, t=80, b=20),
         showlegend=True,
         legend=dict(
@@ -0,0 +1,62 @@
+# client_data.py - ข้อมูลแบบ columnar สำหรับโหมดกรองข้อมูลฝั่ง browser (clientside callbacks)
+
+import pandas as pd
+from config import COLORS, PROGRAM_COLORS
+from cache import figure_to_json
+from charts import create_map_figure, create_regional_chart, create_program_distribution_chart
+from data_utils import summarize_dataframe
+
+# ข้อมูลของจุดบนแผนที่ที่ต้องเปลี่ยนตามแถวที่กรองได้ ส่วนที่เหลือของ trace ใช้จากแม่แบบ
+MAP_TRACE_DATA_KEYS = ['lat', 'lon', 'text', 'hovertemplate', 'customdata', 'name']
+
+def encode_column(series):
+    """เข้ารหัสคอลัมน์ข้อความเป็น (รหัสจำนวนเต็ม, ป้ายชื่อ) เพื่อให้ JSON เล็กลง"""
+    categorical = pd.Categorical(series)
+    return categorical.codes.tolist(), [str(label) for label in categorical.categories]
+
+def build_figure_templates(df):
+    """แม่แบบรูปกราฟจากฟังก์ชันใน charts.py ให้ฝั่ง browser ใช้สไตล์เดียวกับฝั่ง server
+
+    แม่แบบของกราฟแต่ละตัวเก็บ layout และ trace ตัวอย่าง ฝั่ง browser เติมเฉพาะข้อมูล
+    """
+    sample = df.iloc[:1]
+    map_figure = figure_to_json(create_map_figure(sample))
+    map_trace = {key: value for key, value in map_figure['data'][0].items() if key not in MAP_TRACE_DATA_KEYS}
+
+    empty_summary = {'total_programs': 0}
+    return {
+        'map': {'layout': map_figure['layout'], 'trace': map_trace},
+        'map_empty': figure_to_json(create_map_figure(df.iloc[:0])),
+        'regional': figure_to_json(create_regional_chart(summarize_dataframe(sample))),
+        'distribution': figure_to_json(create_program_distribution_chart(summarize_dataframe(sample))),
+        'chart_empty': figure_to_json(create_regional_chart(empty_summary))
+    }
+
+def build_client_dataset(df):
+    """ข้อมูลที่ส่งไปยัง browser ครั้งเดียวผ่าน dcc.Store (แต่ละคอลัมน์เป็น list)
+
+    ประเภทโปรแกรมและภูมิภาคส่งเป็นรหัสพร้อมป้ายชื่อ ป้ายชื่อภูมิภาคเรียงตาม
+    categories เดียวกับที่ summarize_dataframe ใช้ ลำดับแท่งในกราฟภูมิภาคจึงตรงกัน
+    """
+    program_codes, program_labels = encode_column(df['program_type'])
+    region_codes, region_labels = encode_column(df['region'])
+
+    return {
+        'columns': {
+            'lat': df['display_lat'].tolist(),
+            'lon': df['display_lon'].tolist(),
+            'tuition': df['final_tuition_fee'].tolist(),
+            'program': program_codes,
+            'region': region_codes,
+            'unique_id': df['unique_id'].tolist(),
+            'hover_text': df['hover_text'].tolist()
+        },
+        'labels': {
+            'program': program_labels,
+            'region': region_labels
+        },
+        'colors': {
+            'program': [PROGRAM_COLORS.get(label, COLORS['secondary']) for label in program_labels]
+        },
+        'templates': build_figure_templates(df)
+    }
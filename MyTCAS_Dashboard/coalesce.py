@@ -0,0 +1,88 @@
+# coalesce.py - ทิ้ง callback request ที่ล้าสมัยแล้วของแต่ละหน้าที่เปิดอยู่ (ฝั่ง server)
+
+import functools
+import threading
+import uuid
+from dash.exceptions import PreventUpdate
+from flask import has_request_context
+
+# dcc.Store ที่เก็บตัวระบุของการโหลดหน้าแต่ละครั้ง (แต่ละแท็บได้ค่าใหม่ แม้ใช้ browser หรือ IP เดียวกัน)
+PAGE_ID = 'page-id'
+
+def new_page_id():
+    return uuid.uuid4().hex
+
+class RequestCoalescer:
+    """รวม request ของ callback เดียวกันจากหน้าเดียวกันให้เหลือเฉพาะตัวล่าสุด
+
+    request ที่เข้ามาขณะที่ request ก่อนหน้ายังคำนวณอยู่จะรอคิว เมื่อถึงคิวแล้วพบว่า
+    มี request ที่ใหม่กว่าเข้ามาแล้ว จะถูกทิ้ง (PreventUpdate) โดยไม่คำนวณ และ request
+    ที่คำนวณเสร็จแต่มีตัวใหม่กว่าเข้ามาระหว่างนั้นจะไม่ส่งผลกลับ (ไม่ต้อง serialize)
+    request ล่าสุดของแต่ละหน้าได้คำนวณและส่งผลกลับเสมอ
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.dropped = 0
+        self._generation = 0
+        self._latest = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def latest_only(self, func):
+        """decorator สำหรับ callback ที่มี State(PAGE_ID, 'data') เป็นอาร์กิวเมนต์สุดท้าย
+
+        func ถูกเรียกโดยไม่มี page-id ถ้าไม่มี page-id หรืออยู่นอก request ของ Flask (เช่น benchmark)
+        จะเรียกตรงๆ โดยไม่รวม request
+        """
+        @functools.wraps(func)
+        def wrapper(*args):
+            *args, page_id = args
+            if page_id is None or not has_request_context():
+                return func(*args)
+            return self.run((page_id, func.__name__), func, *args)
+        return wrapper
+
+    def run(self, key, func, *args):
+        with self._lock:
+            # ลำดับไม่ซ้ำกันทุก key: request เก่าที่ยังรอ lock เดิมอยู่หลังสถานะของ key ถูกลบ
+            # จะไม่ได้ลำดับตรงกับ request ชุดใหม่ของ key เดียวกัน
+            self._generation += 1
+            generation = self._generation
+            self._latest[key] = generation
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if self._superseded(key, generation):
+                raise PreventUpdate
+            try:
+                result = func(*args)
+            finally:
+                with self._lock:
+                    # ไม่มี request ใหม่กว่ารออยู่ ลบสถานะของ key นี้ออกเพื่อไม่ให้สะสม
+                    latest = self._latest.get(key) == generation
+                    if latest:
+                        del self._latest[key]
+                        del self._locks[key]
+
+        # มี request ใหม่กว่าเข้ามาระหว่างคำนวณ ไม่ต้อง serialize และส่งผลที่ล้าสมัยกลับไป
+        if not latest:
+            with self._lock:
+                self.dropped += 1
+            raise PreventUpdate
+        with self._lock:
+            self.executed += 1
+        return result
+
+    def _superseded(self, key, generation):
+        with self._lock:
+            # ไม่มี key แล้ว = request ที่ใหม่กว่าคำนวณเสร็จและลบสถานะไปแล้ว (lock ไม่รับประกันลำดับ)
+            superseded = self._latest.get(key) != generation
+            if superseded:
+                self.dropped += 1
+            return superseded
+
+    def stats(self):
+        """จำนวน request ที่คำนวณจริงและที่ถูกทิ้ง"""
+        with self._lock:
+            return {'executed': self.executed, 'dropped': self.dropped}
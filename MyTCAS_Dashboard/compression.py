@@ -0,0 +1,55 @@
+# compression.py - บีบอัด response ของ server (gzip หรือ brotli ตามที่ browser รองรับ)
+
+import gzip
+from flask import g, request
+
+try:
+    import brotli
+except ImportError:  # ไม่มี brotli ใช้ gzip อย่างเดียว
+    brotli = None
+
+from config import COMPRESSION_CONFIG
+
+# ชนิดข้อมูลที่บีบอัดได้ดี (callback response, layout, JS และ CSS ของ Dash)
+COMPRESSIBLE_TYPES = {
+    'application/json', 'application/javascript', 'text/javascript', 'text/css', 'text/html', 'text/plain'
+}
+
+def available_encodings():
+    """encoding ที่ server นี้ใช้ได้ เรียงตามลำดับที่เลือกก่อน"""
+    return (['br'] if brotli is not None else []) + ['gzip']
+
+def compress(data, encoding, level=COMPRESSION_CONFIG['level']):
+    if encoding == 'br':
+        return brotli.compress(data, quality=COMPRESSION_CONFIG['brotli_quality'])
+    return gzip.compress(data, compresslevel=level)
+
+def choose_encoding(accept_encodings):
+    """encoding แรกที่ทั้ง browser และ server รองรับ (None ถ้าไม่มี)"""
+    for encoding in available_encodings():
+        if accept_encodings[encoding]:
+            return encoding
+    return None
+
+def install_compression(server):
+    """บีบอัด response ของ Flask server ที่ใหญ่กว่า COMPRESSION_CONFIG['min_size'] ไบต์
+
+    ขนาดก่อนบีบอัดเก็บไว้ใน flask.g.tcas_uncompressed_bytes ให้ metrics รายงานทั้งสองค่า
+    ไฟล์ที่ส่งด้วย send_file (assets) ไม่ถูกบีบอัด
+    """
+    @server.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        data = response.get_data()
+        if encoding is None or len(data) < COMPRESSION_CONFIG['min_size']:
+            return response
+
+        g.tcas_uncompressed_bytes = len(data)
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
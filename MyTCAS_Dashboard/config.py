@@ -34,17 +34,88 @@ PROGRAM_COLORS = {
     'Cybersecurity': COLORS['success']
 }
 
+# คำสำคัญสำหรับจัดประเภทโปรแกรม (เรียงตามลำดับความสำคัญ ประเภทแรกที่พบคำสำคัญจะถูกเลือก)
+PROGRAM_CONFIG = {
+    'keywords': [
+        ('AI Engineering', ['ปัญญาประดิษฐ์', 'Artificial Intelligence', 'AI']),
+        ('Intelligent Systems', ['ระบบอัจฉริยะ', 'Intelligence Systems']),
+        ('Digital Engineering', ['ดิจิทัล', 'Digital']),
+        ('Cybersecurity', ['ไซเบอร์', 'Cyber'])
+    ],
+    'default_type': 'Computer Engineering',
+    'name_columns': ['หลักสูตร', 'หลักสูตรEng']
+}
+
 # การตั้งค่าแผนที่
 MAP_CONFIG = {
     'center_lat': 13.5,
     'center_lon': 101.0,
     'zoom': 4.8,
     'style': 'carto-positron',
-    'marker_size': 14
+    'marker_size': 14,
+    'offset_radius': 0.01,   # รัศมีการกระจายจุดที่อยู่พิกัดเดียวกัน (องศา)
+    'cluster_threshold': 5000,   # จำนวนจุดที่เกินแล้วแสดงเป็นกลุ่มตามช่องกริดแทนทีละจุด
+    'viewport_threshold': 1000,  # จำนวนจุดที่เกินแล้วส่งเฉพาะจุดในขอบเขตที่มองเห็น
+    'cluster_cell_px': 48,       # ขนาดช่องกริดของการรวมกลุ่มบนจอ (พิกเซล) ช่องเล็กลงเมื่อซูมเข้า
+    'cluster_marker_size': (10, 40)    # ขนาด marker ของกลุ่มที่เล็กที่สุดและใหญ่ที่สุด
 }
 
 # การตั้งค่าไฟล์ข้อมูล
 DATA_CONFIG = {
-    'csv_file': 'data\data_via_location_noises.csv',
+    'csv_file': 'data/data_via_location_noises.csv',
+    'artifact_file': 'data/data_clean.feather',    # สร้างด้วย python build_dataset.py
     'tuition_column': 'ค่าใช้จ่ายที่ปรับแล้ว'
-}
\ No newline at end of file
+}
+
+# การตั้งค่าแคช
+CACHE_CONFIG = {
+    'filter_cache_size': 64,    # จำนวนสถานะตัวกรองสูงสุดที่เก็บไว้ในแคช
+    'figure_cache_size': 128    # จำนวนรูปกราฟ (JSON) สูงสุดที่เก็บไว้ในแคช
+}
+
+# การตั้งค่า callback
+CALLBACK_CONFIG = {
+    'mode': 'separate',   # 'separate' = callback แยกต่อกราฟ, 'combined' = callback เดียวคืนทุก Output,
+                          # 'clientside' = กรองข้อมูลและวาดแผนที่/กราฟใน browser
+    'slider_debounce_ms': 200,    # รวมค่าตัวเลื่อนค่าเล่าเรียนที่เปลี่ยนติดกันภายในเวลานี้เป็น request เดียว (มิลลิวินาที)
+    'drop_superseded': True,      # ทิ้ง request ที่ล้าสมัยของหน้าเดียวกัน (แต่ละแท็บ) โดยไม่คำนวณ
+    'map_patch': True             # ส่งเฉพาะข้อมูลของ trace (Dash Patch) เมื่อชุด trace ของแผนที่เหมือนเดิม
+}
+
+# การตั้งค่าการวัดเวลาของ callback (ดูผลได้ที่ /metrics ในรูปแบบ Prometheus)
+METRICS_CONFIG = {
+    'enabled': True,
+    'slow_log_size': 0,       # > 0 = เก็บ callback ที่ช้าที่สุด N ครั้งพร้อม input (0 = ปิด)
+    'slow_threshold_ms': 500  # log เฉพาะ callback ที่ช้ากว่านี้ (มิลลิวินาที)
+}
+
+# การตั้งค่าการบีบอัด response (ใช้ brotli ถ้าติดตั้งไว้และ browser รองรับ ไม่เช่นนั้นใช้ gzip)
+COMPRESSION_CONFIG = {
+    'enabled': True,
+    'min_size': 500,        # ไม่บีบอัด response ที่เล็กกว่านี้ (ไบต์)
+    'level': 6,             # ระดับของ gzip (1-9)
+    'brotli_quality': 5     # ระดับของ brotli (0-11)
+}
+
+# การตั้งค่าการจัดภูมิภาค
+REGION_CONFIG = {
+    'boundary_file': None,                             # GeoJSON ขอบเขตภูมิภาคจาก build_dataset.py --provinces
+                                                       # เช่น 'data/thailand_regions.geojson' (None = ใช้กฎกรอบพิกัด)
+    'region_property': 'region',                       # ชื่อ property ที่เก็บชื่อภูมิภาค
+    'grid_cell_size': 0.25                             # ขนาดช่องกริดของดัชนีพื้นที่ (องศา)
+}
+
+# การตั้งค่า cube สถิติที่คำนวณล่วงหน้า
+CUBE_CONFIG = {
+    'tuition_bucket_size': 10000    # ความกว้างช่วงค่าเล่าเรียนของแต่ละ cell (บาท)
+}
+
+# การตั้งค่า production server (gunicorn -c gunicorn.conf.py wsgi:server)
+SERVER_CONFIG = {
+    'bind': '0.0.0.0:8050',
+    'workers': 4,            # จำนวน process (แนะนำ 1-2 ต่อ core)
+    'threads': 4,            # จำนวน thread ต่อ process
+    'timeout': 60,           # วินาทีก่อน worker ที่ค้างถูก restart
+    'preload': True          # โหลดข้อมูลใน master แล้ว fork (worker ใช้หน่วยความจำร่วมแบบ copy-on-write)
+                             # False: master สร้างไฟล์ artifact แล้วแต่ละ worker memory-map ไฟล์นั้น
+}
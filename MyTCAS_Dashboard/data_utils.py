@@ -1,11 +1,38 @@
 # data_utils.py - ฟังก์ชันจัดการข้อมูล
 
+import logging
+import os
+import re
 import pandas as pd
 import numpy as np
-from config import DATA_CONFIG
+import artifact
+from config import DATA_CONFIG, REGION_CONFIG, PROGRAM_CONFIG, MAP_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# ภูมิภาคทั้งหมด (เรียงตามตัวอักษร ให้ groupby บนคอลัมน์ categorical ได้ลำดับเดิม)
+REGIONS = ['กรุงเทพฯและปริมณฑล', 'ภาคกลาง', 'ภาคอีสาน', 'ภาคเหนือ', 'ภาคใต้']
 
 def load_and_clean_data():
-    """โหลดและทำความสะอาดข้อมูล"""
+    """โหลดข้อมูล ใช้ไฟล์ artifact ที่ build ไว้ถ้ายังไม่ล้าสมัย มิฉะนั้นทำความสะอาดจาก CSV"""
+    if artifact.is_artifact_fresh(DATA_CONFIG['artifact_file'], DATA_CONFIG['csv_file']):
+        return artifact.read_artifact(DATA_CONFIG['artifact_file'])
+    
+    return clean_csv_data()
+
+def refresh_artifact():
+    """สร้างไฟล์ artifact ใหม่ถ้าไม่มีหรือล้าสมัย คืน True ถ้าเขียนไฟล์ใหม่
+
+    ใช้ใน process หลักก่อนเริ่ม worker ที่โหลดข้อมูลเอง ทุก worker จึง memory-map ไฟล์เดียวกัน
+    แทนการทำความสะอาด CSV และเก็บสำเนาของตัวเอง
+    """
+    if artifact.pa is None or artifact.is_artifact_fresh(DATA_CONFIG['artifact_file'], DATA_CONFIG['csv_file']):
+        return False
+    artifact.write_artifact(clean_csv_data(), DATA_CONFIG['artifact_file'], DATA_CONFIG['csv_file'])
+    return True
+
+def clean_csv_data():
+    """โหลดและทำความสะอาดข้อมูลจาก CSV"""
     df = pd.read_csv(DATA_CONFIG['csv_file'])
     df_clean = df.copy()
     
@@ -19,11 +46,12 @@ def load_and_clean_data():
     df_clean['unique_id'] = df_clean.index.astype(str)
     
     # เพิ่มข้อมูลภูมิภาคและประเภทโปรแกรม
-    df_clean['region'] = df_clean.apply(
-        lambda row: get_region_from_coordinates(row['latitude'], row['longitude']), 
-        axis=1
-    )
-    df_clean['program_type'] = df_clean['หลักสูตร'].apply(categorize_program)
+    df_clean['region'] = assign_regions(df_clean['latitude'], df_clean['longitude'])
+    df_clean['program_type'] = categorize_programs(df_clean)
+    
+    # พิกัดและข้อความ hover สำหรับแผนที่ คำนวณครั้งเดียวตอนโหลด
+    df_clean = add_coordinate_offset(df_clean)
+    df_clean['hover_text'] = build_hover_text(df_clean)
     
     return df_clean
 
@@ -40,24 +68,119 @@ def get_region_from_coordinates(lat, lon):
     else:
         return 'ภาคกลาง'
 
+def assign_regions(lat, lon):
+    """จัดภูมิภาคด้วยขอบเขตจังหวัดถ้าตั้งไฟล์ขอบเขตไว้ มิฉะนั้นใช้กฎกรอบพิกัด (เตือนถ้าตั้งไว้แต่ไม่มีไฟล์)"""
+    boundary_file = REGION_CONFIG['boundary_file']
+    if boundary_file and os.path.exists(boundary_file):
+        # import ภายในฟังก์ชันเพราะ region_engine ใช้ REGIONS จากโมดูลนี้
+        from region_engine import RegionEngine
+        engine = RegionEngine.from_geojson(
+            boundary_file,
+            region_property=REGION_CONFIG['region_property'],
+            cell_size=REGION_CONFIG['grid_cell_size']
+        )
+        return engine.classify(lat, lon)
+    
+    if boundary_file:
+        logger.warning('ไม่มีไฟล์ขอบเขตภูมิภาค %s ใช้กฎกรอบพิกัดแทน (สร้างด้วย build_dataset.py --provinces)',
+                       boundary_file)
+    return classify_regions(lat, lon)
+
+def classify_regions(lat, lon):
+    """แปลงพิกัดทั้งคอลัมน์เป็นภูมิภาคแบบ vectorized (ผลเหมือน get_region_from_coordinates)"""
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    
+    # เงื่อนไขเรียงตามลำดับเดียวกับ get_region_from_coordinates
+    conditions = [
+        lat >= 17.0,
+        (lat >= 14.0) & (lon >= 101.5),
+        lat <= 11.0,
+        (lat >= 13.5) & (lat <= 14.5) & (lon >= 100.2) & (lon <= 101.2)
+    ]
+    choices = [REGIONS.index(region) for region in ['ภาคเหนือ', 'ภาคอีสาน', 'ภาคใต้', 'กรุงเทพฯและปริมณฑล']]
+    codes = np.select(conditions, choices, default=REGIONS.index('ภาคกลาง'))
+    
+    return pd.Categorical.from_codes(codes, categories=REGIONS)
+
 def categorize_program(program_name):
     """จัดประเภทโปรแกรม"""
     program_name = str(program_name)
     
-    if any(word in program_name for word in ['ปัญญาประดิษฐ์', 'Artificial Intelligence', 'AI']):
-        return 'AI Engineering'
-    elif any(word in program_name for word in ['ระบบอัจฉริยะ', 'Intelligence Systems']):
-        return 'Intelligent Systems'
-    elif any(word in program_name for word in ['ดิจิทัล', 'Digital']):
-        return 'Digital Engineering'
-    elif any(word in program_name for word in ['ไซเบอร์', 'Cyber']):
-        return 'Cybersecurity'
-    else:
-        return 'Computer Engineering'
+    for program_type, keywords in PROGRAM_CONFIG['keywords']:
+        if any(word in program_name for word in keywords):
+            return program_type
+    return PROGRAM_CONFIG['default_type']
 
-def filter_dataframe(df, program_type, region, tuition_range):
-    """กรองข้อมูลตามเงื่อนไข"""
-    filtered_df = df.copy()
+class ProgramCategorizer:
+    """จัดประเภทโปรแกรมทั้งคอลัมน์ด้วย regex เดียวที่รวมคำสำคัญทุกประเภท
+
+    ทางเลือกใน regex เรียงตามลำดับความสำคัญ และเลือกประเภทที่สำคัญที่สุด
+    จากคำสำคัญทุกคำที่พบ ผลจึงเหมือน categorize_program ทุกกรณี
+    ชื่อหลักสูตรซ้ำกันมาก จึงจัดประเภทเฉพาะชื่อที่ไม่ซ้ำแล้วกระจายผลกลับด้วยรหัส
+    """
+
+    def __init__(self, keyword_table, default_type):
+        self.labels = np.array([program_type for program_type, _ in keyword_table] + [default_type], dtype=object)
+        self.default_code = len(keyword_table)
+        
+        # คำสำคัญ -> ลำดับความสำคัญของประเภท
+        self.priority = {}
+        for code, (_, keywords) in enumerate(keyword_table):
+            for word in keywords:
+                self.priority.setdefault(word, code)
+        
+        alternation = '|'.join(re.escape(word) for word in self.priority)
+        if self._matches_can_hide(self.priority):
+            # ใช้ lookahead เพื่อให้เจอคำสำคัญทุกตำแหน่งแม้จะซ้อนทับกัน (ช้ากว่า)
+            self.pattern = re.compile(f'(?=({alternation}))')
+        else:
+            self.pattern = re.compile(alternation)
+
+    @staticmethod
+    def _matches_can_hide(priority):
+        """ตรวจว่าคำสำคัญที่สำคัญน้อยกว่าอาจกลืนคำที่สำคัญกว่าใน findall แบบไม่ซ้อนทับหรือไม่"""
+        for lower, lower_code in priority.items():
+            for higher, higher_code in priority.items():
+                if higher_code >= lower_code:
+                    continue
+                if higher in lower or any(lower.endswith(higher[:i]) for i in range(1, len(higher))):
+                    return True
+        return False
+
+    def text_codes(self, texts):
+        """รหัสประเภทของข้อความแต่ละรายการ (ยิ่งน้อยยิ่งสำคัญ)"""
+        return np.array([
+            min((self.priority[word] for word in self.pattern.findall(text)), default=self.default_code)
+            for text in texts
+        ], dtype=np.int64)
+
+    def column_codes(self, column):
+        """รหัสประเภทของทั้งคอลัมน์ โดยประมวลผลเฉพาะค่าที่ไม่ซ้ำ"""
+        # ค่าว่างแทนด้วย 'nan' ให้ตรงกับ str(program_name) ใน categorize_program
+        codes, uniques = pd.factorize(column.fillna('nan').astype(str))
+        return self.text_codes(uniques)[codes]
+
+    def categorize(self, df, columns):
+        """จัดประเภทจากหลายคอลัมน์ ถ้าพบคำสำคัญหลายประเภทจะเลือกประเภทที่สำคัญที่สุด"""
+        codes = np.full(len(df), self.default_code, dtype=np.int64)
+        for column in columns:
+            codes = np.minimum(codes, self.column_codes(df[column]))
+        return self.labels[codes]
+
+PROGRAM_CATEGORIZER = ProgramCategorizer(PROGRAM_CONFIG['keywords'], PROGRAM_CONFIG['default_type'])
+
+def categorize_programs(df):
+    """จัดประเภทโปรแกรมของทุกแถวจากชื่อหลักสูตรไทยและอังกฤษ"""
+    columns = [column for column in PROGRAM_CONFIG['name_columns'] if column in df.columns]
+    return PROGRAM_CATEGORIZER.categorize(df, columns)
+
+def filter_dataframe(df, program_type, region, tuition_range, index=None):
+    """กรองข้อมูลตามเงื่อนไข (ถ้ามี index จะใช้ดัชนีที่สร้างไว้แทนการสแกนทั้งตาราง)"""
+    if index is not None:
+        return index.filter(program_type, region, tuition_range)
+    
+    filtered_df = df
     
     if program_type != 'all':
         filtered_df = filtered_df[filtered_df['program_type'] == program_type]
@@ -72,22 +195,194 @@ def filter_dataframe(df, program_type, region, tuition_range):
     
     return filtered_df
 
-def add_coordinate_offset(df):
-    """เพิ่มการเลื่อนพิกัดเล็กน้อยสำหรับมหาวิทยาลัยที่อยู่ตำแหน่งเดียวกัน"""
-    grouped = df.groupby(['latitude', 'longitude'])
-    
-    result_dfs = []
-    for (lat, lon), group in grouped:
-        if len(group) > 1:
-            # เพิ่มการเลื่อนแบบสุ่มเล็กน้อย
-            offsets = np.random.uniform(-0.01, 0.01, size=(len(group), 2))
-            group = group.copy()
-            group['display_lat'] = lat + offsets[:, 0]
-            group['display_lon'] = lon + offsets[:, 1]
-        else:
-            group = group.copy()
-            group['display_lat'] = group['latitude']
-            group['display_lon'] = group['longitude']
-        result_dfs.append(group)
+def ranked_counts(series):
+    """value_counts ที่ค่าซึ่งนับได้เท่ากันเรียงตามลำดับที่พบก่อน (ผลคงที่ทุกครั้ง)"""
+    return series.value_counts(sort=False).sort_values(ascending=False, kind='stable')
+
+def summarize_dataframe(filtered_df):
+    """สรุปสถิติของข้อมูลที่กรองแล้วด้วย pandas (เป็นผลอ้างอิงของ StatsCube)"""
+    tuition = filtered_df['final_tuition_fee']
+    
+    regional_stats = filtered_df.groupby('region', observed=True).agg({
+        'final_tuition_fee': ['mean', 'count'],
+        'มหาวิทยาลัย': 'nunique'
+    }).round(0)
+    regional_stats.columns = ['avg_tuition', 'program_count', 'university_count']
     
-    return pd.concat(result_dfs, ignore_index=True)
\ No newline at end of file
+    return {
+        'total_programs': len(filtered_df),
+        'total_universities': filtered_df['มหาวิทยาลัย'].nunique(),
+        'avg_tuition': tuition.mean(),
+        'min_tuition': tuition.min(),
+        'max_tuition': tuition.max(),
+        'regions_count': filtered_df['region'].nunique(),
+        'university_counts': ranked_counts(filtered_df['มหาวิทยาลัย']),
+        'program_counts': ranked_counts(filtered_df['program_type']),
+        'regional_stats': regional_stats.reset_index()
+    }
+
+def build_bitmaps(series):
+    """แปลงคอลัมน์เป็นรหัส categorical และ bitmap ของแถวสำหรับแต่ละค่า"""
+    categorical = pd.Categorical(series)
+    codes = categorical.codes
+    bitmaps = {value: codes == code for code, value in enumerate(categorical.categories)}
+    return codes, bitmaps
+
+class FilterIndex:
+    """ดัชนีสำหรับกรองข้อมูล สร้างครั้งเดียวหลังโหลดข้อมูล
+
+    ตัวกรองประเภทโปรแกรมและภูมิภาคใช้ bitmap ของแต่ละค่า ส่วนช่วงค่าเล่าเรียน
+    ใช้ searchsorted บนค่าเล่าเรียนที่เรียงไว้แล้ว ผลลัพธ์คือ AND ของ bitmap
+    โดยไม่ต้อง copy ทั้งตาราง
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.program_codes, self.program_bitmaps = build_bitmaps(df['program_type'])
+        self.region_codes, self.region_bitmaps = build_bitmaps(df['region'])
+        
+        tuition = df['final_tuition_fee'].to_numpy(dtype=float)
+        self.tuition_order = np.argsort(tuition, kind='stable')
+        self.sorted_tuition = tuition[self.tuition_order]
+        self.empty = np.zeros(len(df), dtype=bool)
+
+    def tuition_bitmap(self, tuition_range):
+        """bitmap ของแถวที่ค่าเล่าเรียนอยู่ในช่วง (รวมขอบทั้งสองด้าน)"""
+        start = np.searchsorted(self.sorted_tuition, tuition_range[0], side='left')
+        stop = np.searchsorted(self.sorted_tuition, tuition_range[1], side='right')
+        bitmap = self.empty.copy()
+        bitmap[self.tuition_order[start:stop]] = True
+        return bitmap
+
+    def row_mask(self, program_type, region, tuition_range):
+        """bitmap ของแถวที่ผ่านทุกเงื่อนไข"""
+        mask = self.tuition_bitmap(tuition_range)
+        if program_type != 'all':
+            mask &= self.program_bitmaps.get(program_type, self.empty)
+        if region != 'all':
+            mask &= self.region_bitmaps.get(region, self.empty)
+        return mask
+
+    def filter(self, program_type, region, tuition_range):
+        positions = np.flatnonzero(self.row_mask(program_type, region, tuition_range))
+        return self.df.iloc[positions]
+
+class DetailsIndex:
+    """ดัชนีสำหรับแผงรายละเอียดของจุดที่ถูกคลิก สร้างครั้งเดียวหลังโหลดข้อมูล
+
+    unique_id -> ตำแหน่งแถว (dict), มหาวิทยาลัย -> ตำแหน่งแถวของทุกโปรแกรม
+    และอันดับของมหาวิทยาลัยตามจำนวนโปรแกรม (ลำดับเดียวกับ Top Universities)
+    การตรวจตัวกรองทำเฉพาะแถวของมหาวิทยาลัยนั้น ไม่ต้องกรองทั้งตาราง
+    """
+
+    def __init__(self, df):
+        self.df = df
+        ids = df['unique_id'].to_numpy()
+        first = ~pd.Index(ids).duplicated()
+        # unique_id ซ้ำใช้แถวแรก เหมือน .iloc[0] ของการค้นแบบเดิม
+        self.row_of = dict(zip(ids[first], np.flatnonzero(first)))
+
+        self.university_rows = df.groupby('มหาวิทยาลัย', sort=False).indices
+        ranking = ranked_counts(df['มหาวิทยาลัย'])
+        university_rank = pd.Series(np.arange(1, len(ranking) + 1), index=ranking.index)
+        self.rank = df['มหาวิทยาลัย'].map(university_rank).to_numpy()
+
+        self.program_type = df['program_type'].to_numpy()
+        self.region = df['region'].to_numpy()
+        self.tuition = df['final_tuition_fee'].to_numpy(dtype=float)
+
+    def matches(self, rows, program_type, region, tuition_range):
+        """bitmap ของแถวที่ระบุว่าผ่านตัวกรองหรือไม่"""
+        mask = (self.tuition[rows] >= tuition_range[0]) & (self.tuition[rows] <= tuition_range[1])
+        if program_type != 'all':
+            mask &= self.program_type[rows] == program_type
+        if region != 'all':
+            mask &= self.region[rows] == region
+        return mask
+
+    def lookup(self, unique_id, program_type, region, tuition_range):
+        """คืน (แถวที่ถูกคลิก, โปรแกรมของมหาวิทยาลัยเดียวกันที่ผ่านตัวกรอง, อันดับ)
+
+        คืน None ถ้าไม่พบ unique_id หรือแถวนั้นไม่ผ่านตัวกรองปัจจุบัน
+        """
+        row = self.row_of.get(unique_id)
+        if row is None or not self.matches([row], program_type, region, tuition_range)[0]:
+            return None
+
+        university_data = self.df.iloc[row]
+        rows = self.university_rows[university_data['มหาวิทยาลัย']]
+        same_university = self.df.iloc[rows[self.matches(rows, program_type, region, tuition_range)]]
+        return university_data, same_university, int(self.rank[row])
+
+def build_hover_text(df):
+    """สร้างข้อความ hover ของแต่ละจุดบนแผนที่"""
+    tuition = df['final_tuition_fee'].map('{:,.0f}'.format)
+    return ('<b>🏫 ' + df['มหาวิทยาลัย'].astype(str) + '</b><br>' +
+            '📚 ' + df['program_type'].astype(str) + '<br>' +
+            '🎓 ' + df['หลักสูตร'].astype(str) + '<br>' +
+            '🏢 ' + df['วิทยาเขต'].astype(str) + '<br>' +
+            '💰 Tuition: ฿' + tuition + '<br>' +
+            '<extra></extra>')
+
+def cluster_cell_size(zoom, cell_px=MAP_CONFIG['cluster_cell_px']):
+    """ขนาดช่องกริด (องศา) ที่กว้างประมาณ cell_px พิกเซลบนจอที่ระดับซูม zoom
+
+    ที่ระดับซูม z แผนที่ทั้งโลก (360 องศา) กว้าง 256 * 2^z พิกเซล
+    """
+    return 360.0 / 2 ** zoom * cell_px / 256
+
+def cluster_points(df, cell_size):
+    """รวมจุดที่อยู่ในช่องกริดเดียวกัน คืน DataFrame หนึ่งแถวต่อช่อง
+
+    คอลัมน์: latitude/longitude (ค่าเฉลี่ยของจุดในช่อง), count และ avg_tuition
+    ใช้พิกัดจริง (ไม่ใช่พิกัดที่เลื่อนไว้แสดงผล) เรียงตามจำนวนจุดจากมากไปน้อย
+    """
+    lat = df['latitude'].to_numpy(dtype=float)
+    lon = df['longitude'].to_numpy(dtype=float)
+    cell_lat = np.floor(lat / cell_size).astype(np.int64)
+    cell_lon = np.floor(lon / cell_size).astype(np.int64)
+    
+    # รวมตำแหน่งแถวและคอลัมน์ของช่องเป็น key เดียว
+    width = int(cell_lon.max() - cell_lon.min()) + 1 if len(df) else 1
+    keys = (cell_lat - cell_lat.min(initial=0)) * width + (cell_lon - cell_lon.min(initial=0))
+    _, cell = np.unique(keys, return_inverse=True)
+    
+    count = np.bincount(cell)
+    clusters = pd.DataFrame({
+        'latitude': np.bincount(cell, weights=lat) / count,
+        'longitude': np.bincount(cell, weights=lon) / count,
+        'count': count,
+        'avg_tuition': np.bincount(cell, weights=df['final_tuition_fee'].to_numpy(dtype=float)) / count
+    })
+    return clusters.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
+
+def points_in_bounds(df, bounds):
+    """แถวที่พิกัดแสดงผลอยู่ในขอบเขต (lon_min, lat_min, lon_max, lat_max) คืน df เดิมถ้า bounds เป็น None"""
+    if bounds is None:
+        return df
+    lon_min, lat_min, lon_max, lat_max = bounds
+    lat = df['display_lat'].to_numpy()
+    lon = df['display_lon'].to_numpy()
+    return df[(lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)]
+
+def add_coordinate_offset(df, radius=MAP_CONFIG['offset_radius']):
+    """เพิ่มการเลื่อนพิกัดเล็กน้อยสำหรับมหาวิทยาลัยที่อยู่ตำแหน่งเดียวกัน
+
+    จุดในกลุ่มพิกัดเดียวกันถูกเรียงด้วย hash ของ unique_id แล้ววางบนเกลียว
+    (sunflower spiral) รอบพิกัดจริง ผลจึงเหมือนเดิมทุกครั้งสำหรับแถวชุดเดิม
+    """
+    hashes = pd.util.hash_pandas_object(df['unique_id'], index=False)
+    grouped = hashes.groupby([df['latitude'], df['longitude']], sort=False)
+    
+    # ขนาดกลุ่มและลำดับของแต่ละจุดในกลุ่ม
+    group_size = grouped.transform('size').to_numpy()
+    position = grouped.rank(method='first').to_numpy() - 1
+    
+    golden_angle = np.pi * (3 - np.sqrt(5))
+    angle = position * golden_angle
+    distance = np.where(group_size > 1, radius * np.sqrt((position + 0.5) / group_size), 0.0)
+    
+    return df.assign(
+        display_lat=df['latitude'].to_numpy() + distance * np.sin(angle),
+        display_lon=df['longitude'].to_numpy() + distance * np.cos(angle)
+    )
@@ -0,0 +1,35 @@
+# gunicorn.conf.py - การตั้งค่า gunicorn สำหรับ wsgi:server (ค่าเริ่มต้นจาก SERVER_CONFIG)
+#
+# ค่าจาก command line มีผลเหนือไฟล์นี้ เช่น gunicorn -c gunicorn.conf.py -w 8 --threads 2 wsgi:server
+
+import gc
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import SERVER_CONFIG
+
+bind = SERVER_CONFIG['bind']
+workers = SERVER_CONFIG['workers']
+threads = SERVER_CONFIG['threads']
+timeout = SERVER_CONFIG['timeout']
+worker_class = 'gthread'
+
+# โหลดข้อมูลครั้งเดียวใน master ก่อน fork
+preload_app = SERVER_CONFIG['preload']
+
+def on_starting(server):
+    if preload_app:
+        return
+    # แต่ละ worker โหลดแอปเอง: สร้างไฟล์ artifact ครั้งเดียวใน master ก่อน worker ทุกตัวจึง
+    # memory-map ไฟล์เดียวกัน (คอลัมน์ตัวเลขอยู่ใน page cache ชุดเดียว) แทนการทำความสะอาด CSV เอง
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    from data_utils import refresh_artifact
+    if refresh_artifact():
+        server.log.info('สร้างไฟล์ artifact ใหม่สำหรับ worker')
+
+def when_ready(server):
+    # ย้าย object ที่โหลดไว้ออกจากการติดตามของ GC ก่อน fork
+    # GC ของ worker จะไม่เขียน header ของ object เหล่านี้ หน้าหน่วยความจำจึงยังใช้ร่วมกันได้
+    gc.freeze()
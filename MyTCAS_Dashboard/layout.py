@@ -1,7 +1,9 @@
 # layout.py - ส่วนประกอบของหน้าเว็บ
 
 from dash import dcc, html
-from config import COLORS
+from config import COLORS, CALLBACK_CONFIG, MAP_CONFIG
+from client_data import build_client_dataset
+from coalesce import PAGE_ID, new_page_id
 
 def create_header():
     """สร้างส่วนหัวของหน้าเว็บ"""
@@ -116,6 +118,11 @@ def create_filters(df_clean):
                     },
                     tooltip={"placement": "bottom", "always_visible": True},
                     className='modern-slider'
+                ),
+                # ช่วงค่าเล่าเรียนที่ callback ใช้ อัปเดตจากตัวเลื่อนแบบ debounce
+                dcc.Store(
+                    id='tuition-range',
+                    data=[df_clean['final_tuition_fee'].min(), df_clean['final_tuition_fee'].max()]
                 )
             ], style={'width': '34%', 'display': 'inline-block'})
         ], style={
@@ -155,7 +162,11 @@ def create_map_section():
                     'displaylogo': False,
                     'modeBarButtonsToRemove': ['lasso2d', 'select2d']
                 }
-            )
+            ),
+            # ระดับซูม (จำนวนเต็ม) และขอบเขตที่มองเห็น ใช้เลือกจุดและขนาดช่องกริดของแผนที่
+            dcc.Store(id='map-view', data={'zoom': int(MAP_CONFIG['zoom']), 'bounds': None}),
+            # รูปแผนที่ที่ browser แสดงอยู่ (ตัวกรองและชุด trace) ใช้ตัดสินการส่ง Patch
+            dcc.Store(id='map-render')
         ], style={
             'background': 'rgba(255, 255, 255, 0.25)',
             'backdropFilter': 'blur(10px)',
@@ -297,4 +308,53 @@ def create_charts_section():
                 'transition': 'all 0.3s ease'
             })
         ])
-    ], style={'width': '63%', 'display': 'inline-block', 'marginLeft': '2%', 'verticalAlign': 'top'})
\ No newline at end of file
+    ], style={'width': '63%', 'display': 'inline-block', 'marginLeft': '2%', 'verticalAlign': 'top'})
+
+def create_client_store(df_clean):
+    """ข้อมูลแบบ columnar ที่ส่งไปยัง browser ครั้งเดียว (เฉพาะโหมด clientside)"""
+    if CALLBACK_CONFIG['mode'] != 'clientside':
+        return None
+    
+    return dcc.Store(id='client-data', data=build_client_dataset(df_clean))
+
+def create_layout(df_clean):
+    """สร้าง Layout หลักของแอป"""
+    return html.Div([
+        create_client_store(df_clean),
+        
+        # Container หลักพร้อมพื้นหลัง gradient
+        html.Div([
+            # ส่วนหัว
+            create_header(),
+            
+            # ส่วนกรองข้อมูล
+            create_filters(df_clean),
+            
+            # เนื้อหาหลัก
+            html.Div([
+                # แถวแผนที่และรายละเอียด
+                html.Div([
+                    create_map_section(),
+                    create_details_section()
+                ], style={'marginBottom': '32px'}),
+                
+                # แถววิเคราะห์ข้อมูล
+                html.Div([
+                    create_statistics_section(),
+                    create_charts_section()
+                ])
+            ], className="fade-in")
+        ], style={
+            'background': COLORS['background'],
+            'minHeight': '100vh',
+            'padding': '40px 20px',
+            'fontFamily': "'Inter', -apple-system, BlinkMacSystemFont, sans-serif"
+        })
+    ], style={'margin': '0', 'padding': '0'})
+
+def serve_layout(layout):
+    """layout ต่อการโหลดหน้า: layout ที่สร้างไว้ครั้งเดียว พร้อม page-id ใหม่ทุกครั้ง (กำหนดให้ app.layout)
+
+    page-id แยก request ของแต่ละแท็บออกจากกัน RequestCoalescer จึงทิ้งเฉพาะ request ล้าสมัยของหน้าเดียวกัน
+    """
+    return lambda: html.Div([dcc.Store(id=PAGE_ID, data=new_page_id()), layout])
@@ -0,0 +1,210 @@
+# metrics.py - วัดเวลาของ callback และส่งออกในรูปแบบข้อความของ Prometheus (/metrics)
+
+import functools
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dash.exceptions import PreventUpdate
+from flask import Response, g, has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+# ขอบบนของแต่ละ bucket (วินาที และไบต์)
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (1_000, 5_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = [(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+               for name, value in pairs]
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+def format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    """histogram แบบ Prometheus (จำนวนสะสมต่อ bucket, ผลรวม, จำนวน) แยกตามค่าของ label"""
+
+    def __init__(self, name, help_text, buckets, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series['buckets']):
+                    label_text = format_labels(self.label_names, labels, [('le', format_number(bound))])
+                    lines.append(f'{self.name}_bucket{label_text} {count}')
+                label_text = format_labels(self.label_names, labels, [('le', '+Inf')])
+                lines.append(f'{self.name}_bucket{label_text} {series["count"]}')
+                label_text = format_labels(self.label_names, labels)
+                lines.append(f'{self.name}_sum{label_text} {format_number(series["sum"])}')
+                lines.append(f'{self.name}_count{label_text} {series["count"]}')
+        return lines
+
+class Counter:
+    """ตัวนับแบบ Prometheus แยกตามค่าของ label"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{format_labels(self.label_names, labels)} {value}')
+        return lines
+
+class CallbackMetrics:
+    """สถิติเวลาและขนาดผลลัพธ์ของ callback
+
+    - timed: decorator วัดเวลารวมของ callback ทั้งฟังก์ชัน
+    - stage: วัดเวลาของขั้นตอนย่อย ('filter' = กรอง/สรุปข้อมูล, 'build' = สร้างรูปกราฟหรือ component)
+      เวลาของขั้นตอนที่ซ้อนอยู่ข้างในไม่ถูกนับซ้ำในขั้นตอนที่ครอบ
+    - ขนาดผลลัพธ์วัดจาก response ที่ Dash serialize แล้ว (เฉพาะเมื่อ install บน Flask server)
+
+    ถ้า slow_log_size > 0 จะเก็บ callback ที่ช้าที่สุด N ครั้งพร้อม input และ log ครั้งที่ช้ากว่า slow_threshold_ms
+    ถ้า enabled=False ทั้ง timed และ stage ไม่บันทึกอะไร
+    ค่าเก็บแยกต่อ process (gunicorn หลาย worker จะได้ค่าของ worker ที่ตอบ request นั้น)
+    """
+
+    def __init__(self, slow_log_size=0, slow_threshold_ms=500, enabled=True):
+        self.enabled = enabled
+        self.callback_seconds = Histogram(
+            'tcas_callback_duration_seconds', 'Time spent in a Dash callback.', TIME_BUCKETS, ['callback'])
+        self.stage_seconds = Histogram(
+            'tcas_callback_stage_seconds', 'Time spent in a stage of a Dash callback.',
+            TIME_BUCKETS, ['callback', 'stage'])
+        self.response_bytes = Histogram(
+            'tcas_callback_response_bytes', 'Serialized size of a Dash callback response.',
+            SIZE_BUCKETS, ['callback'])
+        self.wire_bytes = Histogram(
+            'tcas_callback_response_wire_bytes', 'Size of a Dash callback response as sent (after compression).',
+            SIZE_BUCKETS, ['callback'])
+        self.prevented = Counter(
+            'tcas_callback_prevented_total', 'Callback calls that returned no update.', ['callback'])
+        self.slow_log_size = slow_log_size
+        self.slow_threshold = slow_threshold_ms / 1000
+        self._slowest = []
+        self._sequence = itertools.count()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def timed(self, func):
+        """decorator วัดเวลาของฟังก์ชัน callback (ชื่อ callback คือชื่อฟังก์ชัน)"""
+        if not self.enabled:
+            return func
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            previous = getattr(self._local, 'callback', None)
+            self._local.callback = name
+            if has_request_context():
+                g.tcas_callback = name
+            start = time.perf_counter()
+            try:
+                result = func(*args)
+            except PreventUpdate:
+                self.prevented.inc((name,))
+                raise
+            finally:
+                self._local.callback = previous
+            seconds = time.perf_counter() - start
+            self.callback_seconds.observe((name,), seconds)
+            if self.slow_log_size > 0:
+                self._record_slow(name, seconds, args)
+            return result
+        return wrapper
+
+    @contextmanager
+    def stage(self, stage):
+        """วัดเวลาของขั้นตอนย่อยภายใน callback ที่กำลังทำงานใน thread นี้"""
+        if not self.enabled:
+            yield
+            return
+        stack = self._local.__dict__.setdefault('stages', [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            callback = getattr(self._local, 'callback', None) or 'none'
+            self.stage_seconds.observe((callback, stage), elapsed - nested)
+
+    def _record_slow(self, name, seconds, args):
+        with self._lock:
+            entry = (seconds, next(self._sequence), name, args)
+            if len(self._slowest) < self.slow_log_size:
+                heapq.heappush(self._slowest, entry)
+            elif seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+        if seconds > self.slow_threshold:
+            logger.warning('slow callback %s: %.1f ms inputs=%r', name, seconds * 1000, args)
+
+    def slowest(self):
+        """callback ที่ช้าที่สุดที่เก็บไว้ เรียงจากช้าไปเร็ว"""
+        with self._lock:
+            entries = sorted(self._slowest, reverse=True)
+        return [{'callback': name, 'ms': seconds * 1000, 'inputs': args}
+                for seconds, _, name, args in entries]
+
+    def render(self):
+        """ข้อความสำหรับ /metrics"""
+        lines = []
+        for metric in (self.callback_seconds, self.stage_seconds, self.response_bytes, self.wire_bytes,
+                       self.prevented):
+            lines += metric.render()
+        return '\n'.join(lines) + '\n'
+
+    def install(self, server, path='/metrics'):
+        """เพิ่ม route /metrics และวัดขนาด response ของ callback บน Flask server
+
+        ต้องเรียกก่อน install_compression (after_request ทำงานย้อนลำดับ) จึงได้ทั้งขนาดก่อนและหลังบีบอัด
+        """
+        @server.after_request
+        def record_response_size(response):
+            callback = g.get('tcas_callback')
+            if callback is not None and request.path.endswith('_dash-update-component') \
+                    and response.status_code == 200 and not response.is_streamed:
+                wire_bytes = response.calculate_content_length() or 0
+                self.response_bytes.observe((callback,), g.get('tcas_uncompressed_bytes', wire_bytes))
+                self.wire_bytes.observe((callback,), wire_bytes)
+            return response
+
+        server.add_url_rule(path, 'tcas_metrics', lambda: Response(self.render(), content_type=CONTENT_TYPE))
@@ -0,0 +1,252 @@
+# region_engine.py - จัดภูมิภาคด้วยการทดสอบจุดในรูปหลายเหลี่ยม (point-in-polygon) พร้อมดัชนีกริด
+
+import json
+import numpy as np
+import pandas as pd
+from data_utils import REGIONS, classify_regions
+
+def load_region_polygons(path, region_property='region'):
+    """อ่านขอบเขตภูมิภาค/จังหวัดจากไฟล์ GeoJSON
+
+    คืน list ของ (ชื่อภูมิภาค, rings) โดย rings คือ list ของ array (lon, lat)
+    วงแรกเป็นขอบนอก วงที่เหลือเป็นรู
+    """
+    with open(path, encoding='utf-8') as f:
+        collection = json.load(f)
+
+    polygons = []
+    for feature in collection['features']:
+        region = feature['properties'][region_property]
+        geometry = feature['geometry']
+        if geometry['type'] == 'Polygon':
+            parts = [geometry['coordinates']]
+        elif geometry['type'] == 'MultiPolygon':
+            parts = geometry['coordinates']
+        else:
+            continue
+        for rings in parts:
+            polygons.append((region, [np.asarray(ring, dtype=float)[:, :2] for ring in rings]))
+
+    return polygons
+
+def ring_edges(rings):
+    """แปลง rings เป็น array ของขอบ (x1, y1, x2, y2)"""
+    edges = []
+    for ring in rings:
+        edges.append(np.hstack([ring, np.roll(ring, -1, axis=0)]))
+    return np.vstack(edges)
+
+def points_in_edges(px, py, edges, chunk_size=4_000_000):
+    """ray casting แบบ vectorized: จุดอยู่ในรูปหลายเหลี่ยมถ้าเส้นทางขวาตัดขอบเป็นจำนวนคี่"""
+    x1, y1, x2, y2 = edges.T
+    inside = np.zeros(len(px), dtype=bool)
+    step = max(1, chunk_size // max(len(edges), 1))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, len(px), step):
+            cx = px[start:start + step, None]
+            cy = py[start:start + step, None]
+            straddles = (y1 > cy) != (y2 > cy)
+            cross_x = (x2 - x1) * (cy - y1) / (y2 - y1) + x1
+            crossings = straddles & (cx < cross_x)
+            inside[start:start + step] = np.count_nonzero(crossings, axis=1) % 2 == 1
+
+    return inside
+
+class RegionEngine:
+    """ตัวจัดภูมิภาคจากขอบเขตรูปหลายเหลี่ยม
+
+    ดัชนีกริดเก็บขอบของแต่ละรูปหลายเหลี่ยมเฉพาะส่วนที่เกี่ยวกับแต่ละช่อง
+    จุดในช่องเดียวกันจึงทดสอบเฉพาะรูปหลายเหลี่ยมและขอบที่อาจตัดกันได้
+    ทั้งหมดทำเป็น batch เดียวต่อช่อง ไม่มีการวนทีละแถว
+    """
+
+    def __init__(self, polygons, cell_size=0.25):
+        self.cell_size = cell_size
+        names = [region for region, _ in polygons]
+        self.categories = REGIONS + sorted(set(names) - set(REGIONS))
+        self.polygon_codes = np.array([self.categories.index(name) for name in names], dtype=np.int64)
+
+        all_points = np.vstack([rings[0] for _, rings in polygons])
+        self.min_lon, self.min_lat = all_points.min(axis=0)
+        max_lon, max_lat = all_points.max(axis=0)
+        self.n_cols = int(np.floor((max_lon - self.min_lon) / cell_size)) + 1
+        self.n_rows = int(np.floor((max_lat - self.min_lat) / cell_size)) + 1
+
+        # ช่องกริด -> list ของ (ลำดับรูปหลายเหลี่ยม, ขอบที่เกี่ยวข้องกับช่องนั้น)
+        self.grid = {}
+        for poly_id, (_, rings) in enumerate(polygons):
+            edges = ring_edges(rings)
+            edge_min_y = np.minimum(edges[:, 1], edges[:, 3])
+            edge_max_y = np.maximum(edges[:, 1], edges[:, 3])
+            edge_max_x = np.maximum(edges[:, 0], edges[:, 2])
+
+            lon_min, lat_min = rings[0].min(axis=0)
+            lon_max, lat_max = rings[0].max(axis=0)
+            col_start, row_start = self._cell_of(lon_min, lat_min)
+            col_stop, row_stop = self._cell_of(lon_max, lat_max)
+
+            for row in range(row_start, row_stop + 1):
+                cell_min_y = self.min_lat + row * cell_size
+                cell_max_y = cell_min_y + cell_size
+                row_edges = (edge_max_y >= cell_min_y) & (edge_min_y <= cell_max_y)
+                for col in range(col_start, col_stop + 1):
+                    cell_min_x = self.min_lon + col * cell_size
+                    cell_edges = edges[row_edges & (edge_max_x >= cell_min_x)]
+                    if len(cell_edges) == 0:
+                        # ไม่มีขอบทางขวาของช่องนี้ จุดในช่องจึงอยู่นอกรูปหลายเหลี่ยมแน่นอน
+                        continue
+                    self.grid.setdefault(row * self.n_cols + col, []).append((poly_id, cell_edges))
+
+    @classmethod
+    def from_geojson(cls, path, region_property='region', cell_size=0.25):
+        return cls(load_region_polygons(path, region_property), cell_size)
+
+    def _cell_of(self, lon, lat):
+        col = int(np.floor((lon - self.min_lon) / self.cell_size))
+        row = int(np.floor((lat - self.min_lat) / self.cell_size))
+        return col, row
+
+    def classify_codes(self, lat, lon):
+        """รหัสภูมิภาคของทุกจุด (-1 = ไม่อยู่ในรูปหลายเหลี่ยมใดเลย)"""
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        codes = np.full(len(lat), -1, dtype=np.int64)
+
+        cols = np.floor((lon - self.min_lon) / self.cell_size)
+        rows = np.floor((lat - self.min_lat) / self.cell_size)
+        valid = (cols >= 0) & (cols < self.n_cols) & (rows >= 0) & (rows < self.n_rows)
+        cell_ids = np.where(valid, rows * self.n_cols + cols, -1).astype(np.int64)
+
+        # เรียงจุดตามช่องกริด แล้วประมวลผลทีละช่องที่มีจุดอยู่
+        order = np.argsort(cell_ids, kind='stable')
+        sorted_cells = cell_ids[order]
+        occupied, starts = np.unique(sorted_cells, return_index=True)
+        stops = np.append(starts[1:], len(order))
+
+        for cell_id, start, stop in zip(occupied, starts, stops):
+            candidates = self.grid.get(int(cell_id))
+            if cell_id < 0 or not candidates:
+                continue
+            rows_in_cell = order[start:stop]
+            for poly_id, edges in candidates:
+                pending = rows_in_cell[codes[rows_in_cell] < 0]
+                if len(pending) == 0:
+                    break
+                inside = points_in_edges(lon[pending], lat[pending], edges)
+                codes[pending[inside]] = self.polygon_codes[poly_id]
+
+        return codes
+
+    def classify(self, lat, lon):
+        """แปลงพิกัดเป็นภูมิภาค ใช้แทนคอลัมน์ region จาก load_and_clean_data ได้โดยตรง
+
+        จุดที่อยู่นอกทุกรูปหลายเหลี่ยม (เช่น พิกัดในทะเล) จะใช้กฎกรอบพิกัดเดิม
+        """
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        codes = self.classify_codes(lat, lon)
+
+        outside = codes < 0
+        if outside.any():
+            # categories ขึ้นต้นด้วย REGIONS ตามลำดับเดิม จึงใช้รหัสจาก classify_regions ได้ทันที
+            codes[outside] = classify_regions(lat[outside], lon[outside]).codes
+
+        return pd.Categorical.from_codes(codes, categories=self.categories)
+
+# จังหวัดของแต่ละภูมิภาค (แบ่งแบบเดียวกับ REGIONS: ภาคกลางรวมภาคตะวันออกและตะวันตก) ใช้สร้างไฟล์ขอบเขตภูมิภาค
+# จาก GeoJSON ขอบเขตจังหวัดที่มีชื่อจังหวัดภาษาไทยหรืออังกฤษ
+PROVINCE_REGIONS = {
+    'กรุงเทพฯและปริมณฑล': [
+        ('กรุงเทพมหานคร', 'Bangkok'), ('นนทบุรี', 'Nonthaburi'), ('ปทุมธานี', 'Pathum Thani'),
+        ('สมุทรปราการ', 'Samut Prakan'), ('สมุทรสาคร', 'Samut Sakhon'), ('นครปฐม', 'Nakhon Pathom')
+    ],
+    'ภาคกลาง': [
+        ('พระนครศรีอยุธยา', 'Phra Nakhon Si Ayutthaya'), ('อ่างทอง', 'Ang Thong'), ('ชัยนาท', 'Chai Nat'),
+        ('ลพบุรี', 'Lop Buri'), ('สระบุรี', 'Saraburi'), ('สิงห์บุรี', 'Sing Buri'),
+        ('สมุทรสงคราม', 'Samut Songkhram'), ('สุพรรณบุรี', 'Suphan Buri'), ('กาญจนบุรี', 'Kanchanaburi'),
+        ('ราชบุรี', 'Ratchaburi'), ('เพชรบุรี', 'Phetchaburi'), ('ประจวบคีรีขันธ์', 'Prachuap Khiri Khan'),
+        ('ฉะเชิงเทรา', 'Chachoengsao'), ('จันทบุรี', 'Chanthaburi'), ('ชลบุรี', 'Chon Buri'),
+        ('นครนายก', 'Nakhon Nayok'), ('ปราจีนบุรี', 'Prachin Buri'), ('ระยอง', 'Rayong'),
+        ('สระแก้ว', 'Sa Kaeo'), ('ตราด', 'Trat')
+    ],
+    'ภาคอีสาน': [
+        ('นครราชสีมา', 'Nakhon Ratchasima'), ('บุรีรัมย์', 'Buri Ram'), ('สุรินทร์', 'Surin'),
+        ('ศรีสะเกษ', 'Si Sa Ket'), ('อุบลราชธานี', 'Ubon Ratchathani'), ('ยโสธร', 'Yasothon'),
+        ('ชัยภูมิ', 'Chaiyaphum'), ('อำนาจเจริญ', 'Amnat Charoen'), ('บึงกาฬ', 'Bueng Kan'),
+        ('หนองบัวลำภู', 'Nong Bua Lam Phu'), ('ขอนแก่น', 'Khon Kaen'), ('อุดรธานี', 'Udon Thani'),
+        ('เลย', 'Loei'), ('หนองคาย', 'Nong Khai'), ('มหาสารคาม', 'Maha Sarakham'), ('ร้อยเอ็ด', 'Roi Et'),
+        ('กาฬสินธุ์', 'Kalasin'), ('สกลนคร', 'Sakon Nakhon'), ('นครพนม', 'Nakhon Phanom'),
+        ('มุกดาหาร', 'Mukdahan')
+    ],
+    'ภาคเหนือ': [
+        ('เชียงใหม่', 'Chiang Mai'), ('ลำพูน', 'Lamphun'), ('ลำปาง', 'Lampang'), ('อุตรดิตถ์', 'Uttaradit'),
+        ('แพร่', 'Phrae'), ('น่าน', 'Nan'), ('พะเยา', 'Phayao'), ('เชียงราย', 'Chiang Rai'),
+        ('แม่ฮ่องสอน', 'Mae Hong Son'), ('นครสวรรค์', 'Nakhon Sawan'), ('อุทัยธานี', 'Uthai Thani'),
+        ('กำแพงเพชร', 'Kamphaeng Phet'), ('ตาก', 'Tak'), ('สุโขทัย', 'Sukhothai'), ('พิษณุโลก', 'Phitsanulok'),
+        ('พิจิตร', 'Phichit'), ('เพชรบูรณ์', 'Phetchabun')
+    ],
+    'ภาคใต้': [
+        ('นครศรีธรรมราช', 'Nakhon Si Thammarat'), ('กระบี่', 'Krabi'), ('พังงา', 'Phang Nga'),
+        ('ภูเก็ต', 'Phuket'), ('สุราษฎร์ธานี', 'Surat Thani'), ('ระนอง', 'Ranong'), ('ชุมพร', 'Chumphon'),
+        ('สงขลา', 'Songkhla'), ('สตูล', 'Satun'), ('ตรัง', 'Trang'), ('พัทลุง', 'Phatthalung'),
+        ('ปัตตานี', 'Pattani'), ('ยะลา', 'Yala'), ('นราธิวาส', 'Narathiwat')
+    ]
+}
+
+# ชื่อภาษาอังกฤษที่สะกดต่างกันในแต่ละแหล่งข้อมูล
+PROVINCE_ALIASES = {
+    'Bangkok Metropolis': 'Bangkok', 'Krung Thep Maha Nakhon': 'Bangkok', 'Ayutthaya': 'Phra Nakhon Si Ayutthaya',
+    'Phattalung': 'Phatthalung', 'Srisaket': 'Si Sa Ket', 'Sa Kaew': 'Sa Kaeo', 'Bung Kan': 'Bueng Kan'
+}
+
+def province_key(name):
+    """ชื่อจังหวัดที่ตัดช่องว่าง ขีด และคำว่า province/จังหวัด ออก ใช้เทียบชื่อจากแหล่งต่างๆ"""
+    key = str(name).lower().replace('province', '').replace('จังหวัด', '').replace('changwat', '')
+    return ''.join(ch for ch in key if ch.isalnum())
+
+def province_region_lookup():
+    """ชื่อจังหวัด (ไทยและอังกฤษ หลัง province_key) -> ภูมิภาค"""
+    lookup = {}
+    for region, provinces in PROVINCE_REGIONS.items():
+        for thai, english in provinces:
+            lookup[province_key(thai)] = region
+            lookup[province_key(english)] = region
+    for alias, english in PROVINCE_ALIASES.items():
+        lookup[province_key(alias)] = lookup[province_key(english)]
+    return lookup
+
+def build_region_geojson(province_path, output_path, name_property=None, region_property='region'):
+    """สร้างไฟล์ขอบเขตภูมิภาคจาก GeoJSON ขอบเขตจังหวัด คืนจำนวนจังหวัดของแต่ละภูมิภาค
+
+    แต่ละจังหวัดเป็นหนึ่ง feature ที่มี property region_property (ไม่ต้องรวมรูปหลายเหลี่ยม
+    RegionEngine รองรับหลายรูปต่อภูมิภาค) name_property=None จะเลือก property แรกที่ชื่อจังหวัดตรงกับตาราง
+    ชื่อจังหวัดที่ไม่รู้จักทำให้เกิด ValueError
+    """
+    with open(province_path, encoding='utf-8') as f:
+        collection = json.load(f)
+    lookup = province_region_lookup()
+
+    def region_of(properties):
+        names = [properties.get(name_property)] if name_property else properties.values()
+        for name in names:
+            if isinstance(name, str) and province_key(name) in lookup:
+                return lookup[province_key(name)]
+        return None
+
+    features, unknown = [], []
+    for feature in collection['features']:
+        region = region_of(feature['properties'])
+        if region is None:
+            unknown.append(feature['properties'].get(name_property) if name_property else feature['properties'])
+            continue
+        features.append({'type': 'Feature', 'properties': {region_property: region}, 'geometry': feature['geometry']})
+    if unknown:
+        raise ValueError(f'ไม่รู้จักจังหวัด {len(unknown)} รายการ: {unknown[:5]}')
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'type': 'FeatureCollection', 'features': features}, f, ensure_ascii=False)
+    counts = {region: 0 for region in REGIONS}
+    for feature in features:
+        counts[feature['properties'][region_property]] += 1
+    return counts
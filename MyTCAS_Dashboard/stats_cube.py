@@ -0,0 +1,174 @@
+# stats_cube.py - cube สถิติที่คำนวณล่วงหน้า (ประเภทโปรแกรม × ภูมิภาค × ช่วงค่าเล่าเรียน)
+
+import numpy as np
+import pandas as pd
+from config import CUBE_CONFIG
+
+def group_bounds(sorted_keys):
+    """ตำแหน่งเริ่มของแต่ละกลุ่มใน array ที่เรียงแล้ว"""
+    if len(sorted_keys) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+
+def group_stops(starts, n_rows):
+    """ตำแหน่งสิ้นสุด (ไม่รวม) ของแต่ละกลุ่ม คู่กับ group_bounds"""
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.append(starts[1:], n_rows).astype(np.int64)
+
+class StatsCube:
+    """cube สถิติสำหรับตอบ Quick Stats, กราฟภูมิภาค และกราฟประเภทโปรแกรม
+
+    แต่ละ cell เก็บจำนวน ผลรวม ค่าต่ำสุด/สูงสุดของค่าเล่าเรียน และจำนวนโปรแกรม
+    ของแต่ละมหาวิทยาลัย การ query รวมเฉพาะ cell ที่ตรงตัวกรอง cell ที่อยู่ในช่วง
+    ค่าเล่าเรียนทั้งหมดใช้ค่าที่รวมไว้ได้เลย ส่วน cell ที่คร่อมขอบช่วงจะหาแถว
+    ด้วย searchsorted (แถวใน cell เรียงตามค่าเล่าเรียนไว้แล้ว)
+    ผลลัพธ์มีรูปแบบเดียวกับ summarize_dataframe
+    """
+
+    def __init__(self, df, bucket_size=CUBE_CONFIG['tuition_bucket_size']):
+        self.program_codes, self.program_labels = pd.factorize(df['program_type'].to_numpy())
+        regions = pd.Categorical(df['region'])
+        self.region_codes, self.region_labels = regions.codes.astype(np.int64), regions.categories
+        self.university_codes, self.university_labels = pd.factorize(df['มหาวิทยาลัย'].to_numpy())
+        self.tuition = df['final_tuition_fee'].to_numpy(dtype=float)
+
+        n_programs = len(self.program_labels)
+        n_regions = len(self.region_labels)
+        n_universities = len(self.university_labels)
+        self.n_regions = n_regions
+        self.n_universities = n_universities
+
+        buckets = np.floor(self.tuition / bucket_size).astype(np.int64)
+        buckets -= buckets.min() if len(buckets) else 0
+        n_buckets = int(buckets.max()) + 1 if len(buckets) else 1
+        row_cells = (self.program_codes * n_regions + self.region_codes) * n_buckets + buckets
+
+        # เรียงแถวตาม cell แล้วตามค่าเล่าเรียน
+        self.row_order = np.lexsort((self.tuition, row_cells))
+        sorted_cells = row_cells[self.row_order]
+        sorted_tuition = self.tuition[self.row_order]
+        self.sorted_tuition = sorted_tuition
+        starts = group_bounds(sorted_cells)
+        self.cell_start = starts
+        self.cell_stop = group_stops(starts, len(sorted_cells))
+
+        cell_ids = sorted_cells[starts]
+        self.cell_program = cell_ids // (n_regions * n_buckets)
+        self.cell_region = (cell_ids // n_buckets) % n_regions
+        self.cell_count = self.cell_stop - self.cell_start
+        self.cell_sum = np.add.reduceat(sorted_tuition, starts) if len(starts) else np.zeros(0)
+        self.cell_min = sorted_tuition[starts]
+        self.cell_max = sorted_tuition[self.cell_stop - 1]
+        self.cell_first = np.minimum.reduceat(self.row_order, starts) if len(starts) else np.zeros(0, dtype=np.int64)
+
+        # มหาวิทยาลัยในแต่ละ cell: (cell, มหาวิทยาลัย) -> จำนวนโปรแกรม และแถวแรกที่พบ
+        row_cell_index = np.repeat(np.arange(len(starts)), self.cell_count)
+        sorted_universities = self.university_codes[self.row_order]
+        pair_keys = row_cell_index * n_universities + sorted_universities
+        pair_order = np.argsort(pair_keys, kind='stable')
+        sorted_pairs = pair_keys[pair_order]
+        pair_starts = group_bounds(sorted_pairs)
+        pair_stops = group_stops(pair_starts, len(sorted_pairs))
+
+        pair_cells = sorted_pairs[pair_starts] // max(n_universities, 1)
+        self.pair_university = sorted_pairs[pair_starts] % max(n_universities, 1)
+        self.pair_count = pair_stops - pair_starts
+        self.pair_first = (np.minimum.reduceat(self.row_order[pair_order], pair_starts)
+                           if len(pair_starts) else np.zeros(0, dtype=np.int64))
+        self.pair_cell_start = np.searchsorted(pair_cells, np.arange(len(starts)), side='left')
+        self.pair_cell_stop = np.searchsorted(pair_cells, np.arange(len(starts)), side='right')
+
+    def _label_code(self, labels, value):
+        matches = np.flatnonzero(np.asarray(labels) == value)
+        return matches[0] if len(matches) else -1
+
+    def _slices(self, starts, stops):
+        """รวม index จากหลายช่วง [start, stop) เป็น array เดียว"""
+        lengths = stops - starts
+        if lengths.sum() == 0:
+            return np.zeros(0, dtype=np.int64)
+        offsets = np.repeat(starts - np.cumsum(np.r_[0, lengths[:-1]]), lengths)
+        return np.arange(lengths.sum()) + offsets
+
+    def query(self, program_type, region, tuition_range):
+        """สรุปสถิติของตัวกรองโดยรวม cell (ไม่สแกนทุกแถว)"""
+        low, high = tuition_range
+        selected = np.ones(len(self.cell_start), dtype=bool)
+        if program_type != 'all':
+            selected &= self.cell_program == self._label_code(self.program_labels, program_type)
+        if region != 'all':
+            selected &= self.cell_region == self._label_code(self.region_labels, region)
+
+        full = selected & (self.cell_min >= low) & (self.cell_max <= high)
+        partial = selected & ~full & (self.cell_max >= low) & (self.cell_min <= high)
+        full_cells = np.flatnonzero(full)
+
+        # แถวใน cell ที่คร่อมขอบช่วง หาด้วย searchsorted ในแต่ละ cell
+        partial_cells = np.flatnonzero(partial)
+        sorted_tuition = self.sorted_tuition
+        row_starts = np.array([
+            start + np.searchsorted(sorted_tuition[start:stop], low, side='left')
+            for start, stop in zip(self.cell_start[partial_cells], self.cell_stop[partial_cells])
+        ], dtype=np.int64)
+        row_stops = np.array([
+            start + np.searchsorted(sorted_tuition[start:stop], high, side='right')
+            for start, stop in zip(self.cell_start[partial_cells], self.cell_stop[partial_cells])
+        ], dtype=np.int64)
+        rows = self.row_order[self._slices(row_starts, row_stops)]
+
+        # ส่วนประกอบจาก cell เต็มและแถวที่คร่อมขอบ
+        programs = np.concatenate([self.cell_program[full_cells], self.program_codes[rows]])
+        regions = np.concatenate([self.cell_region[full_cells], self.region_codes[rows]])
+        counts = np.concatenate([self.cell_count[full_cells], np.ones(len(rows), dtype=np.int64)])
+        sums = np.concatenate([self.cell_sum[full_cells], self.tuition[rows]])
+        firsts = np.concatenate([self.cell_first[full_cells], rows])
+
+        pairs = self._slices(self.pair_cell_start[full_cells], self.pair_cell_stop[full_cells])
+        pair_cells = np.repeat(full_cells, self.pair_cell_stop[full_cells] - self.pair_cell_start[full_cells])
+        universities = np.concatenate([self.pair_university[pairs], self.university_codes[rows]])
+        university_regions = np.concatenate([self.cell_region[pair_cells], self.region_codes[rows]])
+        university_counts = np.concatenate([self.pair_count[pairs], np.ones(len(rows), dtype=np.int64)])
+        university_firsts = np.concatenate([self.pair_first[pairs], rows])
+
+        total = int(counts.sum())
+        tuition_values = np.concatenate([self.cell_min[full_cells], self.cell_max[full_cells], self.tuition[rows]])
+
+        region_count = np.bincount(regions, weights=counts, minlength=self.n_regions).astype(np.int64)
+        region_sum = np.bincount(regions, weights=sums, minlength=self.n_regions)
+        # ข้อมูลว่างมี 0 มหาวิทยาลัย ใช้ 1 เป็นตัวคูณ/หารแทน (ไม่มี pair อยู่แล้ว)
+        n_universities = max(self.n_universities, 1)
+        region_pairs = np.unique(university_regions * n_universities + universities)
+        region_universities = np.bincount(region_pairs // n_universities, minlength=self.n_regions)
+        present = np.flatnonzero(region_count > 0)
+
+        regional_stats = pd.DataFrame({
+            'region': pd.Categorical(self.region_labels[present], categories=self.region_labels),
+            'avg_tuition': (region_sum[present] / region_count[present]).round(0),
+            'program_count': region_count[present],
+            'university_count': region_universities[present]
+        })
+
+        return {
+            'total_programs': total,
+            'total_universities': len(np.unique(universities)),
+            'avg_tuition': sums.sum() / total if total else np.nan,
+            'min_tuition': tuition_values.min() if total else np.nan,
+            'max_tuition': tuition_values.max() if total else np.nan,
+            'regions_count': len(present),
+            'university_counts': self._ranked(universities, university_counts, university_firsts,
+                                              self.university_labels, 'มหาวิทยาลัย'),
+            'program_counts': self._ranked(programs, counts, firsts, self.program_labels, 'program_type'),
+            'regional_stats': regional_stats
+        }
+
+    def _ranked(self, codes, counts, firsts, labels, name):
+        """จำนวนต่อค่า เรียงจากมากไปน้อย ค่าที่เท่ากันเรียงตามแถวแรกที่พบ (เหมือน ranked_counts)"""
+        n_labels = len(labels)
+        totals = np.bincount(codes, weights=counts, minlength=n_labels).astype(np.int64)
+        first_seen = np.full(n_labels, np.iinfo(np.int64).max)
+        np.minimum.at(first_seen, codes, firsts)
+
+        present = np.flatnonzero(totals > 0)
+        order = present[np.lexsort((first_seen[present], -totals[present]))]
+        return pd.Series(totals[order], index=pd.Index(np.asarray(labels)[order], name=name), name='count')
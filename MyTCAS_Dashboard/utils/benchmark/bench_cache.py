@@ -0,0 +1,68 @@
+# bench_cache.py - แคช HTML (html_cache.py): ความเร็วของการดึงเมื่อแคชว่างเทียบกับอ่านจากแคช
+#                  อัตราการบีบอัด ความเร็วของการ replay ตัวแยกข้อมูล และการลบแบบ LRU เมื่อเกินขนาด
+#
+# รัน: python bench_cache.py [--pages 2000] [--latency 0.05] [--max-mb 1]
+#
+# ดึงผ่าน collect_raw_http กับ fixture server ในเครื่อง (แต่ละหน้าไม่ซ้ำกัน)
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from fixture_server import FixtureServer, load_fixture_pages, render_program_page
+from html_cache import HtmlCache
+import collect_raw_http
+
+def make_pages(n_pages):
+    """หน้าที่ไม่ซ้ำกัน n_pages หน้า (เติมลำดับต่อท้ายชื่อหลักสูตร) แคชจึงเก็บทุกหน้าแยกกัน"""
+    return [render_program_page(dict(record, หลักสูตร=f"{record['หลักสูตร']} #{i}"))
+            for i, (_, record) in enumerate(load_fixture_pages(n_pages))]
+
+def timed_scrape(links, cache, concurrency):
+    config = dict(collect_raw_http.HTTP_CONFIG, concurrency=concurrency, rate_per_host=0, fallback=False)
+    stats = {}
+    start = time.perf_counter()
+    data = asyncio.run(collect_raw_http.scrape(links, config, stats, cache=cache))
+    return time.perf_counter() - start, len(data), stats
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.05, help='วินาทีที่ server หน่วงแต่ละหน้า')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--max-mb', type=float, default=1.0, help='ขนาดแคชของการทดสอบ LRU')
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages)
+    with tempfile.TemporaryDirectory() as workdir, FixtureServer(pages, args.latency) as server:
+        with HtmlCache(os.path.join(workdir, 'cache')) as cache:
+            print(f"{'run':>12} | {'pages':>6} | {'seconds':>8} | {'pages/s':>8} | {'requests':>8}")
+            for name in ['cold', 'warm']:
+                before = server.requests
+                elapsed, n_rows, _ = timed_scrape(server.links, cache, args.concurrency)
+                print(f"{name:>12} | {n_rows:>6} | {elapsed:>8.2f} | {n_rows / elapsed:>8.0f} | "
+                      f"{server.requests - before:>8}")
+
+            start = time.perf_counter()
+            records, errors = cache.replay()
+            elapsed = time.perf_counter() - start
+            print(f"{'replay':>12} | {len(records):>6} | {elapsed:>8.2f} | {len(records) / elapsed:>8.0f} | {0:>8}")
+
+            stats = cache.stats()
+            print(f"\n{stats['objects']} หน้า: {stats['raw_bytes'] / 1024 / 1024:.1f} MB -> "
+                  f"{stats['bytes'] / 1024 / 1024:.2f} MB (บีบอัด {stats['raw_bytes'] / stats['bytes']:.1f} เท่า)")
+
+        # แคชที่เล็กกว่าข้อมูล: ขนาดต้องไม่เกิน max_mb และหน้าที่อ่านล่าสุดต้องยังอยู่
+        with HtmlCache(os.path.join(workdir, 'small'), max_mb=args.max_mb) as cache:
+            for link, page in zip(server.links, pages):
+                cache.put(link, page)
+                cache.get(server.links[0])
+            stats = cache.stats()
+            print(f"LRU {args.max_mb} MB: เหลือ {stats['objects']}/{len(pages)} หน้า "
+                  f"{stats['bytes'] / 1024 / 1024:.2f} MB, หน้าแรกที่อ่านบ่อยยังอยู่: "
+                  f"{cache.get(server.links[0]) is not None}")
+
+if __name__ == '__main__':
+    main()
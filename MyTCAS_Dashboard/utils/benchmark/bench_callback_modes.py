@@ -0,0 +1,48 @@
+# bench_callback_modes.py - load test ของ callback แต่ละโหมด (separate, combined, clientside)
+#
+# รัน: python bench_callback_modes.py [--sizes 0 100000] [--states 50] [--requests 300]
+#
+# แต่ละการเปลี่ยนตัวกรองส่ง request ผ่าน Flask test client เหมือน browser จริง
+# แบบ separate ได้หนึ่ง HTTP request ต่อ callback ส่วนแบบ combined ได้ request เดียว
+# แบบ clientside เหลือเฉพาะ callback ที่ยังอยู่ฝั่ง server แต่ layout ครั้งแรกใหญ่ขึ้น
+
+import argparse
+
+from synthetic import benchmark_workdir, write_synthetic_csv, SOURCE_CSV
+from harness import DashClient, create_dash_app, percentiles, random_filter_states, request_sequence
+import config
+from data_utils import clean_csv_data
+
+MODES = ['separate', 'combined', 'clientside']
+
+def run(df, mode, requests):
+    config.CALLBACK_CONFIG['mode'] = mode
+    client = DashClient(create_dash_app(df))
+    samples = [client.set_filters(*filters) for filters in requests]
+    return percentiles(samples) + (client.round_trips / len(requests), client.response_bytes / len(requests),
+                                   client.layout_bytes)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 100_000], help='0 = ข้อมูลจริง')
+    parser.add_argument('--states', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--workdir', help='เก็บไฟล์ข้อมูลสังเคราะห์ไว้ที่นี่ (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว)')
+    args = parser.parse_args()
+    with benchmark_workdir(args.workdir) as workdir:
+        
+        print(f"{'rows':>10} | {'mode':>10} | {'p50 (ms)':>9} | {'p99 (ms)':>9} | "
+              f"{'requests/change':>15} | {'KB/change':>9} | {'layout KB':>9}")
+        for n_rows in args.sizes:
+            config.DATA_CONFIG['csv_file'] = (SOURCE_CSV if n_rows == 0 else
+                                              write_synthetic_csv(n_rows, f'{workdir}/synthetic_{n_rows}.csv'))
+            df = clean_csv_data()
+            requests = request_sequence(random_filter_states(df, args.states), args.requests)
+            
+            for mode in MODES:
+                p50, p99, round_trips, response_bytes, layout_bytes = run(df, mode, requests)
+                print(f"{len(df):>10,} | {mode:>10} | {p50:>9.2f} | {p99:>9.2f} | "
+                      f"{round_trips:>15.1f} | {response_bytes / 1024:>9.1f} | {layout_bytes / 1024:>9.1f}")
+
+if __name__ == '__main__':
+    main()
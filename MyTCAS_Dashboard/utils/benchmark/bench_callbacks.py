@@ -0,0 +1,63 @@
+# bench_callbacks.py - latency (p50/p99) ของ callback แผนที่และกราฟ ก่อน/หลังแคชรูปกราฟ
+#
+# รัน: python bench_callbacks.py [--sizes 0 100000] [--states 50] [--requests 500]
+#
+# "before" = กรองข้อมูลและสร้าง go.Figure ใหม่ทุก request (รวมสร้างข้อความ hover)
+# "after"  = callback จริงจาก register_callbacks (แคชตัวกรอง สถิติ และรูปกราฟ JSON)
+# ทั้งสองแบบรวมเวลา serialize เป็น JSON แบบเดียวกับ Dash
+
+import argparse
+
+from synthetic import benchmark_workdir, write_synthetic_csv, SOURCE_CSV
+from harness import CallbackRecorder, timed, percentiles, random_filter_states, request_sequence
+import config
+from data_utils import clean_csv_data, filter_dataframe, summarize_dataframe
+from charts import create_map_figure, create_regional_chart, create_program_distribution_chart
+from callbacks import register_callbacks
+
+def uncached_callbacks(df):
+    """callback แบบเดิมที่คำนวณทุกอย่างใหม่ทุกครั้ง"""
+    df = df.drop(columns=['hover_text'])
+    return {
+        'update_map': lambda *filters: create_map_figure(filter_dataframe(df, *filters)),
+        'update_regional_chart': lambda *filters: create_regional_chart(
+            summarize_dataframe(filter_dataframe(df, *filters))),
+        'update_program_chart': lambda *filters: create_program_distribution_chart(
+            summarize_dataframe(filter_dataframe(df, *filters)))
+    }
+
+def run(callbacks, requests):
+    results = {}
+    for name in ['update_map', 'update_regional_chart', 'update_program_chart']:
+        samples = [timed(callbacks[name], *filters)[0] for filters in requests]
+        results[name] = percentiles(samples)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 100_000], help='0 = ข้อมูลจริง')
+    parser.add_argument('--states', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--workdir', help='เก็บไฟล์ข้อมูลสังเคราะห์ไว้ที่นี่ (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว)')
+    args = parser.parse_args()
+    with benchmark_workdir(args.workdir) as workdir:
+        
+        print(f"{'rows':>10} | {'callback':>22} | {'before p50':>10} | {'before p99':>10} | "
+              f"{'after p50':>10} | {'after p99':>10}  (ms)")
+        for n_rows in args.sizes:
+            config.DATA_CONFIG['csv_file'] = (SOURCE_CSV if n_rows == 0 else
+                                              write_synthetic_csv(n_rows, f'{workdir}/synthetic_{n_rows}.csv'))
+            df = clean_csv_data()
+            requests = request_sequence(random_filter_states(df, args.states), args.requests)
+            
+            recorder = CallbackRecorder()
+            register_callbacks(recorder, df)
+            before = run(uncached_callbacks(df), requests)
+            after = run(recorder.callbacks, requests)
+            
+            for name in before:
+                print(f"{len(df):>10,} | {name:>22} | {before[name][0]:>10.2f} | {before[name][1]:>10.2f} | "
+                      f"{after[name][0]:>10.2f} | {after[name][1]:>10.2f}")
+
+if __name__ == '__main__':
+    main()
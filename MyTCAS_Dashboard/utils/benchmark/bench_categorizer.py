@@ -0,0 +1,49 @@
+# bench_categorizer.py - เปรียบเทียบ categorize_program รายแถวกับ ProgramCategorizer
+#
+# รัน: python bench_categorizer.py [--sizes 10000 100000 1000000]
+#
+# วัดสองกรณี: ชื่อหลักสูตรซ้ำกันตามข้อมูลจริง และกรณีแย่สุดที่ชื่อไม่ซ้ำกันเลย
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from synthetic import make_synthetic_dataset
+from config import PROGRAM_CONFIG
+from data_utils import categorize_program, categorize_programs
+
+def time_call(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def bench(df):
+    columns = PROGRAM_CONFIG['name_columns']
+    # ผลอ้างอิง: ฟังก์ชันเดิมบนชื่อไทยและอังกฤษที่ต่อกัน
+    combined = df[columns[0]].astype(str).str.cat(df[columns[1]].astype(str), sep='\n')
+    
+    apply_time, expected = time_call(lambda: combined.apply(categorize_program))
+    compiled_time, result = time_call(lambda: categorize_programs(df))
+    
+    assert np.array_equal(result, expected.to_numpy(dtype=object)), 'ผลการจัดประเภทไม่ตรงกับฟังก์ชันเดิม'
+    return len(df) / apply_time, len(df) / compiled_time
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    
+    print(f"{'rows':>10} | {'case':>10} | {'apply (rows/s)':>15} | {'compiled (rows/s)':>18} | {'speedup':>8}")
+    for n_rows in args.sizes:
+        df = make_synthetic_dataset(n_rows)
+        unique_df = df.copy()
+        unique_df['หลักสูตร'] = unique_df['หลักสูตร'] + ' #' + unique_df.index.astype(str)
+        
+        for case, frame in [('realistic', df), ('unique', unique_df)]:
+            apply_rate, compiled_rate = bench(frame)
+            print(f"{n_rows:>10,} | {case:>10} | {apply_rate:>15,.0f} | {compiled_rate:>18,.0f} | "
+                  f"{compiled_rate / apply_rate:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
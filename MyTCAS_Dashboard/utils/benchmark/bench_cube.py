@@ -0,0 +1,84 @@
+# bench_cube.py - ตรวจความถูกต้องและวัดเวลา StatsCube เทียบกับการคำนวณด้วย pandas
+#
+# รัน: python bench_cube.py [--sizes 58 100000 1000000] [--queries 200]
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from synthetic import benchmark_workdir, write_synthetic_csv, SOURCE_CSV
+import config
+from data_utils import clean_csv_data, filter_dataframe, summarize_dataframe, FilterIndex
+from stats_cube import StatsCube
+
+def random_filters(df, n_queries, seed=0):
+    """สุ่มตัวกรองที่ครอบคลุมทั้ง all/ค่าจริง/ค่าที่ไม่มีอยู่ และช่วงที่คร่อมขอบ cell"""
+    rng = np.random.default_rng(seed)
+    programs = ['all'] + list(df['program_type'].unique()) + ['Unknown Program']
+    regions = ['all'] + list(df['region'].unique())
+    tuition = np.sort(df['final_tuition_fee'].unique())
+    
+    filters = [('all', 'all', [tuition[0], tuition[-1]])]
+    for _ in range(n_queries):
+        low, high = np.sort(rng.choice(tuition, size=2))
+        if rng.random() < 0.3:
+            low, high = low + rng.uniform(-500, 500), high + rng.uniform(-500, 500)
+        filters.append((rng.choice(programs), rng.choice(regions), [low, high]))
+    return filters
+
+def assert_same_summary(expected, result, context):
+    for key in ['total_programs', 'total_universities', 'regions_count']:
+        assert expected[key] == result[key], (context, key, expected[key], result[key])
+    for key in ['avg_tuition', 'min_tuition', 'max_tuition']:
+        assert np.isclose(expected[key], result[key], equal_nan=True), (context, key)
+    for key in ['university_counts', 'program_counts']:
+        pd.testing.assert_series_equal(expected[key], result[key], check_index_type=False,
+                                       check_dtype=False, check_categorical=False, obj=f'{context} {key}')
+    pd.testing.assert_frame_equal(expected['regional_stats'], result['regional_stats'],
+                                  check_dtype=False, check_categorical=False, obj=f'{context} regional_stats')
+
+def bench(df, filters):
+    build_start = time.perf_counter()
+    cube = StatsCube(df)
+    build_time = time.perf_counter() - build_start
+    index = FilterIndex(df)
+    
+    pandas_time = cube_time = 0.0
+    for program_type, region, tuition_range in filters:
+        start = time.perf_counter()
+        expected = summarize_dataframe(filter_dataframe(df, program_type, region, tuition_range, index=index))
+        pandas_time += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        result = cube.query(program_type, region, tuition_range)
+        cube_time += time.perf_counter() - start
+        
+        assert_same_summary(expected, result, (program_type, region, tuition_range))
+    
+    return build_time, pandas_time / len(filters), cube_time / len(filters), len(cube.cell_start)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 100_000, 1_000_000],
+                        help='0 = ข้อมูลจริง')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--workdir', help='เก็บไฟล์ข้อมูลสังเคราะห์ไว้ที่นี่ (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว)')
+    args = parser.parse_args()
+    with benchmark_workdir(args.workdir) as workdir:
+        
+        print(f"{'rows':>10} | {'cells':>6} | {'build (s)':>9} | {'pandas (ms/q)':>13} | {'cube (ms/q)':>11} | {'speedup':>7}")
+        for n_rows in args.sizes:
+            config.DATA_CONFIG['csv_file'] = (SOURCE_CSV if n_rows == 0 else
+                                              write_synthetic_csv(n_rows, f'{workdir}/synthetic_{n_rows}.csv'))
+            df = clean_csv_data()
+            filters = random_filters(df, args.queries)
+            build_time, pandas_time, cube_time, n_cells = bench(df, filters)
+            # ข้อมูลว่างต้องสร้าง cube และตอบได้เหมือน pandas
+            bench(df.iloc[:0], filters[:10])
+            print(f"{len(df):>10,} | {n_cells:>6,} | {build_time:>9.2f} | {pandas_time * 1000:>13.2f} | "
+                  f"{cube_time * 1000:>11.2f} | {pandas_time / cube_time:>6.1f}x")
+        print('✅ ผลจาก cube ตรงกับ pandas ทุก query')
+
+if __name__ == '__main__':
+    main()
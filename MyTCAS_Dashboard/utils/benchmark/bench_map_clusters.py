@@ -0,0 +1,50 @@
+# bench_map_clusters.py - ขนาด payload และเวลาสร้างแผนที่ แบบทีละจุดเทียบกับแบบรวมกลุ่มตามระดับซูม
+#
+# รัน: python bench_map_clusters.py [--sizes 10000 100000 1000000] [--zooms 4 6 8 10 12]
+#
+# เวลารวมการสร้างรูปและ serialize เป็น JSON แบบเดียวกับ Dash (ข้อมูลทั้งชุด ไม่กรอง)
+
+import argparse
+import os
+import time
+
+from synthetic import benchmark_workdir, write_synthetic_csv
+from harness import serialize
+import config
+from data_utils import load_and_clean_data
+from charts import create_map_figure, create_cluster_map_figure
+
+def measure(build):
+    start = time.perf_counter()
+    payload = serialize(build())
+    return (time.perf_counter() - start) * 1000, len(payload) / 1024
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--zooms', type=int, nargs='+', default=[4, 6, 8, 10, 12])
+    parser.add_argument('--workdir', help='เก็บไฟล์ข้อมูลสังเคราะห์ไว้ที่นี่ (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว)')
+    args = parser.parse_args()
+    with benchmark_workdir(args.workdir) as workdir:
+        config.DATA_CONFIG['artifact_file'] = os.path.join(workdir, 'no_artifact.feather')
+        print(f"{'rows':>10} | {'map':>12} | {'points':>8} | {'build ms':>9} | {'payload KB':>10}")
+        for n_rows in args.sizes:
+            config.DATA_CONFIG['csv_file'] = write_synthetic_csv(
+                n_rows, os.path.join(workdir, f'tcas_{n_rows}.csv'), realistic=True)
+            df = load_and_clean_data()
+
+            # แบบทีละจุด (ปิดการรวมกลุ่มชั่วคราว)
+            threshold = config.MAP_CONFIG['cluster_threshold']
+            config.MAP_CONFIG['cluster_threshold'] = len(df)
+            elapsed, size = measure(lambda: create_map_figure(df))
+            config.MAP_CONFIG['cluster_threshold'] = threshold
+            print(f"{n_rows:>10,} | {'markers':>12} | {len(df):>8,} | {elapsed:>9.1f} | {size:>10,.0f}")
+
+            for zoom in args.zooms:
+                figure = create_cluster_map_figure(df, zoom)
+                elapsed, size = measure(lambda: create_cluster_map_figure(df, zoom))
+                print(f"{n_rows:>10,} | {f'zoom {zoom}':>12} | {len(figure.data[0].lat):>8,} | "
+                      f"{elapsed:>9.1f} | {size:>10,.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# bench_map_updates.py - ขนาด response ของ callback แผนที่ต่อการเปลี่ยนตัวกรอง: รูปเต็มเทียบกับ Patch
+#                        และทั้งประเทศเทียบกับเฉพาะขอบเขตที่มองเห็น
+#
+# รัน: python bench_map_updates.py [--sizes 0 4000 100000] [--states 30]
+#
+# แต่ละ request ส่งผ่าน Flask test client เหมือน browser จริง (รวม State ของ map-render)
+# ขนาดที่รายงานเป็นเฉพาะ response ของ callback แผนที่ เวลาการวาดใหม่ใน browser ไม่ได้วัดในนี้
+
+import argparse
+import os
+import time
+
+from synthetic import benchmark_workdir, write_synthetic_csv, SOURCE_CSV
+from harness import DashClient, create_dash_app, percentiles, random_filter_states
+import config
+from data_utils import clean_csv_data
+
+# ขอบเขตที่มองเห็นเมื่อซูมเข้ากรุงเทพฯ (ระดับ 9, ปัดขอบแบบเดียวกับ assets/clientside.js)
+BANGKOK_VIEW = {'zoom': 9, 'bounds': [100.125, 13.359375, 101.0, 14.203125]}
+COUNTRY_VIEW = {'zoom': 9, 'bounds': None}
+
+def run(df, states, patch, view):
+    config.CALLBACK_CONFIG['map_patch'] = patch
+    client = DashClient(create_dash_app(df), fetch_layout=False)
+    client.props['map-view.data'] = view
+
+    sizes, times = [], []
+    for program_type, region, tuition_range in states:
+        values = {'program-filter.value': program_type,
+                  'region-filter.value': region,
+                  'tuition-range.data': list(tuition_range)}
+        for output, body in client.update_bodies(values):
+            if 'thailand-map.figure' not in output:
+                continue
+            before = client.response_bytes
+            start = time.perf_counter()
+            client.post(output, body)
+            times.append(time.perf_counter() - start)
+            sizes.append(client.response_bytes - before)
+    return sum(sizes) / len(sizes), percentiles(times)[0]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 4_000, 100_000], help='0 = ข้อมูลจริง')
+    parser.add_argument('--states', type=int, default=30)
+    parser.add_argument('--workdir', help='เก็บไฟล์ข้อมูลสังเคราะห์ไว้ที่นี่ (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว)')
+    args = parser.parse_args()
+    with benchmark_workdir(args.workdir) as workdir:
+        config.DATA_CONFIG['artifact_file'] = os.path.join(workdir, 'no_artifact.feather')
+        print(f"{'rows':>10} | {'view':>8} | {'update':>6} | {'KB/update':>10} | {'p50 ms':>8}")
+        for n_rows in args.sizes:
+            config.DATA_CONFIG['csv_file'] = (SOURCE_CSV if n_rows == 0 else write_synthetic_csv(
+                n_rows, os.path.join(workdir, f'tcas_{n_rows}.csv'), realistic=True))
+            df = clean_csv_data()
+            # เปลี่ยนเฉพาะช่วงค่าเล่าเรียน ชุด trace ของแผนที่จึงมักเหมือนเดิม (กรณีลากตัวเลื่อน)
+            states = [('all', 'all', tuition_range) for _, _, tuition_range in random_filter_states(df, args.states)]
+            for view_name, view in [('country', COUNTRY_VIEW), ('bangkok', BANGKOK_VIEW)]:
+                for patch in [False, True]:
+                    size, p50 = run(df, states, patch, view)
+                    print(f"{len(df):>10,} | {view_name:>8} | {'patch' if patch else 'full':>6} | "
+                          f"{size / 1024:>10.1f} | {p50:>8.2f}")
+
+if __name__ == '__main__':
+    main()
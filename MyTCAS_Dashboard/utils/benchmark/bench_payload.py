@@ -0,0 +1,73 @@
+# bench_payload.py - ขนาด response ของแต่ละ callback: แม่แบบ 'plotly' เต็มเทียบกับแม่แบบ 'tcas'
+#                    และก่อนเทียบกับหลังบีบอัด (gzip และ brotli ถ้าติดตั้งไว้)
+#
+# รัน: python bench_payload.py [--sizes 0 10000] [--states 30]
+#
+# แต่ละ request ส่งผ่าน Flask test client พร้อม Accept-Encoding เหมือน browser จริง
+# แถว "plotly" จำลองรูปแบบเดิมที่ทุกรูปมีแม่แบบ 'plotly' ทั้งชุด (สไตล์เดียวกัน)
+
+import argparse
+import os
+from collections import defaultdict
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from synthetic import benchmark_workdir, write_synthetic_csv, SOURCE_CSV
+from harness import DashClient, create_dash_app, random_filter_states
+import config
+import charts
+import compression
+from data_utils import clean_csv_data
+
+def full_template():
+    """แม่แบบ 'plotly' ทั้งชุดพร้อมสไตล์ของ dashboard (ขนาดเท่ากับรูปก่อนมีแม่แบบ 'tcas')"""
+    template = go.layout.Template(pio.templates['plotly'])
+    template.layout.update(charts.create_template().layout)
+    return template
+
+def run(df, states, encodings):
+    """ขนาดเฉลี่ยต่อ response ของแต่ละ callback {callback: {encoding: bytes}}"""
+    client = DashClient(create_dash_app(df), fetch_layout=False)
+    sizes = defaultdict(lambda: defaultdict(list))
+    for program_type, region, tuition_range in states:
+        values = {'program-filter.value': program_type,
+                  'region-filter.value': region,
+                  'tuition-range.data': list(tuition_range)}
+        for output, body in client.update_bodies(values):
+            for encoding in encodings:
+                response = client.client.post('/_dash-update-component', json=body,
+                                              headers={'Accept-Encoding': encoding})
+                if response.status_code == 200:
+                    sizes[output][encoding].append(len(response.data))
+            # request ปกติ (ไม่บีบอัด) เพื่อเก็บ State ของ request ถัดไป
+            client.post(output, body)
+    return {output: {encoding: sum(values) / len(values) for encoding, values in by_encoding.items()}
+            for output, by_encoding in sizes.items()}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 10_000], help='0 = ข้อมูลจริง')
+    parser.add_argument('--states', type=int, default=30)
+    parser.add_argument('--workdir', help='เก็บไฟล์ข้อมูลสังเคราะห์ไว้ที่นี่ (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว)')
+    args = parser.parse_args()
+    with benchmark_workdir(args.workdir) as workdir:
+        encodings = ['identity'] + compression.available_encodings()[::-1]
+        config.DATA_CONFIG['artifact_file'] = os.path.join(workdir, 'no_artifact.feather')
+        tcas_template = pio.templates[charts.TEMPLATE_NAME]
+
+        print(f"{'rows':>10} | {'template':>8} | {'callback':>44} | " + ' | '.join(f'{e + " KB":>11}' for e in encodings))
+        for n_rows in args.sizes:
+            config.DATA_CONFIG['csv_file'] = (SOURCE_CSV if n_rows == 0 else write_synthetic_csv(
+                n_rows, os.path.join(workdir, f'tcas_{n_rows}.csv'), realistic=True))
+            df = clean_csv_data()
+            states = random_filter_states(df, args.states)
+            for name, template in [('plotly', full_template()), ('tcas', tcas_template)]:
+                pio.templates[charts.TEMPLATE_NAME] = template
+                for output, sizes in run(df, states, encodings).items():
+                    print(f"{len(df):>10,} | {name:>8} | {output[:44]:>44} | "
+                          + ' | '.join(f'{sizes.get(e, 0) / 1024:>11.1f}' for e in encodings))
+            pio.templates[charts.TEMPLATE_NAME] = tcas_template
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# bench_records.py - เวลารวมข้อมูลที่แยกได้ทีละหน้าเป็นตารางเดียว: pd.concat ทุกหน้า (แบบเดิมของ collect_raw.parser)
+#                    เทียบกับเก็บเป็น list แล้วสร้างครั้งเดียว และบันทึกทีละหน้าลง CrawlState
+#
+# รัน: python bench_records.py [--sizes 1000 10000]
+#
+# ใช้ข้อมูลจาก raw.csv วนซ้ำจนครบจำนวน (ไม่ดึงหน้าเว็บ วัดเฉพาะการรวมข้อมูล)
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # ไม่มี pyarrow ข้ามแบบ Arrow
+    pa = None
+
+from fixture_server import RAW_CSV
+from program_page import COLUMNS
+from crawl_state import CrawlState, content_hash
+
+def make_records(n_records):
+    """ข้อมูลสังเคราะห์ n_records แถวในรูปแบบเดียวกับที่ parse_program คืน"""
+    source = pd.read_csv(RAW_CSV, dtype=str, keep_default_na=False)[COLUMNS].to_dict('records')
+    return [dict(source[i % len(source)], หลักสูตร=f"{source[i % len(source)]['หลักสูตร']} #{i}")
+            for i in range(n_records)]
+
+def accumulate_concat(records):
+    data = pd.DataFrame(columns=COLUMNS)
+    for record in records:
+        data = pd.concat([data, pd.DataFrame([record])], ignore_index=True)
+    return data
+
+def accumulate_list(records):
+    rows = []
+    for record in records:
+        rows.append(record)
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+def accumulate_arrow(records):
+    rows = []
+    for record in records:
+        rows.append(record)
+    return pa.Table.from_pylist(rows).to_pandas()
+
+def accumulate_state(records):
+    with tempfile.TemporaryDirectory() as workdir, CrawlState(os.path.join(workdir, 'state.sqlite')) as state:
+        links = []
+        for i, record in enumerate(records):
+            link = f'https://course.mytcas.com/programs/{i}'
+            state.save(link, content_hash(str(record)), record)
+            links.append(link)
+        return pd.DataFrame(state.records(links), columns=COLUMNS)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000])
+    args = parser.parse_args()
+
+    methods = [('concat', accumulate_concat), ('list', accumulate_list), ('state', accumulate_state)]
+    if pa is not None:
+        methods.insert(2, ('arrow', accumulate_arrow))
+
+    print(f"{'records':>8} | {'method':>7} | {'seconds':>8} | {'µs/record':>10}")
+    for n_records in args.sizes:
+        records = make_records(n_records)
+        expected = None
+        for name, accumulate in methods:
+            start = time.perf_counter()
+            data = accumulate(records)
+            elapsed = time.perf_counter() - start
+            # ทุกแบบต้องได้ตารางเดียวกัน
+            if expected is None:
+                expected = data
+            else:
+                pd.testing.assert_frame_equal(data, expected, check_dtype=False)
+            print(f"{n_records:>8,} | {name:>7} | {elapsed:>8.3f} | {elapsed / n_records * 1e6:>10.1f}")
+
+if __name__ == '__main__':
+    main()
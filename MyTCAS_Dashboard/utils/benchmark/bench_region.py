@@ -0,0 +1,70 @@
+# bench_region.py - เปรียบเทียบเวลาจัดภูมิภาคแบบ apply รายแถวกับแบบ vectorized
+#
+# รัน: python bench_region.py [--sizes 10000 100000 1000000]
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+from synthetic import make_synthetic_coordinates, write_synthetic_csv
+import config
+import data_utils
+from data_utils import get_region_from_coordinates, classify_regions, load_and_clean_data
+
+def time_call(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def bench_classifier(n_rows):
+    """เวลาจัดภูมิภาคอย่างเดียว และตรวจว่าผลตรงกับฟังก์ชันเดิม"""
+    lat, lon = make_synthetic_coordinates(n_rows)
+    df = pd.DataFrame({'latitude': lat, 'longitude': lon})
+    
+    apply_time, expected = time_call(lambda: df.apply(
+        lambda row: get_region_from_coordinates(row['latitude'], row['longitude']),
+        axis=1
+    ))
+    vector_time, result = time_call(lambda: classify_regions(df['latitude'], df['longitude']))
+    
+    assert np.array_equal(np.asarray(result, dtype=object), expected.to_numpy(dtype=object))
+    return apply_time, vector_time
+
+def bench_startup(n_rows, workdir):
+    """เวลา load_and_clean_data ทั้งหมดบนไฟล์ CSV สังเคราะห์"""
+    csv_path = write_synthetic_csv(n_rows, os.path.join(workdir, f'synthetic_{n_rows}.csv'))
+    config.DATA_CONFIG['csv_file'] = csv_path
+    
+    vector_time, _ = time_call(load_and_clean_data)
+    
+    # จำลองโค้ดเดิมที่จัดภูมิภาคด้วย apply รายแถว
+    original = data_utils.classify_regions
+    data_utils.classify_regions = lambda lat, lon: pd.DataFrame({'lat': lat, 'lon': lon}).apply(
+        lambda row: get_region_from_coordinates(row['lat'], row['lon']), axis=1
+    ).to_numpy()
+    try:
+        apply_time, _ = time_call(load_and_clean_data)
+    finally:
+        data_utils.classify_regions = original
+    
+    return apply_time, vector_time
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    
+    print(f"{'rows':>10} | {'apply (s)':>10} | {'vector (s)':>10} | {'speedup':>8} | "
+          f"{'startup old (s)':>15} | {'startup new (s)':>15}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in args.sizes:
+            apply_time, vector_time = bench_classifier(n_rows)
+            startup_old, startup_new = bench_startup(n_rows, workdir)
+            print(f"{n_rows:>10,} | {apply_time:>10.3f} | {vector_time:>10.4f} | "
+                  f"{apply_time / vector_time:>7.0f}x | {startup_old:>15.2f} | {startup_new:>15.2f}")
+
+if __name__ == '__main__':
+    main()
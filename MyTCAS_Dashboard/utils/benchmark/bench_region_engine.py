@@ -0,0 +1,92 @@
+# bench_region_engine.py - วัด throughput ของ RegionEngine เทียบกับฟังก์ชันจัดภูมิภาคเดิม
+#
+# รัน: python bench_region_engine.py [--boundary-file path.geojson] [--sizes 10000 100000 1000000]
+#
+# ถ้าไม่ระบุไฟล์ขอบเขต จะสร้างรูปหลายเหลี่ยมที่ให้ผลเท่ากับกฎกรอบพิกัดใน
+# get_region_from_coordinates (แบ่งขอบให้มีจุดยอดจำนวนมากใกล้เคียงขอบเขตจังหวัดจริง)
+# แล้วตรวจว่าผลตรงกับ classify_regions ทุกจุด
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from synthetic import make_synthetic_coordinates
+from data_utils import get_region_from_coordinates, classify_regions
+from region_engine import RegionEngine, load_region_polygons
+
+# (ภูมิภาค, lat_min, lat_max, lon_min, lon_max) เรียงตามลำดับความสำคัญของกฎเดิม
+BOUNDING_BOX_RULES = [
+    ('ภาคเหนือ', 17.0, 21.0, 97.0, 106.0),
+    ('ภาคอีสาน', 14.0, 21.0, 101.5, 106.0),
+    ('ภาคใต้', 5.0, 11.0, 97.0, 106.0),
+    ('กรุงเทพฯและปริมณฑล', 13.5, 14.5, 100.2, 101.2),
+    ('ภาคกลาง', 5.0, 21.0, 97.0, 106.0)
+]
+
+def densified_rectangle(lat_min, lat_max, lon_min, lon_max, vertices_per_side):
+    """สี่เหลี่ยมที่แบ่งขอบเป็นจุดยอดย่อย (lon, lat)"""
+    steps = np.linspace(0, 1, vertices_per_side, endpoint=False)
+    bottom = np.column_stack([lon_min + steps * (lon_max - lon_min), np.full_like(steps, lat_min)])
+    right = np.column_stack([np.full_like(steps, lon_max), lat_min + steps * (lat_max - lat_min)])
+    top = np.column_stack([lon_max - steps * (lon_max - lon_min), np.full_like(steps, lat_max)])
+    left = np.column_stack([np.full_like(steps, lon_min), lat_max - steps * (lat_max - lat_min)])
+    return np.vstack([bottom, right, top, left])
+
+def bounding_box_polygons(vertices_per_side):
+    return [
+        (region, [densified_rectangle(lat_min, lat_max, lon_min, lon_max, vertices_per_side)])
+        for region, lat_min, lat_max, lon_min, lon_max in BOUNDING_BOX_RULES
+    ]
+
+def time_call(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--boundary-file', default=None)
+    parser.add_argument('--region-property', default='region')
+    parser.add_argument('--vertices-per-side', type=int, default=500)
+    parser.add_argument('--cell-size', type=float, default=0.25)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--scalar-limit', type=int, default=100_000,
+                        help='ไม่วัดฟังก์ชันรายแถวเมื่อจำนวนจุดเกินค่านี้')
+    args = parser.parse_args()
+
+    if args.boundary_file:
+        polygons = load_region_polygons(args.boundary_file, args.region_property)
+    else:
+        polygons = bounding_box_polygons(args.vertices_per_side)
+
+    build_time, engine = time_call(lambda: RegionEngine(polygons, cell_size=args.cell_size))
+    n_vertices = sum(len(ring) for _, rings in polygons for ring in rings)
+    print(f"polygons: {len(polygons)}, vertices: {n_vertices:,}, grid cells: {len(engine.grid):,}, "
+          f"index build: {build_time:.2f}s")
+    print(f"{'points':>10} | {'scalar (pts/s)':>15} | {'bbox vector (pts/s)':>20} | "
+          f"{'engine (pts/s)':>15} | {'agree w/ bbox':>13}")
+
+    for n_points in args.sizes:
+        lat, lon = make_synthetic_coordinates(n_points)
+
+        scalar_rate = '-'
+        if n_points <= args.scalar_limit:
+            frame = pd.DataFrame({'lat': lat, 'lon': lon})
+            scalar_time, _ = time_call(lambda: frame.apply(
+                lambda row: get_region_from_coordinates(row['lat'], row['lon']), axis=1
+            ))
+            scalar_rate = f"{n_points / scalar_time:,.0f}"
+
+        bbox_time, expected = time_call(lambda: classify_regions(lat, lon))
+        engine_time, result = time_call(lambda: engine.classify(lat, lon))
+
+        agreement = np.mean(np.asarray(result, dtype=object) == np.asarray(expected, dtype=object))
+        if not args.boundary_file:
+            assert agreement == 1.0, 'RegionEngine ให้ผลไม่ตรงกับกฎกรอบพิกัด'
+
+        print(f"{n_points:>10,} | {scalar_rate:>15} | {n_points / bbox_time:>20,.0f} | "
+              f"{n_points / engine_time:>15,.0f} | {agreement:>12.1%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# bench_scraper.py - ความเร็วของตัวดึงข้อมูลหลักสูตรกับ fixture server ในเครื่อง
+#                    collect_raw.parser (browser ใหม่ทุกหน้า), collect_raw_async (browser เดียว หลาย page)
+#                    และ collect_raw_http (HTTP client ใช้ Playwright เฉพาะหน้าที่แยกข้อมูลไม่ได้)
+#
+# รัน: python bench_scraper.py [--pages 64] [--latency 0.2] [--concurrency 1 4 8 16] [--html-dir saved/]
+#      python bench_scraper.py --scrapers http --client-rendered 0.1
+#
+# collect_raw และ async ต้องติดตั้ง playwright และ Chromium (pip install playwright && playwright install chromium)
+# ไม่จำกัด request ต่อวินาทีระหว่างวัด และตรวจว่าทุกวิธีได้ข้อมูลตรงกับต้นฉบับ (เมื่อสร้างหน้าจาก raw.csv)
+
+import argparse
+import asyncio
+import time
+
+import pandas as pd
+
+from fixture_server import FixtureServer, load_fixture_pages
+from program_page import COLUMNS, parse_program
+import collect_raw_http
+
+def scrape_serial(links):
+    import collect_raw
+    return pd.DataFrame([parse_program(collect_raw.fetch_page(link)) for link in links], columns=COLUMNS)
+
+def scrape_async(links, concurrency):
+    import collect_raw_async
+    config = dict(collect_raw_async.SCRAPER_CONFIG, concurrency=concurrency, rate_per_host=0)
+    return asyncio.run(collect_raw_async.scrape(links, config))
+
+def scrape_http(links, concurrency, stats):
+    config = dict(collect_raw_http.HTTP_CONFIG, concurrency=concurrency, rate_per_host=0)
+    return asyncio.run(collect_raw_http.scrape(links, config, stats))
+
+def check(data, expected):
+    """จำนวนแถวที่ไม่ตรงกับข้อมูลต้นฉบับ (None ถ้าไม่มีข้อมูลให้เทียบ)"""
+    if any(record is None for record in expected):
+        return None
+    assert list(data.columns) == COLUMNS, list(data.columns)
+    if len(data) != len(expected):
+        return abs(len(data) - len(expected))
+    return sum(row != record for row, record in zip(data.to_dict('records'), expected))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=0.2, help='วินาทีที่ server หน่วงแต่ละหน้า')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--serial-pages', type=int, default=8, help='จำนวนหน้าของแบบเดิม (ช้ามาก)')
+    parser.add_argument('--html-dir', help='โฟลเดอร์ HTML ที่บันทึกจาก course.mytcas.com')
+    parser.add_argument('--client-rendered', type=float, default=0.0,
+                        help='สัดส่วนหน้าที่ render ด้วย JavaScript (ต้องใช้ Playwright)')
+    parser.add_argument('--scrapers', nargs='+', choices=['collect_raw', 'async', 'http'],
+                        default=['collect_raw', 'async', 'http'])
+    args = parser.parse_args()
+
+    pages = load_fixture_pages(args.pages, args.html_dir, args.client_rendered)
+    expected = [record for _, record in pages]
+    with FixtureServer([page for page, _ in pages], args.latency) as server:
+        links = server.links
+        stats = {}
+        runs = []
+        if 'collect_raw' in args.scrapers:
+            runs.append(('collect_raw', lambda: scrape_serial(links[:args.serial_pages]), args.serial_pages))
+        if 'async' in args.scrapers:
+            runs += [(f'async x{c}', lambda c=c: scrape_async(links, c), len(links)) for c in args.concurrency]
+        if 'http' in args.scrapers:
+            runs += [(f'http x{c}', lambda c=c: scrape_http(links, c, stats), len(links)) for c in args.concurrency]
+
+        print(f"{'scraper':>12} | {'pages':>6} | {'seconds':>8} | {'pages/s':>8} | {'browser':>8} | {'mismatch':>8}")
+        for name, run, n_pages in runs:
+            stats.clear()
+            start = time.perf_counter()
+            data = run()
+            elapsed = time.perf_counter() - start
+            mismatch = check(data, expected[:n_pages])
+            # จำนวนหน้าที่ต้องใช้ browser (ทุกหน้ายกเว้นแบบ HTTP)
+            browser_pages = stats['fallback'] if stats else n_pages
+            print(f"{name:>12} | {n_pages:>6} | {elapsed:>8.2f} | {n_pages / elapsed:>8.1f} | {browser_pages:>8} | "
+                  f"{'-' if mismatch is None else mismatch:>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# bench_server.py - load test ของ production server (gunicorn -c gunicorn.conf.py wsgi:server)
+#
+# รัน: python bench_server.py [--workers 1 2 4] [--threads 4] [--duration 10] [--concurrency 16]
+#
+# เปิด gunicorn ตามจำนวน worker ที่กำหนด แล้วยิง callback request ของการเปลี่ยนตัวกรอง
+# แบบสุ่ม (การกระจายแบบ Zipf) จากหลาย connection พร้อมกัน รายงาน requests/sec และต่อ core
+# ตัวยิง request รันบนเครื่องเดียวกัน ผลต่อ core จึงเป็นค่าต่ำสุดโดยประมาณ
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from synthetic import DASHBOARD_DIR
+from harness import DashClient, create_dash_app, random_filter_states, request_sequence, with_page_id
+from data_utils import load_and_clean_data
+
+def callback_bodies(df, states):
+    """body ของทุก callback request สำหรับแต่ละสถานะตัวกรอง"""
+    client = DashClient(create_dash_app(df), fetch_layout=False)
+    bodies = []
+    for program_type, region, tuition_range in states:
+        values = {'program-filter.value': program_type,
+                  'region-filter.value': region,
+                  'tuition-range.data': tuition_range}
+        bodies += [body for _, body in client.update_bodies(values)]
+    return bodies
+
+def start_server(port, workers, threads):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers), '--threads', str(threads), 'wsgi:server'],
+        cwd=DASHBOARD_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/_dash-layout')
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('gunicorn ไม่พร้อมภายใน 60 วินาที')
+
+def load(port, bodies, duration, concurrency):
+    """ยิง request จนครบเวลา คืนจำนวน request ที่สำเร็จ"""
+    completed = []
+    # แต่ละ connection เป็นหน้าที่เปิดแยกกัน (ไม่ให้ถูกทิ้งเป็น request ล้าสมัยของกันและกัน)
+    page_bodies = [[json.dumps(with_page_id(body, f'bench-{offset}')) for body in bodies]
+                   for offset in range(concurrency)]
+    stop_at = time.perf_counter() + duration
+
+    def worker(offset):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        count = 0
+        i = offset
+        while time.perf_counter() < stop_at:
+            connection.request('POST', '/_dash-update-component', body=page_bodies[offset][i % len(bodies)],
+                               headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            if response.status in (200, 204):
+                count += 1
+            i += concurrency
+        completed.append(count)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(completed)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--states', type=int, default=200)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    os.chdir(DASHBOARD_DIR)
+    df = load_and_clean_data()
+    bodies = callback_bodies(df, request_sequence(random_filter_states(df, args.states), args.states * 5))
+    cores = os.cpu_count()
+
+    print(f"{len(df):,} rows, {cores} cores, {args.threads} threads/worker, "
+          f"{args.concurrency} connections, {args.duration:.0f} s")
+    print(f"{'workers':>7} | {'requests/s':>10} | {'per core':>8}")
+    for workers in args.workers:
+        process = start_server(args.port, workers, args.threads)
+        try:
+            throughput = load(args.port, bodies, args.duration, args.concurrency) / args.duration
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait()
+        print(f"{workers:>7} | {throughput:>10.1f} | {throughput / min(workers, cores):>8.1f}")
+
+if __name__ == '__main__':
+    main()
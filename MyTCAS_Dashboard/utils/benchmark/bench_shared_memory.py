@@ -0,0 +1,110 @@
+# bench_shared_memory.py - หน่วยความจำต่อ worker เมื่อไม่ preload: ทำความสะอาด CSV เองทุก worker
+#                          เทียบกับ memory-map ไฟล์ artifact เดียวกัน (และ preload + fork เป็นค่าอ้างอิง)
+#
+# รัน: python bench_shared_memory.py [--size 200000] [--workers 4]
+#
+# จำลอง worker ที่ไม่ preload (แต่ละ process โหลดแอปเอง) ด้วย multiprocessing แบบ spawn
+# ทุก worker โหลดข้อมูลและลงทะเบียน callback (ดัชนี cube แคช) แล้วรอจนทุก worker พร้อม
+# จากนั้นอ่าน Rss / Pss / USS (Private) จาก /proc/<pid>/smaps_rollup (Linux เท่านั้น)
+# หน้าของไฟล์ที่ memory-map ร่วมกันนับเป็น Shared ไม่อยู่ใน USS ของ worker ใด
+
+import argparse
+import multiprocessing
+import os
+
+from synthetic import DASHBOARD_DIR, SOURCE_CSV, benchmark_workdir, write_synthetic_csv
+
+def memory_rollup(pid='self'):
+    """Rss, Pss และหน่วยความจำส่วนตัว (USS) เป็น MB"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {
+        'rss': values['Rss'],
+        'pss': values['Pss'],
+        'uss': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    }
+
+def use_data_files(csv_file, artifact_file):
+    import config
+    config.DATA_CONFIG['csv_file'] = csv_file
+    config.DATA_CONFIG['artifact_file'] = artifact_file
+
+def load_app():
+    from data_utils import load_and_clean_data
+    from harness import CallbackRecorder
+    from callbacks import register_callbacks
+
+    df = load_and_clean_data()
+    register_callbacks(CallbackRecorder(), df)
+    return df
+
+def worker(csv_file, artifact_file, preloaded, ready, done, results):
+    if not preloaded:
+        os.chdir(DASHBOARD_DIR)
+        use_data_files(csv_file, artifact_file)
+        load_app()
+    ready.wait()
+    results.put(memory_rollup())
+    done.wait()
+
+def measure(csv_file, artifact_file, n_workers, preload):
+    """เริ่ม worker n ตัวพร้อมกัน คืนค่าเฉลี่ยหน่วยความจำต่อ worker
+
+    preload=True โหลดแอปใน process นี้แล้ว fork (เหมือน gunicorn preload_app) มิฉะนั้น spawn
+    ให้แต่ละ worker โหลดเอง
+    """
+    if preload:
+        use_data_files(csv_file, artifact_file)
+        app_data = load_app()    # อ้างอิงไว้ให้ข้อมูลยังอยู่ขณะ fork
+    context = multiprocessing.get_context('fork' if preload else 'spawn')
+    ready = context.Barrier(n_workers + 1)
+    done = context.Barrier(n_workers + 1)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(csv_file, artifact_file, preload, ready, done, results))
+                 for _ in range(n_workers)]
+    for process in processes:
+        process.start()
+    ready.wait()
+    samples = [results.get() for _ in processes]
+    done.wait()
+    for process in processes:
+        process.join()
+    return {key: sum(sample[key] for sample in samples) / n_workers for key in samples[0]}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=200_000, help='0 = ข้อมูลจริง')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--workdir', help='เก็บไฟล์ข้อมูลสังเคราะห์ไว้ที่นี่ (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว)')
+    args = parser.parse_args()
+    with benchmark_workdir(args.workdir) as workdir:
+        workdir = os.path.abspath(workdir)
+        csv_file = (SOURCE_CSV if args.size == 0 else
+                    write_synthetic_csv(args.size, os.path.join(workdir, f'synthetic_{args.size}.csv')))
+
+        # ไฟล์ artifact ของข้อมูลชุดนี้ สร้างครั้งเดียวเหมือน on_starting ใน gunicorn.conf.py
+        artifact_file = os.path.join(workdir, f'bench_shared_{args.size}.feather')
+        missing_file = os.path.join(workdir, 'missing.feather')
+        use_data_files(csv_file, artifact_file)
+        from data_utils import refresh_artifact
+        refresh_artifact()
+        artifact_mb = os.path.getsize(artifact_file) / 1024 / 1024
+
+        print(f"{args.workers} workers, {args.size or 'real'} rows, artifact {artifact_mb:.1f} MB (MB per worker)")
+        print(f"{'setup':>24} | {'rss':>8} | {'pss':>8} | {'uss':>8}")
+        setups = [('own copy (csv)', missing_file, False), ('memory-mapped artifact', artifact_file, False)]
+        # fork หลังโหลดข้อมูลใน process นี้ จึงวัดเป็นลำดับสุดท้าย
+        setups.append(('preload + fork', artifact_file, True))
+        baseline = None
+        for name, data_file, preload in setups:
+            memory = measure(csv_file, data_file, args.workers, preload)
+            baseline = baseline or memory['uss']
+            print(f"{name:>24} | {memory['rss']:>8.1f} | {memory['pss']:>8.1f} | {memory['uss']:>8.1f} "
+                  f"({memory['uss'] / baseline:.0%})")
+
+if __name__ == '__main__':
+    main()
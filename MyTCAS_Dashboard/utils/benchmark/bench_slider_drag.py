@@ -0,0 +1,174 @@
+# bench_slider_drag.py - load test การปรับตัวเลื่อนค่าเล่าเรียน: จำนวน callback ที่ประหยัดได้ต่อการปรับ
+#
+# รัน: python bench_slider_drag.py [--size 20000] [--drags 20] [--users 4]
+#
+# ตัวเลื่อนเป็น updatemode='mouseup': value เปลี่ยนเมื่อปล่อยเมาส์ คลิกบนแถบ หรือกดปุ่มลูกศร
+# จำลองผู้ใช้หลายคนพร้อมกัน การปรับแต่ละครั้งเป็นการลากครั้งเดียว หรือการเปลี่ยนติดกันหลายครั้ง
+# (กดปุ่มลูกศรซ้ำ คลิกแก้ตำแหน่ง) แต่ละค่าที่ถูกส่งจะยิง request ของทุก callback พร้อมกันแบบ browser จริง
+# เปรียบเทียบกับ 'mouseup' (ส่งทุกค่าของ value เหมือนก่อนมี debounce): debounce ฝั่ง browser /
+# ทิ้ง request ล้าสมัยฝั่ง server / ทั้งสองอย่าง
+
+import argparse
+import threading
+import time
+import numpy as np
+from dash.exceptions import PreventUpdate
+
+from synthetic import benchmark_workdir, write_synthetic_csv, SOURCE_CSV
+from harness import DashClient, create_dash_app
+import config
+from data_utils import clean_csv_data
+from coalesce import RequestCoalescer
+
+SCENARIOS = [
+    ('mouseup', False, False),
+    ('debounce', True, False),
+    ('drop superseded', False, True),
+    ('debounce + drop', True, True)
+]
+
+def make_drag(tuition, rng):
+    """ค่า value ของการปรับหนึ่งครั้ง: list ของ (เวลาวินาที, [ต่ำสุด, สูงสุด])
+
+    ครึ่งหนึ่งเป็นการลากแล้วปล่อยครั้งเดียว (หนึ่งค่า) ที่เหลือเป็นการเปลี่ยนติดกัน: กดปุ่มลูกศรซ้ำ
+    (ห่างกัน 50-150 ms) หรือคลิกแก้ตำแหน่งหลายครั้ง (ห่างกัน 150-600 ms)
+    """
+    low, high = float(tuition.min()), float(tuition.max())
+    start = rng.uniform(low, high)
+    end = rng.uniform(low, high)
+    kind = rng.random()
+    if kind < 0.5:
+        gaps = np.zeros(1)
+    elif kind < 0.8:
+        gaps = np.concatenate([[0.0], rng.uniform(0.05, 0.15, rng.integers(2, 12))])
+    else:
+        gaps = np.concatenate([[0.0], rng.uniform(0.15, 0.6, rng.integers(1, 4))])
+    times = np.cumsum(gaps)
+    values = np.linspace(start, end, len(times) + 1)[1:]
+    # ปรับเฉพาะปุ่มใดปุ่มหนึ่ง อีกปุ่มอยู่ที่ขอบ
+    moving_low = rng.random() < 0.5
+    return [(float(t), [float(v), high] if moving_low else [low, float(v)])
+            for t, v in zip(times, values)]
+
+def debounced(events, delay):
+    """เหตุการณ์ที่ผ่าน debounce ของ assets/clientside.js (ส่งเมื่อไม่มีค่าใหม่ภายใน delay)"""
+    kept = []
+    for i, (t, value) in enumerate(events):
+        next_time = events[i + 1][0] if i + 1 < len(events) else np.inf
+        if next_time - t >= delay:
+            kept.append((t + delay, value))
+    return kept
+
+def replay(app, events, results):
+    """ส่งเหตุการณ์ตามเวลาจริง แต่ละ callback ยิงใน thread ของตัวเองเหมือน browser"""
+    # DashClient แต่ละตัวเป็นหน้าที่เปิดแยกกัน (page-id ของตัวเอง)
+    client = DashClient(app, fetch_layout=False)
+    threads = []
+    start = time.perf_counter()
+    for t, value in events:
+        time.sleep(max(0.0, start + t - time.perf_counter()))
+        for output, body in client.update_bodies({'tuition-range.data': value}):
+            thread = threading.Thread(target=post, args=(app, client, output, body, results))
+            thread.start()
+            threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+def post(app, client, output, body, results):
+    results.append(client.post(output, body, app.server.test_client()))
+
+def run_scenario(df, drags, use_debounce, drop_superseded):
+    config.CALLBACK_CONFIG['drop_superseded'] = drop_superseded
+    app = create_dash_app(df)
+    delay = config.CALLBACK_CONFIG['slider_debounce_ms'] / 1000
+
+    emitted = 0
+    results = []
+    start = time.perf_counter()
+    users = []
+    for user_drags in drags:
+        # การลากของผู้ใช้แต่ละคนต่อกันเป็นลำดับเวลาเดียว
+        timeline, offset = [], 0.0
+        for events in user_drags:
+            events = debounced(events, delay) if use_debounce else events
+            timeline += [(offset + t, value) for t, value in events]
+            offset = timeline[-1][0] + 1.0 if timeline else offset
+        emitted += len(timeline)
+        users.append(threading.Thread(target=replay, args=(app, timeline, results)))
+    for thread in users:
+        thread.start()
+    for thread in users:
+        thread.join()
+
+    return {
+        'emitted': emitted,
+        'requests': len(results),
+        'executed': sum(status == 200 for status in results),
+        'seconds': time.perf_counter() - start
+    }
+
+def stress_coalescer(threads=6, rounds=200):
+    """request พร้อมกันจำนวนมากของ key เดียวกัน: ทุก request ต้องคำนวณหรือถูกทิ้ง (ไม่มี exception อื่น)
+    request สุดท้ายของแต่ละรอบต้องได้ผล และไม่มีสถานะค้างหลังจบ"""
+    coalescer = RequestCoalescer()
+    errors = []
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        for _ in range(rounds):
+            barrier.wait()
+            try:
+                coalescer.run(('page', 'callback'), lambda: time.sleep(0.0001))
+            except PreventUpdate:
+                pass
+            except Exception as error:
+                errors.append(repr(error))
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    stats = coalescer.stats()
+    assert not errors, f'coalescer ผิดพลาด {len(errors)} ครั้ง เช่น {errors[0]}'
+    assert stats['executed'] + stats['dropped'] == threads * rounds, stats
+    assert stats['executed'] >= rounds, stats
+    assert not coalescer._latest and not coalescer._locks, 'สถานะของ key ค้างอยู่หลังจบ'
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=20_000, help='0 = ข้อมูลจริง')
+    parser.add_argument('--drags', type=int, default=10, help='จำนวนการลากต่อผู้ใช้')
+    parser.add_argument('--users', type=int, default=4)
+    parser.add_argument('--workdir', help='เก็บไฟล์ข้อมูลสังเคราะห์ไว้ที่นี่ (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว)')
+    args = parser.parse_args()
+    with benchmark_workdir(args.workdir) as workdir:
+        config.DATA_CONFIG['csv_file'] = (SOURCE_CSV if args.size == 0 else
+                                          write_synthetic_csv(args.size, f'{workdir}/synthetic_{args.size}.csv'))
+        df = clean_csv_data()
+        rng = np.random.default_rng(0)
+        tuition = df['final_tuition_fee'].to_numpy()
+        drags = [[make_drag(tuition, rng) for _ in range(args.drags)] for _ in range(args.users)]
+        n_drags = args.drags * args.users
+
+        baseline = emitted = None
+        print(f"{len(df):,} rows, {args.users} users x {args.drags} drags, "
+              f"debounce {config.CALLBACK_CONFIG['slider_debounce_ms']} ms")
+        print(f"{'scenario':>16} | {'values/drag':>11} | {'requests/drag':>13} | {'executed/drag':>13} | "
+              f"{'avoided':>7} | {'wall s':>7}")
+        for name, use_debounce, drop_superseded in SCENARIOS:
+            result = run_scenario(df, drags, use_debounce, drop_superseded)
+            baseline = baseline or result['executed']
+            emitted = emitted or result['emitted']
+            # debounce รวมค่าที่ติดกันเท่านั้น ต้องไม่ส่งมากกว่าการส่งทุกค่าของ value
+            assert result['emitted'] <= emitted, f"{name}: ส่ง {result['emitted']} ค่า มากกว่า mouseup ({emitted})"
+            print(f"{name:>16} | {result['emitted'] / n_drags:>11.1f} | {result['requests'] / n_drags:>13.1f} | "
+                  f"{result['executed'] / n_drags:>13.1f} | {1 - result['executed'] / baseline:>7.0%} | "
+                  f"{result['seconds']:>7.1f}")
+
+    stats = stress_coalescer()
+    print(f"\n✅ coalescer: {stats['executed']} คำนวณ, {stats['dropped']} ถูกทิ้ง จาก request พร้อมกัน 6 x 200 รอบ")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+# bench_suite.py - วัดเวลาทุกขั้นตอนของ dashboard ตามขนาดข้อมูล และตรวจการถดถอยเทียบกับผลเดิม
+#
+# รัน: python bench_suite.py [--sizes 1000 10000 100000 1000000] [--output results.json]
+#      python bench_suite.py --baseline results.json [--threshold 0.25]
+#
+# ใช้ข้อมูลสังเคราะห์จาก make_tcas_dataset แล้ววัด
+#   load     - ขั้นตอนของ load_and_clean_data (อ่าน CSV, จัดภูมิภาค, จัดประเภท, เลื่อนพิกัด, ข้อความ hover)
+#   query    - filter_dataframe และฟังก์ชันใน charts.py ต่อสถานะตัวกรองแบบสุ่ม
+#   callback - ฟังก์ชัน callback จาก register_callbacks (รวม serialize แบบ Dash) ตามลำดับ request แบบ Zipf
+# ผลเป็น JSON (เวลาเป็นมิลลิวินาที) ถ้าระบุ --baseline จะจบด้วย exit code 1 เมื่อมีขั้นตอนที่ช้าลง
+# เกิน threshold (และช้าลงเกิน --min-delta-ms เพื่อไม่ให้สัญญาณรบกวนของขั้นตอนที่เร็วมากทำให้ล้มเหลว)
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from synthetic import benchmark_workdir, write_synthetic_csv
+from harness import CallbackRecorder, serialize, random_filter_states, request_sequence
+import config
+from data_utils import (load_and_clean_data, assign_regions, categorize_programs, add_coordinate_offset,
+                        build_hover_text, filter_dataframe, summarize_dataframe, FilterIndex)
+from charts import create_map_figure, create_regional_chart, create_program_distribution_chart
+from callbacks import register_callbacks
+
+def time_call(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def summarize_samples(group, stage, samples):
+    samples = np.asarray(samples) * 1000
+    return {
+        'group': group,
+        'stage': stage,
+        'median_ms': float(np.median(samples)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'samples': len(samples)
+    }
+
+def bench_load(repeat):
+    """เวลาของแต่ละขั้นตอนใน load_and_clean_data และเวลารวม (ทุกรอบเป็นหนึ่งตัวอย่าง)"""
+    samples = {}
+
+    def record(stage, func):
+        elapsed, result = time_call(func)
+        samples.setdefault(stage, []).append(elapsed)
+        return result
+
+    for _ in range(repeat):
+        df = record('read_csv', lambda: pd.read_csv(config.DATA_CONFIG['csv_file']))
+        df['final_tuition_fee'] = df[config.DATA_CONFIG['tuition_column']]
+        df['unique_id'] = df.index.astype(str)
+        df['region'] = record('assign_regions', lambda: assign_regions(df['latitude'], df['longitude']))
+        df['program_type'] = record('categorize_programs', lambda: categorize_programs(df))
+        df = record('add_coordinate_offset', lambda: add_coordinate_offset(df))
+        record('build_hover_text', lambda: build_hover_text(df))
+        df_clean = record('load_and_clean_data', load_and_clean_data)
+    return [summarize_samples('load', stage, values) for stage, values in samples.items()], df_clean
+
+def bench_query(df, states):
+    """เวลาการกรองและการสร้างกราฟต่อสถานะตัวกรอง (ไม่ใช้แคช)"""
+    index = FilterIndex(df)
+    samples = {}
+
+    def record(stage, func):
+        elapsed, result = time_call(func)
+        samples.setdefault(stage, []).append(elapsed)
+        return result
+
+    for filters in states:
+        filtered = record('filter_dataframe', lambda: filter_dataframe(df, *filters))
+        record('filter_dataframe_indexed', lambda: filter_dataframe(df, *filters, index=index))
+        summary = record('summarize_dataframe', lambda: summarize_dataframe(filtered))
+        figure = record('create_map_figure', lambda: create_map_figure(filtered))
+        record('serialize_map', lambda: serialize(figure))
+        record('create_regional_chart', lambda: create_regional_chart(summary))
+        record('create_program_distribution_chart', lambda: create_program_distribution_chart(summary))
+    return [summarize_samples('query', stage, values) for stage, values in samples.items()]
+
+def bench_callbacks(df, requests, seed=0):
+    """เวลาของ callback แต่ละตัว (รวม serialize) ตามลำดับ request ที่สถานะยอดนิยมถูกเรียกซ้ำ"""
+    recorder = CallbackRecorder()
+    register_callbacks(recorder, df)
+    rng = np.random.default_rng(seed)
+    clicked = rng.choice(df['unique_id'].to_numpy(), size=len(requests))
+
+    samples = {}
+    for filters, unique_id in zip(requests, clicked):
+        calls = [(name, filters) for name in recorder.callbacks if name != 'update_details']
+        calls.append(('update_details', ({'points': [{'text': unique_id}]},) + tuple(filters)))
+        for name, args in calls:
+            elapsed, _ = time_call(lambda: serialize(recorder.callbacks[name](*args)))
+            samples.setdefault(name, []).append(elapsed)
+    return [summarize_samples('callback', name, values) for name, values in samples.items()]
+
+def run_size(n_rows, args, workdir):
+    csv_file = write_synthetic_csv(n_rows, os.path.join(workdir, f'tcas_{n_rows}.csv'),
+                                   seed=args.seed, realistic=True)
+    config.DATA_CONFIG['csv_file'] = csv_file
+    # ไม่ใช้ไฟล์ artifact ให้ load_and_clean_data ทำความสะอาดจาก CSV ทุกครั้ง
+    config.DATA_CONFIG['artifact_file'] = os.path.join(workdir, 'no_artifact.feather')
+
+    load_results, df = bench_load(args.repeat)
+    states = random_filter_states(df, args.states, seed=args.seed)
+    results = load_results + bench_query(df, states)
+    results += bench_callbacks(df, request_sequence(states, args.requests, seed=args.seed), seed=args.seed)
+    for result in results:
+        result['rows'] = n_rows
+    return results
+
+def find_regressions(results, baseline, threshold, min_delta_ms):
+    """ขั้นตอนที่ median ช้าลงเกิน threshold เทียบกับผลเดิม (จับคู่ด้วย group, stage และจำนวนแถว)"""
+    previous = {(r['group'], r['stage'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get((result['group'], result['stage'], result['rows']))
+        if before is None:
+            continue
+        delta = result['median_ms'] - before['median_ms']
+        if delta > min_delta_ms and result['median_ms'] > before['median_ms'] * (1 + threshold):
+            regressions.append((result, before))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--states', type=int, default=30, help='จำนวนสถานะตัวกรองของกลุ่ม query')
+    parser.add_argument('--requests', type=int, default=200, help='จำนวน request ของกลุ่ม callback')
+    parser.add_argument('--repeat', type=int, default=3, help='จำนวนรอบของกลุ่ม load')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='ไฟล์ JSON สำหรับเก็บผล')
+    parser.add_argument('--baseline', help='ไฟล์ JSON ผลเดิมสำหรับตรวจการถดถอย')
+    parser.add_argument('--threshold', type=float, default=0.25, help='สัดส่วนที่ยอมให้ช้าลงได้')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0)
+    parser.add_argument('--workdir', help='เก็บไฟล์ข้อมูลสังเคราะห์ไว้ที่นี่ (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว)')
+    args = parser.parse_args()
+    with benchmark_workdir(args.workdir) as workdir:
+        results = []
+        print(f"{'rows':>10} | {'group':>8} | {'stage':>34} | {'median ms':>10} | {'p99 ms':>10}")
+        for n_rows in args.sizes:
+            for result in run_size(n_rows, args, workdir):
+                results.append(result)
+                print(f"{n_rows:>10,} | {result['group']:>8} | {result['stage']:>34} | "
+                      f"{result['median_ms']:>10.3f} | {result['p99_ms']:>10.3f}")
+
+        report = {
+            'meta': {
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'cpu_count': os.cpu_count(),
+                'seed': args.seed,
+                'states': args.states,
+                'requests': args.requests
+            },
+            'results': results
+        }
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        if args.baseline:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = find_regressions(results, baseline, args.threshold, args.min_delta_ms)
+            for result, before in regressions:
+                print(f"REGRESSION {result['rows']:,} rows {result['group']}/{result['stage']}: "
+                      f"{before['median_ms']:.3f} -> {result['median_ms']:.3f} ms")
+            if regressions:
+                sys.exit(1)
+            print(f"no regression beyond {args.threshold:.0%} against {args.baseline}")
+
+if __name__ == '__main__':
+    main()
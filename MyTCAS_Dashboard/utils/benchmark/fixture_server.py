@@ -0,0 +1,141 @@
+# fixture_server.py - HTTP server ในเครื่องที่ส่งหน้ารายละเอียดหลักสูตรแบบ MyTCAS สำหรับ benchmark ตัวดึงข้อมูล
+#
+# ใช้ HTML ที่บันทึกไว้จาก course.mytcas.com (ไฟล์ *.html ในโฟลเดอร์) หรือสร้างหน้าโครงสร้างเดียวกัน
+# (span.name และ dl ของ dt/dd) จาก raw.csv เพื่อเทียบผลที่แยกได้กับข้อมูลต้นฉบับ
+
+import glob
+import hashlib
+import html
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+MAKE_DATASET_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'make_dataset'))
+RAW_CSV = os.path.join(MAKE_DATASET_DIR, 'results', 'raw.csv')
+
+# ให้ import สคริปต์ใน utils/make_dataset ได้เมื่อรันจากโฟลเดอร์นี้
+if MAKE_DATASET_DIR not in sys.path:
+    sys.path.insert(0, MAKE_DATASET_DIR)
+
+from program_page import COLUMNS, DETAIL_COLUMNS
+
+# เนื้อหาส่วนอื่นของหน้า (เมนู สคริปต์) ให้ขนาดหน้าใกล้เคียงหน้าจริง
+PAGE_FILLER = '<nav>' + '<a href="/search">ค้นหาหลักสูตร</a>' * 200 + '</nav>'
+
+def render_program_page(record, client_rendered=False):
+    """HTML หน้ารายละเอียดหลักสูตรโครงสร้างเดียวกับ course.mytcas.com จากข้อมูลหนึ่งแถวของ raw.csv
+
+    client_rendered=True ส่งเฉพาะโครงหน้า แล้วสร้างเนื้อหาด้วย JavaScript (ต้องใช้ browser จึงแยกข้อมูลได้)
+    """
+    details = ''.join(f'<dt>{html.escape(title)}</dt><dd>{html.escape(record[column])}</dd>'
+                      for title, column in DETAIL_COLUMNS.items())
+    content = (
+        '<h1 class="program"><span class="name">'
+        f'<a href="/universities">{html.escape(record["มหาวิทยาลัย"])}</a>'
+        f'<small><a href="/faculties">{html.escape(record["คณะ"])}</a>'
+        f'<a href="/fields">{html.escape(record["สาขา"])}</a></small></span></h1>'
+        f'<dl>{details}</dl>'
+    )
+    if client_rendered:
+        script = json.dumps(content).replace('</', '<\\/')
+        content = f'<div id="app"></div><script>document.getElementById("app").innerHTML = {script};</script>'
+    return (
+        '<!DOCTYPE html><html lang="th"><head><meta charset="utf-8">'
+        f'<title>{html.escape(record["หลักสูตร"])}</title></head><body>{PAGE_FILLER}{content}</body></html>'
+    )
+
+def load_fixture_pages(n_pages=None, html_dir=None, client_rendered=0.0):
+    """รายการ (HTML, ข้อมูลที่ควรแยกได้) ขนาด n_pages (วนซ้ำหน้าที่มี)
+
+    ถ้าระบุ html_dir ใช้ไฟล์ *.html ที่บันทึกไว้ (ไม่มีข้อมูลให้เทียบ จึงเป็น None)
+    client_rendered คือสัดส่วนของหน้าที่สร้างจาก raw.csv แบบ render ด้วย JavaScript
+    """
+    if html_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(html_dir, '*.html'))):
+            with open(path, encoding='utf-8') as f:
+                pages.append((f.read(), None))
+        n_pages = n_pages or len(pages)
+        return [pages[i % len(pages)] for i in range(n_pages)]
+
+    records = pd.read_csv(RAW_CSV, dtype=str, keep_default_na=False)[COLUMNS].to_dict('records')
+    n_pages = n_pages or len(records)
+    # หน้าที่ render ด้วย JavaScript กระจายทุกๆ every หน้า
+    every = round(1 / client_rendered) if client_rendered else 0
+    return [(render_program_page(records[i % len(records)], client_rendered=bool(every) and i % every == 0),
+             records[i % len(records)]) for i in range(n_pages)]
+
+class FixtureServer:
+    """ส่งหน้า HTML ที่ /programs/<ลำดับ> โดยหน่วงแต่ละ response latency วินาที (จำลองเวลาของเครือข่าย)
+
+    ทุกหน้ามี ETag และตอบ 304 เมื่อ If-None-Match ตรงกัน เปลี่ยนเนื้อหาหน้าได้ด้วย set_page
+
+    ใช้แบบ context manager: with FixtureServer(pages) as server: server.links
+    """
+
+    def __init__(self, pages, latency=0.0):
+        self.pages = []
+        self.etags = []
+        for page in pages:
+            self.set_page(len(self.pages), page)
+        self.latency = latency
+        self.requests = 0
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True   # ไม่ให้ header กับ body ที่เขียนแยกกันรอ delayed ACK
+
+            def do_GET(self):
+                fixture.requests += 1
+                prefix, _, index = self.path.rpartition('/')
+                if prefix != '/programs' or not index.isdigit() or int(index) >= len(fixture.pages):
+                    self.send_error(404)
+                    return
+                time.sleep(fixture.latency)
+                etag = fixture.etags[int(index)]
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                body = fixture.pages[int(index)]
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+
+    def set_page(self, index, page):
+        body = page.encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if index == len(self.pages):
+            self.pages.append(body)
+            self.etags.append(etag)
+        else:
+            self.pages[index], self.etags[index] = body, etag
+
+    @property
+    def links(self):
+        host, port = self.server.server_address
+        return [f'http://{host}:{port}/programs/{i}' for i in range(len(self.pages))]
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
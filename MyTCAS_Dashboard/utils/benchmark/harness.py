@@ -0,0 +1,148 @@
+# harness.py - เครื่องมือร่วมของ benchmark: เรียก callback ได้โดยไม่ต้องรัน Dash server
+
+import json
+import time
+import dash
+from dash import State
+import numpy as np
+from plotly.io.json import to_json_plotly
+from layout import create_layout, serve_layout
+from callbacks import register_callbacks
+from coalesce import PAGE_ID, new_page_id
+from compression import install_compression
+from config import COMPRESSION_CONFIG
+
+class CallbackRecorder:
+    """ใช้แทน Dash app ตอน benchmark เก็บฟังก์ชัน callback ไว้เรียกตรงๆ ตามชื่อฟังก์ชัน"""
+
+    def __init__(self):
+        self.callbacks = {}
+
+    def callback(self, *args, **kwargs):
+        # callback ที่รวม request ตามหน้า (State page-id) รับ page-id เป็นอาร์กิวเมนต์สุดท้าย
+        # ส่ง None ให้แทน (ไม่รวม request) ผู้เรียกจึงส่งเฉพาะค่าตัวกรองเหมือนเดิม
+        dependencies = [dep for group in args for dep in (group if isinstance(group, list) else [group])]
+        page_state = any(isinstance(dep, State) and dep.component_id == PAGE_ID for dep in dependencies)
+
+        def decorator(func):
+            self.callbacks[func.__name__] = (lambda *call_args: func(*call_args, None)) if page_state else func
+            return func
+        return decorator
+
+    def clientside_callback(self, *args, **kwargs):
+        pass
+
+def serialize(value):
+    """serialize ผลลัพธ์แบบเดียวกับที่ Dash ส่งกลับไปยัง browser"""
+    return to_json_plotly(value)
+
+def timed(func, *args):
+    """เรียกฟังก์ชันแล้ว serialize ผลลัพธ์ คืน (เวลาเป็นวินาที, ขนาด payload เป็นไบต์)"""
+    start = time.perf_counter()
+    payload = serialize(func(*args))
+    return time.perf_counter() - start, len(payload)
+
+def percentiles(samples):
+    """p50 และ p99 เป็นมิลลิวินาที"""
+    samples = np.asarray(samples) * 1000
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+def random_filter_states(df, n_states, seed=0):
+    """สุ่มสถานะตัวกรอง (ประเภทโปรแกรม, ภูมิภาค, ช่วงค่าเล่าเรียน) ที่มีอยู่จริงในข้อมูล"""
+    rng = np.random.default_rng(seed)
+    programs = ['all'] + list(df['program_type'].unique())
+    regions = ['all'] + list(df['region'].unique())
+    tuition = np.sort(df['final_tuition_fee'].unique())
+    
+    states = [('all', 'all', [float(tuition[0]), float(tuition[-1])])]
+    while len(states) < n_states:
+        low, high = np.sort(rng.choice(tuition, size=2))
+        states.append((str(rng.choice(programs)), str(rng.choice(regions)), [float(low), float(high)]))
+    return states
+
+def request_sequence(states, n_requests, seed=0):
+    """ลำดับ request ที่สถานะยอดนิยมถูกเรียกซ้ำบ่อย (การกระจายแบบ Zipf)"""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(states) + 1)
+    picks = rng.choice(len(states), size=n_requests, p=weights / weights.sum())
+    return [states[i] for i in picks]
+
+def with_page_id(body, page_id):
+    """body ของ request เดียวกันที่ส่งจากหน้าอื่น (page-id ต่างกัน)"""
+    return dict(body, state=[dict(item, value=page_id) if item['id'] == PAGE_ID else item for item in body['state']])
+
+def create_dash_app(df):
+    """สร้าง Dash app แบบเดียวกับ app.py (ใช้ CALLBACK_CONFIG ณ ตอนเรียก)"""
+    app = dash.Dash(__name__)
+    app.layout = serve_layout(create_layout(df))
+    register_callbacks(app, df)
+    if COMPRESSION_CONFIG['enabled']:
+        install_compression(app.server)
+    return app
+
+class DashClient:
+    """จำลอง browser: ส่ง request ไปที่ /_dash-update-component ผ่าน Flask test client
+
+    เมื่อค่าตัวกรองเปลี่ยน จะเรียกทุก callback ที่มีตัวกรองนั้นเป็น Input
+    เหมือนที่ dash-renderer ทำ (หนึ่ง HTTP request ต่อหนึ่ง callback)
+    ค่าที่ callback ส่งกลับถูกเก็บไว้เป็น property (Patch ไม่ถูกนำไปใช้กับรูปที่เก็บไว้)
+    callback ฝั่ง browser (clientside) ไม่มีฟังก์ชันฝั่ง server จึงข้ามไป
+    """
+
+    def __init__(self, app, fetch_layout=True):
+        self.app = app
+        self.client = app.server.test_client()
+        # page-id ของการโหลดหน้าครั้งนี้ (dcc.Store ที่ serve_layout สร้าง)
+        self.props = {'program-filter.value': 'all', 'region-filter.value': 'all', 'thailand-map.clickData': None,
+                      f'{PAGE_ID}.data': new_page_id()}
+        self.round_trips = 0
+        self.response_bytes = 0
+        # ขนาด layout ที่ browser โหลดครั้งแรก (โหมด clientside รวมข้อมูลใน dcc.Store)
+        self.layout_bytes = len(self.client.get('/_dash-layout').data) if fetch_layout else 0
+
+    def _body(self, output, spec, changed):
+        """JSON ที่ dash-renderer ส่งมาเมื่อ Input ของ callback เปลี่ยน"""
+        # callback หลาย Output มี key รูปแบบ "..a.figure...b.children.."
+        if output.startswith('..'):
+            outputs = [dict(zip(['id', 'property'], item.rsplit('.', 1)))
+                       for item in output.strip('.').split('...')]
+        else:
+            outputs = dict(zip(['id', 'property'], output.rsplit('.', 1)))
+        inputs = [dict(item, value=self.props.get(f"{item['id']}.{item['property']}")) for item in spec['inputs']]
+        state = [dict(item, value=self.props.get(f"{item['id']}.{item['property']}")) for item in spec['state']]
+        return {'output': output, 'outputs': outputs, 'inputs': inputs,
+                'changedPropIds': changed, 'state': state}
+
+    def update_bodies(self, values):
+        """ตั้งค่า property ที่เปลี่ยน แล้วคืน (output, body) ของทุก callback ฝั่ง server ที่ต้องถูกเรียก"""
+        self.props.update(values)
+        changed = list(values)
+        return [(output, self._body(output, spec, changed))
+                for output, spec in self.app.callback_map.items()
+                if 'callback' in spec
+                and any(f"{item['id']}.{item['property']}" in changed for item in spec['inputs'])]
+
+    def post(self, output, body, client=None):
+        """ส่ง request ของ callback หนึ่งตัว คืน status code (204 = ไม่อัปเดต/ถูกทิ้ง)"""
+        response = (client or self.client).post('/_dash-update-component', data=json.dumps(body),
+                                                content_type='application/json')
+        if response.status_code not in (200, 204):
+            raise RuntimeError(f'{output}: HTTP {response.status_code}')
+        self.round_trips += 1
+        self.response_bytes += len(response.data)
+        # เก็บค่าที่ callback ส่งกลับ (เช่น dcc.Store ที่ใช้เป็น State ของ request ถัดไป)
+        if response.status_code == 200:
+            for component, props in response.get_json()['response'].items():
+                self.props.update({f'{component}.{prop}': value for prop, value in props.items()})
+        return response.status_code
+
+    def set_filters(self, program_type, region, tuition_range):
+        """เปลี่ยนตัวกรองทั้งสามแล้วเรียก callback ที่เกี่ยวข้อง คืนเวลาที่ใช้ (วินาที)"""
+        values = {'program-filter.value': program_type,
+                  'region-filter.value': region,
+                  'tuition-range.data': list(tuition_range)}
+
+        start = time.perf_counter()
+        for output, body in self.update_bodies(values):
+            self.post(output, body)
+        return time.perf_counter() - start
@@ -0,0 +1,167 @@
+# synthetic.py - สร้างข้อมูลสังเคราะห์ลักษณะเดียวกับข้อมูล TCAS สำหรับ benchmark
+
+import os
+import sys
+import tempfile
+from contextlib import nullcontext
+import numpy as np
+import pandas as pd
+
+DASHBOARD_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+SOURCE_CSV = os.path.join(DASHBOARD_DIR, 'data', 'data_via_location_noises.csv')
+
+# ให้ import โมดูลของ dashboard ได้เมื่อรันสคริปต์จากโฟลเดอร์นี้
+if DASHBOARD_DIR not in sys.path:
+    sys.path.insert(0, DASHBOARD_DIR)
+
+def benchmark_workdir(path=None):
+    """โฟลเดอร์สำหรับไฟล์ข้อมูลสังเคราะห์: path ที่ระบุ (เก็บไฟล์ไว้) หรือโฟลเดอร์ชั่วคราวที่ถูกลบเมื่อจบ"""
+    return nullcontext(path) if path else tempfile.TemporaryDirectory()
+
+# ขอบเขตพิกัดโดยประมาณของประเทศไทย
+THAILAND_BOUNDS = {
+    'lat': (5.6, 20.5),
+    'lon': (97.3, 105.7)
+}
+
+def make_synthetic_coordinates(n_rows, seed=0):
+    """สุ่มพิกัดภายในขอบเขตประเทศไทย"""
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(*THAILAND_BOUNDS['lat'], size=n_rows)
+    lon = rng.uniform(*THAILAND_BOUNDS['lon'], size=n_rows)
+    return lat, lon
+
+def make_synthetic_dataset(n_rows, seed=0):
+    """สร้าง DataFrame ขนาด n_rows โดยสุ่มแถวจากข้อมูลจริงแล้วสุ่มพิกัดและค่าเล่าเรียนใหม่"""
+    rng = np.random.default_rng(seed)
+    source = pd.read_csv(SOURCE_CSV, index_col=0)
+    
+    df = source.iloc[rng.integers(0, len(source), size=n_rows)].reset_index(drop=True)
+    df['latitude'], df['longitude'] = make_synthetic_coordinates(n_rows, seed)
+    df['ค่าใช้จ่ายที่ปรับแล้ว'] = rng.integers(10, 150, size=n_rows) * 1000
+    
+    return df
+
+def write_synthetic_csv(n_rows, path, seed=0, realistic=False):
+    """เขียนข้อมูลสังเคราะห์เป็น CSV รูปแบบเดียวกับไฟล์ข้อมูลจริง
+
+    realistic=True ใช้ make_tcas_dataset (ชื่อหลักสูตรและวิทยาเขตไม่ซ้ำกับข้อมูลจริง)
+    """
+    make = make_tcas_dataset if realistic else make_synthetic_dataset
+    make(n_rows, seed).to_csv(path)
+    return path
+
+# จังหวัดและพิกัดโดยประมาณของตัวเมือง ใช้ตั้งวิทยาเขตสังเคราะห์
+PROVINCES = [
+    ('เชียงราย', 19.91, 99.83), ('เชียงใหม่', 18.79, 98.98), ('ลำปาง', 18.29, 99.49),
+    ('พิษณุโลก', 16.82, 100.26), ('นครสวรรค์', 15.70, 100.14), ('เพชรบูรณ์', 16.42, 101.16),
+    ('อุดรธานี', 17.41, 102.79), ('ขอนแก่น', 16.44, 102.84), ('สกลนคร', 17.16, 104.15),
+    ('มหาสารคาม', 16.18, 103.30), ('นครราชสีมา', 14.97, 102.10), ('บุรีรัมย์', 14.99, 103.10),
+    ('อุบลราชธานี', 15.24, 104.85), ('ร้อยเอ็ด', 16.05, 103.65), ('พระนครศรีอยุธยา', 14.35, 100.57),
+    ('นครปฐม', 13.82, 100.06), ('ปทุมธานี', 14.02, 100.53), ('นนทบุรี', 13.86, 100.51),
+    ('สมุทรปราการ', 13.60, 100.60), ('ชลบุรี', 13.36, 100.98), ('ระยอง', 12.68, 101.28),
+    ('จันทบุรี', 12.61, 102.10), ('ราชบุรี', 13.54, 99.81), ('กาญจนบุรี', 14.02, 99.53),
+    ('เพชรบุรี', 13.11, 99.94), ('นครศรีธรรมราช', 8.43, 99.96), ('สุราษฎร์ธานี', 9.14, 99.33),
+    ('ภูเก็ต', 7.88, 98.39), ('สงขลา', 7.19, 100.60), ('ยะลา', 6.54, 101.28)
+]
+
+# รูปแบบชื่อสถาบันที่ตั้งตามชื่อจังหวัด
+INSTITUTION_PATTERNS = ['มหาวิทยาลัยราชภัฏ', 'มหาวิทยาลัยเทคโนโลยีราชมงคล', 'มหาวิทยาลัย', 'สถาบันเทคโนโลยี']
+FACULTIES = ['คณะวิศวกรรมศาสตร์', 'คณะวิศวกรรมศาสตร์และเทคโนโลยี', 'คณะเทคโนโลยีอุตสาหกรรม',
+             'คณะวิทยาศาสตร์และวิศวกรรมศาสตร์', 'วิทยาลัยการคอมพิวเตอร์']
+
+# (สาขาไทย, สาขาอังกฤษ, น้ำหนัก) ครอบคลุมคำสำคัญของทุกประเภทใน PROGRAM_CONFIG
+MAJORS = [
+    ('วิศวกรรมคอมพิวเตอร์', 'Computer Engineering', 10),
+    ('วิศวกรรมคอมพิวเตอร์และสารสนเทศศาสตร์', 'Computer Engineering and Informatics', 2),
+    ('วิศวกรรมซอฟต์แวร์', 'Software Engineering', 2),
+    ('วิศวกรรมระบบสารสนเทศและเครือข่าย', 'Information and Network Engineering', 1),
+    ('วิศวกรรมปัญญาประดิษฐ์', 'Artificial Intelligence Engineering', 2),
+    ('วิศวกรรมดิจิทัล', 'Digital Engineering', 1),
+    ('วิศวกรรมระบบอัจฉริยะ', 'Intelligence Systems Engineering', 1),
+    ('วิศวกรรมความมั่นคงปลอดภัยไซเบอร์', 'Cybersecurity Engineering', 1)
+]
+DEGREE_PREFIXES = [
+    ('หลักสูตรวิศวกรรมศาสตรบัณฑิต สาขาวิชา', 'Bachelor of Engineering Program in '),
+    ('วศ.บ. สาขาวิชา', 'B.Eng. in '),
+    ('วศ.บ. ', 'B.Eng. '),
+    ('วิศวกรรมศาสตรบัณฑิต สาขาวิชา', 'Bachelor of Engineering in ')
+]
+
+# (ประเภทหลักสูตร, ส่วนท้ายชื่อ, น้ำหนัก, ค่าเล่าเรียนกลาง) ค่าเล่าเรียนกระจายแบบ log-normal รอบค่ากลาง
+PROGRAM_TRACKS = [
+    ('ภาษาไทย ปกติ', '', 85, 25_000),
+    ('ภาษาไทย พิเศษ', ' (ภาคพิเศษ)', 5, 45_000),
+    ('นานาชาติ', ' (หลักสูตรนานาชาติ)', 9, 90_000),
+    ('Joint Degree - นานาชาติ', ' (หลักสูตรนานาชาติ)', 1, 150_000)
+]
+
+def make_campuses(n_campuses, rng):
+    """วิทยาเขตจริงจากไฟล์ข้อมูล และวิทยาเขตสังเคราะห์ตามจังหวัดจนครบ n_campuses"""
+    source = pd.read_csv(SOURCE_CSV, index_col=0)
+    campuses = (source.groupby(['มหาวิทยาลัย', 'วิทยาเขต'], sort=False)
+                .agg(img=('img', 'first'), latitude=('latitude', 'first'), longitude=('longitude', 'first'))
+                .reset_index())
+    
+    n_extra = max(0, n_campuses - len(campuses))
+    province = rng.integers(0, len(PROVINCES), size=n_extra)
+    home = rng.integers(0, len(PROVINCES), size=n_extra)
+    pattern = rng.integers(0, len(INSTITUTION_PATTERNS), size=n_extra)
+    names = [f'{INSTITUTION_PATTERNS[p]}{PROVINCES[h][0]}' for p, h in zip(pattern, home)]
+    # วิทยาเขตหลักอยู่ที่จังหวัดของสถาบัน วิทยาเขตอื่นตั้งชื่อตามจังหวัดที่ตั้ง
+    province = np.where(rng.random(n_extra) < 0.6, home, province)
+    extra = pd.DataFrame({
+        'มหาวิทยาลัย': names,
+        'วิทยาเขต': ['วิทยาเขตหลัก' if p == h else f'วิทยาเขต{PROVINCES[p][0]}' for p, h in zip(province, home)],
+        'img': [f'https://assets.mytcas.com/i/logo/{900 + h:03d}.png' for h in home],
+        'latitude': [PROVINCES[p][1] for p in province] + rng.normal(0, 0.05, size=n_extra),
+        'longitude': [PROVINCES[p][2] for p in province] + rng.normal(0, 0.05, size=n_extra)
+    })
+    return pd.concat([campuses, extra], ignore_index=True).drop_duplicates(['มหาวิทยาลัย', 'วิทยาเขต'])
+
+def pick(rng, weights, size):
+    weights = np.asarray(weights, dtype=float)
+    return rng.choice(len(weights), size=size, p=weights / weights.sum())
+
+def make_tcas_dataset(n_rows, seed=0, programs_per_campus=25):
+    """สร้างข้อมูลลักษณะเดียวกับ TCAS ขนาด n_rows โปรแกรม (คอลัมน์เดียวกับไฟล์ข้อมูลจริง)
+
+    ชื่อหลักสูตรประกอบจากคำนำหน้าปริญญา สาขา และประเภทหลักสูตร (ไทย/อังกฤษ)
+    ทุกโปรแกรมของวิทยาเขตเดียวกันใช้พิกัดเดียวกันแบบข้อมูลจริง
+    จำนวนวิทยาเขตเพิ่มตามขนาดข้อมูล (ประมาณ programs_per_campus โปรแกรมต่อวิทยาเขต
+    แต่ไม่เกินจำนวนคู่ชื่อสถาบันและจังหวัดที่สร้างได้)
+    """
+    rng = np.random.default_rng(seed)
+    campuses = make_campuses(max(1, n_rows // programs_per_campus), rng)
+    # วิทยาเขตใหญ่มีโปรแกรมมากกว่า (การกระจายแบบ Zipf)
+    campus = pick(rng, 1.0 / np.arange(1, len(campuses) + 1) ** 0.5, n_rows)
+    major = pick(rng, [weight for _, _, weight in MAJORS], n_rows)
+    prefix = rng.integers(0, len(DEGREE_PREFIXES), size=n_rows)
+    track = pick(rng, [weight for _, _, weight, _ in PROGRAM_TRACKS], n_rows)
+    faculty = rng.integers(0, len(FACULTIES), size=n_rows)
+    
+    # ชื่อหลักสูตรมีชุดค่าที่เป็นไปได้ไม่มาก สร้างตารางครั้งเดียวแล้วเลือกด้วยรหัส
+    combos = [(p, m, t) for p in range(len(DEGREE_PREFIXES)) for m in range(len(MAJORS))
+              for t in range(len(PROGRAM_TRACKS))]
+    thai_names = np.array([DEGREE_PREFIXES[p][0] + MAJORS[m][0] + PROGRAM_TRACKS[t][1] for p, m, t in combos])
+    eng_names = np.array([DEGREE_PREFIXES[p][1] + MAJORS[m][1] for p, m, t in combos])
+    combo = (prefix * len(MAJORS) + major) * len(PROGRAM_TRACKS) + track
+    
+    median_fee = np.array([fee for _, _, _, fee in PROGRAM_TRACKS])[track]
+    fee = np.round(median_fee * rng.lognormal(0, 0.35, size=n_rows), -2).astype(np.int64)
+    
+    selected = campuses.iloc[campus].reset_index(drop=True)
+    return pd.DataFrame({
+        'มหาวิทยาลัย': selected['มหาวิทยาลัย'],
+        'หลักสูตร': thai_names[combo],
+        'หลักสูตรEng': eng_names[combo],
+        'ประเภทหลักสูตร': np.array([name for name, _, _, _ in PROGRAM_TRACKS])[track],
+        'วิทยาเขต': selected['วิทยาเขต'],
+        'ค่าใช้จ่าย': pd.Series(fee).map('{:,}'.format),
+        'คณะ': np.array(FACULTIES)[faculty],
+        'สาขา': np.array([name for name, _, _ in MAJORS])[major],
+        'ค่าใช้จ่ายที่ปรับแล้ว': fee,
+        'img': selected['img'],
+        'latitude': selected['latitude'],
+        'longitude': selected['longitude']
+    })
@@ -1,4 +1,5 @@
 import asyncio
+import os
 from playwright.sync_api import sync_playwright
 import bs4
 import time 
@@ -23,11 +24,19 @@ soup = bs4.BeautifulSoup(html, "html.parser")
 results = soup.find("ul", class_ = 't-programs')  # ตัวอย่างค้นหา li ทั้งหมด
 
 df = pd.DataFrame(columns=['Link'])
+# ลิงก์ที่มีในไฟล์แล้ว (รันซ้ำหรือค้นหลายคำไม่ได้ลิงก์ซ้ำ)
+seen = set()
+if os.path.exists('major_link.csv'):
+    with open('major_link.csv', encoding="utf-8") as f:
+        seen = {line.strip() for line in f}
 with open('major_link.csv' , 'a' , encoding="utf-8") as f:
     for r in results.find_all('li'):
-        link = r.find('a')['href']
+        link = 'https://course.mytcas.com' + r.find('a')['href']
+        if link in seen:
+            continue
+        seen.add(link)
         print(link)
-        f.write('https://course.mytcas.com'+link + "\n")
+        f.write(link + "\n")
         # df = df.append({'Link': 'https://course.mytcas.com'+link}, ignore_index=True)
         # df.to_csv('major_link.csv', index=False)
 
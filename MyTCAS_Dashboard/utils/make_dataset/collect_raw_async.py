@@ -0,0 +1,154 @@
+# collect_raw_async.py - ดึงหน้ารายละเอียดหลักสูตรหลายหน้าพร้อมกันด้วย browser ตัวเดียว
+#
+# รัน: python collect_raw_async.py [--links ../data/major_link.csv] [--output raw.csv] [--concurrency 8]
+#
+# ต่างจาก collect_raw.py ที่เปิด Chromium ใหม่ทุกหน้า: เปิด browser ครั้งเดียวแล้วใช้ page ซ้ำจาก pool
+# ขนาด concurrency จำกัดจำนวน request ต่อวินาทีต่อ host และลองใหม่เมื่อโหลดไม่สำเร็จ
+# ผลลัพธ์มีคอลัมน์เดียวกับ raw.csv เรียงตามลำดับลิงก์ (หน้าที่ล้มเหลวทุกครั้งถูกข้ามและ log ไว้)
+# ทุกหน้าบันทึกลง --state ทันทีที่เสร็จ รันซ้ำจะข้ามหน้าที่สำเร็จแล้ว (--refresh ตรวจทุกหน้าใหม่)
+# HTML ที่ render แล้วเก็บใน --cache (html_cache.py) หน้าที่ดึงไว้แล้ววันนี้ไม่ต้องโหลดใหม่
+
+import argparse
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+
+import pandas as pd
+from playwright.async_api import async_playwright
+from crawl_state import CrawlState
+from html_cache import HtmlCache, HTML_CACHE_CONFIG
+from program_page import COLUMNS, parse_program
+from rate_limiter import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_CONFIG = {
+    'concurrency': 8,          # จำนวน page ที่โหลดพร้อมกัน
+    'rate_per_host': 4.0,      # request ต่อวินาทีสูงสุดต่อ host (0 = ไม่จำกัด)
+    'retries': 3,              # จำนวนครั้งที่ลองใหม่ต่อหน้า
+    'backoff': 1.0,            # วินาทีที่รอก่อนลองใหม่ (คูณสองทุกครั้ง)
+    'timeout_ms': 30000,       # เวลาสูงสุดในการโหลดหนึ่งหน้า
+    'wait_for': 'dl',          # selector ที่ต้องมีก่อนอ่าน HTML (เร็วกว่ารอ networkidle)
+    'block_resources': ['image', 'media', 'font']   # ชนิดไฟล์ที่ไม่ต้องโหลด
+}
+
+async def fetch_html(page, link, limiter, config):
+    """HTML ที่ render แล้วของหนึ่งหน้า ลองใหม่ตาม config['retries'] ก่อนส่งต่อ exception"""
+    for attempt in range(config['retries'] + 1):
+        await limiter.wait(link)
+        try:
+            response = await page.goto(link, wait_until='domcontentloaded', timeout=config['timeout_ms'])
+            if response is not None and response.status >= 400:
+                raise RuntimeError(f'HTTP {response.status}')
+            await page.wait_for_selector(config['wait_for'], timeout=config['timeout_ms'])
+            return await page.content()
+        except Exception as error:
+            if attempt == config['retries']:
+                raise
+            logger.warning('%s: %s (ลองใหม่ครั้งที่ %d)', link, error, attempt + 1)
+            await asyncio.sleep(config['backoff'] * 2 ** attempt)
+
+async def block_resources(route, resource_types):
+    if route.request.resource_type in resource_types:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def fetch_records(links, config=SCRAPER_CONFIG, browser=None, state=None, cache=None):
+    """ดึงทุกลิงก์ด้วย browser คืนข้อมูลตามลำดับ (None ถ้าดึงไม่สำเร็จ) บันทึกลง state ถ้าระบุ
+
+    ถ้าระบุ cache (HtmlCache) ใช้ HTML ที่ render ไว้แล้วของวันนี้แทนการโหลดใหม่
+    ส่ง browser มาเพื่อใช้ตัวที่เปิดไว้แล้ว (ไม่เปิด browser ถ้าทุกหน้าอยู่ในแคช)
+    """
+    if browser is None and any(cache is None or not cache.contains(link, source='browser') for link in links):
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                return await fetch_records(links, config, browser, state, cache)
+            finally:
+                await browser.close()
+
+    # pool ของ page ที่ใช้ซ้ำ จำนวน page คือจำนวนหน้าที่โหลดพร้อมกันได้
+    context = None
+    pages = asyncio.Queue()
+    if browser is not None:
+        context = await browser.new_context()
+        if config['block_resources']:
+            await context.route('**/*', lambda route: block_resources(route, config['block_resources']))
+        for _ in range(min(config['concurrency'], len(links)) or 1):
+            pages.put_nowait(await context.new_page())
+    limiter = HostRateLimiter(config['rate_per_host'])
+
+    async def load(link):
+        html = cache.get(link, source='browser') if cache is not None else None
+        if html is not None:
+            return html
+        page = await pages.get()
+        try:
+            html = await fetch_html(page, link, limiter, config)
+        finally:
+            pages.put_nowait(page)
+        if cache is not None:
+            cache.put(link, html, source='browser')
+        return html
+
+    async def scrape_one(link):
+        try:
+            html = await load(link)
+            return state.update(link, html, parse_program) if state is not None else parse_program(html)
+        except Exception as error:
+            logger.error('%s: %s', link, error)
+            if state is not None:
+                state.mark_failed(link, error)
+            return None
+
+    try:
+        return await asyncio.gather(*(scrape_one(link) for link in links))
+    finally:
+        if context is not None:
+            await context.close()
+
+async def scrape_records(links, config=SCRAPER_CONFIG, browser=None, state=None, refresh=False, cache=None):
+    """ข้อมูลของแต่ละลิงก์ตามลำดับ (None ถ้าดึงไม่สำเร็จ)
+
+    ถ้าระบุ state (CrawlState) ดึงเฉพาะลิงก์ที่ยังไม่สำเร็จ (refresh=True ตรวจทุกลิงก์ใหม่)
+    แล้วคืนข้อมูลจาก state รวมทั้งหน้าที่สำเร็จจากการรันครั้งก่อน
+    """
+    if state is None:
+        return await fetch_records(links, config, browser, cache=cache)
+    pending = state.pending(links, refresh)
+    if pending:
+        await fetch_records(pending, config, browser, state, cache)
+    return [state.record(link) for link in links]
+
+async def scrape(links, config=SCRAPER_CONFIG, browser=None, state=None, refresh=False, cache=None):
+    """DataFrame คอลัมน์เดียวกับ raw.csv ของทุกลิงก์ที่ดึงสำเร็จ"""
+    records = await scrape_records(links, config, browser, state, refresh, cache)
+    return pd.DataFrame([record for record in records if record is not None], columns=COLUMNS)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--links', default='../data/major_link.csv')
+    parser.add_argument('--output', default='raw.csv')
+    parser.add_argument('--concurrency', type=int, default=SCRAPER_CONFIG['concurrency'])
+    parser.add_argument('--rate', type=float, default=SCRAPER_CONFIG['rate_per_host'], help='request/วินาที ต่อ host')
+    parser.add_argument('--retries', type=int, default=SCRAPER_CONFIG['retries'])
+    parser.add_argument('--state', default='crawl_state.sqlite', help='ไฟล์สถานะสำหรับรันต่อจากเดิม')
+    parser.add_argument('--refresh', action='store_true', help='ตรวจทุกหน้าใหม่ แยกข้อมูลเฉพาะหน้าที่เปลี่ยน')
+    parser.add_argument('--cache', default=HTML_CACHE_CONFIG['path'], help='โฟลเดอร์แคช HTML')
+    parser.add_argument('--no-cache', action='store_true', help='ไม่อ่านและไม่เก็บ HTML ในแคช')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    config = dict(SCRAPER_CONFIG, concurrency=args.concurrency, rate_per_host=args.rate, retries=args.retries)
+    links = pd.read_csv(args.links)['link'].tolist()
+    start = time.perf_counter()
+    with CrawlState(args.state) as state, (HtmlCache(args.cache) if not args.no_cache else nullcontext()) as cache:
+        data = asyncio.run(scrape(links, config, state=state, refresh=args.refresh, cache=cache))
+    elapsed = time.perf_counter() - start
+    data.to_csv(args.output, index=False)
+    print(f'{len(data)}/{len(links)} หน้า ใน {elapsed:.1f} วินาที ({len(links) / elapsed:.1f} หน้า/วินาที)')
+
+if __name__ == '__main__':
+    main()
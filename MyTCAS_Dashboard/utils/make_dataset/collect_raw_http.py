@@ -0,0 +1,206 @@
+# collect_raw_http.py - ดึงหน้ารายละเอียดหลักสูตรด้วย HTTP client โดยไม่ใช้ browser
+#
+# รัน: python collect_raw_http.py [--links ../data/major_link.csv] [--output raw.csv] [--concurrency 32]
+#
+# ใช้ httpx.AsyncClient ตัวเดียว (keep-alive, connection pool และ HTTP/2 ถ้าติดตั้ง h2)
+# หน้าที่แยกข้อมูลจาก HTML ที่ server ส่งมาไม่ได้ (เช่น render ด้วย JavaScript) จะดึงซ้ำด้วย
+# Playwright ผ่าน collect_raw_async เฉพาะหน้านั้น ผลลัพธ์มีคอลัมน์เดียวกับ raw.csv เรียงตามลำดับลิงก์
+# ทุกหน้าบันทึกลง --state ทันทีที่เสร็จ รันซ้ำจะข้ามหน้าที่สำเร็จแล้ว --refresh ส่ง conditional GET
+# (If-None-Match/If-Modified-Since) และแยกข้อมูลใหม่เฉพาะหน้าที่เนื้อหาเปลี่ยน
+# HTML ที่ดึงมาเก็บใน --cache (html_cache.py) หน้าที่ดึงไว้แล้ววันนี้ไม่ต้อง request ใหม่
+
+import argparse
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+
+import httpx
+import pandas as pd
+from crawl_state import CrawlState
+from html_cache import HtmlCache, HTML_CACHE_CONFIG
+from program_page import COLUMNS, parse_program
+from rate_limiter import HostRateLimiter
+
+try:
+    import h2
+except ImportError:  # ไม่มี h2 ใช้ HTTP/1.1 keep-alive
+    h2 = None
+
+try:
+    import collect_raw_async
+except ImportError:  # ไม่มี playwright ใช้ได้เฉพาะ HTTP
+    collect_raw_async = None
+
+logger = logging.getLogger(__name__)
+
+HTTP_CONFIG = {
+    'concurrency': 32,         # จำนวน request พร้อมกัน (และขนาด connection pool)
+    'rate_per_host': 8.0,      # request ต่อวินาทีสูงสุดต่อ host (0 = ไม่จำกัด)
+    'retries': 3,              # จำนวนครั้งที่ลองใหม่เมื่อเครือข่ายผิดพลาดหรือได้ 429/5xx
+    'backoff': 1.0,            # วินาทีที่รอก่อนลองใหม่ (คูณสองทุกครั้ง)
+    'timeout': 30.0,           # วินาที
+    'http2': True,             # ใช้ HTTP/2 เมื่อ server รองรับ (ต้องติดตั้ง h2)
+    'fallback': True           # ใช้ Playwright กับหน้าที่แยกข้อมูลจาก HTML ไม่ได้
+}
+
+# สถานะที่ควรลองใหม่
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+def browser_config(config):
+    """config ของ Playwright สำหรับหน้าที่ต้อง render: อัตรา การลองใหม่ และ timeout เดียวกับ config ของ HTTP
+
+    จำนวน page พร้อมกันไม่เกินค่าใน SCRAPER_CONFIG (แต่ละ page ของ browser ใช้หน่วยความจำมาก)
+    """
+    base = collect_raw_async.SCRAPER_CONFIG
+    return dict(base, concurrency=min(config['concurrency'], base['concurrency']),
+                rate_per_host=config['rate_per_host'], retries=config['retries'], backoff=config['backoff'],
+                timeout_ms=int(config['timeout'] * 1000))
+
+async def fetch_page(client, link, limiter, config, headers=None):
+    """response ของหนึ่งหน้า (200 หรือ 304) ลองใหม่ตาม config['retries'] ก่อนส่งต่อ exception"""
+    for attempt in range(config['retries'] + 1):
+        await limiter.wait(link)
+        try:
+            response = await client.get(link, headers=headers)
+            if response.status_code == 304:
+                return response
+            if response.status_code not in RETRY_STATUS:
+                response.raise_for_status()
+                return response
+            error = f'HTTP {response.status_code}'
+        except httpx.TransportError as transport_error:
+            error = transport_error
+        if attempt == config['retries']:
+            raise RuntimeError(f'{error} หลังลอง {attempt + 1} ครั้ง')
+        logger.warning('%s: %s (ลองใหม่ครั้งที่ %d)', link, error, attempt + 1)
+        await asyncio.sleep(config['backoff'] * 2 ** attempt)
+
+async def scrape_records(links, config=HTTP_CONFIG, stats=None, state=None, refresh=False, cache=None):
+    """ข้อมูลของแต่ละลิงก์ตามลำดับ (None ถ้าดึงไม่สำเร็จ)
+
+    stats (dict) ถ้าระบุจะได้จำนวนหน้าที่แยกได้จาก HTTP ('http'), ผ่าน Playwright ('fallback'),
+    ที่ล้มเหลว ('failed'), ที่ข้ามเพราะสำเร็จแล้วใน state ('skipped'), ที่ server ตอบ 304 ('not_modified')
+    และที่อ่านจากแคช HTML ('cached')
+    ถ้าระบุ state (CrawlState) ดึงเฉพาะลิงก์ที่ยังไม่สำเร็จ (refresh=True ตรวจทุกลิงก์ใหม่)
+    ถ้าระบุ cache (HtmlCache) ใช้ HTML ที่ดึงไว้แล้ววันนี้แทนการ request ใหม่
+    """
+    all_links = links
+    if state is not None:
+        links = state.pending(links, refresh)
+    limiter = HostRateLimiter(config['rate_per_host'])
+    semaphore = asyncio.Semaphore(config['concurrency'])
+    limits = httpx.Limits(max_connections=config['concurrency'], max_keepalive_connections=config['concurrency'])
+    records = [None] * len(links)
+    needs_browser = {}     # ลำดับของหน้า -> error ของการแยกข้อมูลจาก HTML
+    not_modified = []
+    cached = []
+
+    async def scrape_one(client, i, link):
+        html = cache.get(link) if cache is not None else None
+        etag = last_modified = None
+        if html is None:
+            headers = state.conditional_headers(link) if state is not None else None
+            async with semaphore:
+                try:
+                    response = await fetch_page(client, link, limiter, config, headers)
+                except (httpx.HTTPError, RuntimeError) as error:
+                    logger.error('%s: %s', link, error)
+                    if state is not None:
+                        state.mark_failed(link, error)
+                    return
+            if response.status_code == 304:
+                not_modified.append(i)
+                state.mark_unchanged(link)
+                records[i] = state.record(link)
+                return
+            html = response.text
+            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+            if cache is not None:
+                cache.put(link, html)
+        else:
+            cached.append(i)
+        try:
+            if state is not None:
+                records[i] = state.update(link, html, parse_program, etag, last_modified)
+            else:
+                records[i] = parse_program(html)
+        except ValueError as error:
+            needs_browser[i] = error
+
+    async with httpx.AsyncClient(http2=config['http2'] and h2 is not None, limits=limits,
+                                 timeout=config['timeout'], follow_redirects=True) as client:
+        await asyncio.gather(*(scrape_one(client, i, link) for i, link in enumerate(links)))
+    http_count = sum(record is not None for record in records)
+
+    if needs_browser and config['fallback']:
+        if collect_raw_async is None:
+            logger.error('%d หน้าต้องใช้ Playwright แต่ไม่ได้ติดตั้ง', len(needs_browser))
+        else:
+            logger.info('ดึง %d หน้าซ้ำด้วย Playwright', len(needs_browser))
+            retry = sorted(needs_browser)
+            try:
+                # fetch_records บันทึกผลทั้งสำเร็จและล้มเหลวของทุกหน้าลง state เอง
+                rendered = await collect_raw_async.fetch_records([links[i] for i in retry], browser_config(config),
+                                                                 state=state, cache=cache)
+                for i, record in zip(retry, rendered):
+                    records[i] = record
+                needs_browser = {}
+            except Exception as error:  # เปิด browser ไม่ได้ ยังคืนผลของหน้าที่ได้จาก HTTP
+                logger.error('Playwright: %s', error)
+                reason = str(error).splitlines()[0] if str(error) else type(error).__name__
+                needs_browser = {i: f'{parse_error}; Playwright: {reason}' for i, parse_error in needs_browser.items()}
+
+    # หน้าที่แยกข้อมูลไม่ได้และไม่ได้ดึงด้วย Playwright (ปิด fallback หรือเปิด browser ไม่ได้)
+    for i, error in sorted(needs_browser.items()):
+        logger.error('%s: %s', links[i], error)
+        if state is not None:
+            state.mark_failed(links[i], error)
+
+    if stats is not None:
+        stats['http'] = http_count
+        stats['fallback'] = sum(record is not None for record in records) - http_count
+        stats['failed'] = len(links) - stats['http'] - stats['fallback']
+        stats['skipped'] = len(all_links) - len(links)
+        stats['not_modified'] = len(not_modified)
+        stats['cached'] = len(cached)
+    if state is not None:
+        return [state.record(link) for link in all_links]
+    return records
+
+async def scrape(links, config=HTTP_CONFIG, stats=None, state=None, refresh=False, cache=None):
+    """DataFrame คอลัมน์เดียวกับ raw.csv ของทุกลิงก์ที่ดึงสำเร็จ"""
+    records = await scrape_records(links, config, stats, state, refresh, cache)
+    return pd.DataFrame([record for record in records if record is not None], columns=COLUMNS)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--links', default='../data/major_link.csv')
+    parser.add_argument('--output', default='raw.csv')
+    parser.add_argument('--concurrency', type=int, default=HTTP_CONFIG['concurrency'])
+    parser.add_argument('--rate', type=float, default=HTTP_CONFIG['rate_per_host'], help='request/วินาที ต่อ host')
+    parser.add_argument('--retries', type=int, default=HTTP_CONFIG['retries'])
+    parser.add_argument('--no-fallback', action='store_true', help='ไม่ใช้ Playwright กับหน้าที่แยกข้อมูลไม่ได้')
+    parser.add_argument('--state', default='crawl_state.sqlite', help='ไฟล์สถานะสำหรับรันต่อจากเดิม')
+    parser.add_argument('--refresh', action='store_true', help='ตรวจทุกหน้าใหม่ แยกข้อมูลเฉพาะหน้าที่เปลี่ยน')
+    parser.add_argument('--cache', default=HTML_CACHE_CONFIG['path'], help='โฟลเดอร์แคช HTML')
+    parser.add_argument('--no-cache', action='store_true', help='ไม่อ่านและไม่เก็บ HTML ในแคช')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    config = dict(HTTP_CONFIG, concurrency=args.concurrency, rate_per_host=args.rate, retries=args.retries,
+                  fallback=not args.no_fallback)
+    links = pd.read_csv(args.links)['link'].tolist()
+    stats = {}
+    start = time.perf_counter()
+    with CrawlState(args.state) as state, (HtmlCache(args.cache) if not args.no_cache else nullcontext()) as cache:
+        data = asyncio.run(scrape(links, config, stats, state, args.refresh, cache))
+    elapsed = time.perf_counter() - start
+    data.to_csv(args.output, index=False)
+    fetched = len(links) - stats['skipped']
+    print(f"{len(data)}/{len(links)} หน้า ใน {elapsed:.1f} วินาที ({fetched / elapsed:.1f} หน้า/วินาที) "
+          f"HTTP {stats['http']}, Playwright {stats['fallback']}, ล้มเหลว {stats['failed']}, "
+          f"ข้าม {stats['skipped']}, ไม่เปลี่ยน (304) {stats['not_modified']}, จากแคช {stats['cached']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# crawl_state.py - สถานะการดึงข้อมูลแต่ละหน้าเก็บใน SQLite เพื่อให้รันต่อจากเดิมได้เมื่อหยุดกลางทาง
+#
+# หนึ่งแถวต่อ URL: สถานะ เวลาที่ดึง hash ของเนื้อหา ETag/Last-Modified และข้อมูลที่แยกได้
+# ทุกหน้าถูกบันทึกทันทีที่ดึงเสร็จ การรันซ้ำจึงข้ามหน้าที่เสร็จแล้ว และการ refresh
+# แยกข้อมูลใหม่เฉพาะหน้าที่เนื้อหาเปลี่ยน
+
+import hashlib
+import json
+import sqlite3
+import time
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,          -- 'done' หรือ 'failed'
+    fetched_at TEXT,               -- เวลาที่เนื้อหาเปลี่ยนครั้งล่าสุด
+    checked_at TEXT,               -- เวลาที่ตรวจครั้งล่าสุด
+    content_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    record TEXT,                   -- JSON ของข้อมูลหนึ่งแถวของ raw.csv
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0
+)
+'''
+
+def content_hash(html):
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+def now():
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
+
+class CrawlState:
+    """สถานะการดึงข้อมูลแบบ key ด้วย URL ใช้แบบ context manager หรือเรียก close() เมื่อเสร็จ"""
+
+    def __init__(self, path='crawl_state.sqlite'):
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL: บันทึกทีละหน้าได้เร็วและไฟล์ไม่เสียเมื่อ process ถูกหยุดกลางทาง
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, url):
+        """แถวของ URL เป็น dict (None ถ้ายังไม่เคยดึง)"""
+        row = self.conn.execute('SELECT * FROM pages WHERE url = ?', (url,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def done_urls(self):
+        return {row[0] for row in self.conn.execute("SELECT url FROM pages WHERE status = 'done'")}
+
+    def pending(self, links, refresh=False):
+        """ลิงก์ที่ต้องดึง (refresh=True ตรวจทุกลิงก์ใหม่) ตามลำดับเดิม ไม่ซ้ำกัน"""
+        done = set() if refresh else self.done_urls()
+        return [link for link in dict.fromkeys(links) if link not in done]
+
+    def update(self, url, html, parse, etag=None, last_modified=None):
+        """แยกข้อมูลด้วย parse(html) แล้วบันทึก ถ้าเนื้อหาเหมือนครั้งก่อนคืนข้อมูลเดิมโดยไม่แยกใหม่
+
+        exception จาก parse ถูกส่งต่อโดยไม่บันทึก
+        """
+        digest = content_hash(html)
+        previous = self.get(url)
+        if previous is not None and previous['record'] is not None and previous['content_hash'] == digest:
+            self.mark_unchanged(url, etag, last_modified)
+            return json.loads(previous['record'])
+
+        record = parse(html)
+        self.save(url, digest, record, etag, last_modified)
+        return record
+
+    def save(self, url, digest, record, etag=None, last_modified=None):
+        """บันทึกหน้าที่ดึงและแยกข้อมูลสำเร็จ"""
+        timestamp = now()
+        self.conn.execute(
+            '''INSERT INTO pages (url, status, fetched_at, checked_at, content_hash, etag, last_modified,
+                                  record, error, attempts)
+               VALUES (?, 'done', ?, ?, ?, ?, ?, ?, NULL, 1)
+               ON CONFLICT(url) DO UPDATE SET
+                   status = 'done', fetched_at = excluded.fetched_at, checked_at = excluded.checked_at,
+                   content_hash = excluded.content_hash, etag = excluded.etag,
+                   last_modified = excluded.last_modified, record = excluded.record, error = NULL,
+                   attempts = attempts + 1''',
+            (url, timestamp, timestamp, digest, etag, last_modified, json.dumps(record, ensure_ascii=False)))
+        self.conn.commit()
+
+    def mark_unchanged(self, url, etag=None, last_modified=None):
+        """หน้าเดิมไม่เปลี่ยน (HTTP 304 หรือ hash เท่าเดิม) บันทึกเฉพาะเวลาที่ตรวจ"""
+        self.conn.execute(
+            '''UPDATE pages SET checked_at = ?, etag = COALESCE(?, etag),
+                                last_modified = COALESCE(?, last_modified)
+               WHERE url = ?''',
+            (now(), etag, last_modified, url))
+        self.conn.commit()
+
+    def mark_failed(self, url, error):
+        """บันทึกหน้าที่ดึงไม่สำเร็จ (ข้อมูลเดิมของหน้าที่เคยสำเร็จยังอยู่)"""
+        self.conn.execute(
+            '''INSERT INTO pages (url, status, checked_at, error, attempts) VALUES (?, 'failed', ?, ?, 1)
+               ON CONFLICT(url) DO UPDATE SET
+                   status = CASE WHEN record IS NULL THEN 'failed' ELSE status END,
+                   checked_at = excluded.checked_at, error = excluded.error, attempts = attempts + 1''',
+            (url, now(), str(error)))
+        self.conn.commit()
+
+    def conditional_headers(self, url):
+        """header สำหรับ conditional GET ของหน้าที่เคยสำเร็จ (server ตอบ 304 ถ้าไม่เปลี่ยน)"""
+        previous = self.get(url)
+        if previous is None or previous['record'] is None:
+            return {}
+        headers = {'If-None-Match': previous['etag'], 'If-Modified-Since': previous['last_modified']}
+        return {name: value for name, value in headers.items() if value}
+
+    def record(self, url):
+        """ข้อมูลที่แยกได้ของ URL (None ถ้ายังไม่สำเร็จ)"""
+        row = self.conn.execute('SELECT record FROM pages WHERE url = ?', (url,)).fetchone()
+        return json.loads(row[0]) if row is not None and row[0] is not None else None
+
+    def records(self, links):
+        """ข้อมูลของลิงก์ที่สำเร็จแล้วตามลำดับ links (สำหรับเขียน raw.csv)"""
+        stored = {url: json.loads(record) for url, record in
+                  self.conn.execute('SELECT url, record FROM pages WHERE record IS NOT NULL')}
+        return [stored[link] for link in dict.fromkeys(links) if link in stored]
@@ -0,0 +1,253 @@
+# html_cache.py - แคช HTML ที่ดึงมาแล้วในเครื่อง บีบอัดด้วย zstd เพื่อแก้ตัวแยกข้อมูลแล้วรันซ้ำได้โดยไม่ดึงใหม่
+#
+# รัน: python html_cache.py stats
+#      python html_cache.py replay [--date 2025-01-31] [--links ../data/major_link.csv] [--output raw.csv]
+#
+# key คือ (URL, วันที่ดึง, แหล่ง) แหล่งเป็น 'http' (HTML จาก server) หรือ 'browser' (HTML ที่ render แล้ว)
+# เนื้อหาเก็บแบบ content-addressed ที่ objects/<hash[:2]>/<hash> หน้าที่เหมือนกันจึงเก็บครั้งเดียว
+# ขนาดรวมเกิน max_mb จะลบเนื้อหาที่ไม่ได้อ่านนานที่สุดก่อน (LRU)
+
+import argparse
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+try:
+    import zstandard as zstd
+except ImportError:  # ไม่มี zstandard ใช้ gzip แทน
+    zstd = None
+
+from program_page import COLUMNS, parse_program
+
+logger = logging.getLogger(__name__)
+
+HTML_CACHE_CONFIG = {
+    'path': 'html_cache',
+    'max_mb': 512,      # ขนาดรวมสูงสุดของเนื้อหาที่บีบอัดแล้ว
+    'level': 9          # ระดับการบีบอัดของ zstd (1-22)
+}
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT NOT NULL,
+    fetch_date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (url, fetch_date, source)
+);
+CREATE TABLE IF NOT EXISTS objects (
+    content_hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,         -- ไบต์หลังบีบอัด
+    raw_size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_last_access ON objects (last_access);
+'''
+
+def today():
+    return time.strftime('%Y-%m-%d')
+
+_gzip_warned = False
+
+def warn_gzip_fallback():
+    """เตือนครั้งเดียวต่อ process ว่าแคชใช้ gzip เพราะไม่ได้ติดตั้ง zstandard"""
+    global _gzip_warned
+    if not _gzip_warned:
+        _gzip_warned = True
+        logger.warning('ไม่ได้ติดตั้ง zstandard แคช HTML บีบอัดด้วย gzip แทน '
+                       '(pip install -r utils/make_dataset/requirements.txt)')
+
+class HtmlCache:
+    """แคช HTML แบบ read-through: get() ก่อนดึง ถ้าไม่มีจึงดึงแล้ว put()"""
+
+    def __init__(self, path=HTML_CACHE_CONFIG['path'], max_mb=HTML_CACHE_CONFIG['max_mb'],
+                 level=HTML_CACHE_CONFIG['level']):
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        os.makedirs(os.path.join(path, 'objects'), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(path, 'index.sqlite'))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._size = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM objects').fetchone()[0]
+        if zstd is not None:
+            self._compressor = zstd.ZstdCompressor(level=level)
+            self._decompressor = zstd.ZstdDecompressor()
+        else:
+            warn_gzip_fallback()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _object_path(self, digest):
+        return os.path.join(self.path, 'objects', digest[:2], digest)
+
+    def _read_object(self, digest, codec):
+        with open(self._object_path(digest), 'rb') as f:
+            data = f.read()
+        data = self._decompressor.decompress(data) if codec == 'zstd' else gzip.decompress(data)
+        self.conn.execute('UPDATE objects SET last_access = ? WHERE content_hash = ?', (time.time(), digest))
+        self.conn.commit()
+        return data.decode('utf-8')
+
+    def contains(self, url, date=None, source='http'):
+        return self.conn.execute(
+            'SELECT 1 FROM entries WHERE url = ? AND fetch_date = ? AND source = ?',
+            (url, date or today(), source)).fetchone() is not None
+
+    def get(self, url, date=None, source='http'):
+        """HTML ของ url ที่ดึงในวันที่ date (ค่าเริ่มต้นวันนี้) ไม่มีในแคชคืน None"""
+        row = self.conn.execute(
+            '''SELECT e.content_hash, o.codec FROM entries e JOIN objects o USING (content_hash)
+               WHERE e.url = ? AND e.fetch_date = ? AND e.source = ?''',
+            (url, date or today(), source)).fetchone()
+        if row is None:
+            return None
+        try:
+            return self._read_object(*row)
+        except FileNotFoundError:  # ไฟล์ถูกลบนอกแคช
+            return None
+
+    def put(self, url, html, date=None, source='http'):
+        """เก็บ HTML ของ url (แทนที่ของเดิมของวันเดียวกัน) คืน hash ของเนื้อหา"""
+        raw = html.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        stored = self.conn.execute('SELECT size FROM objects WHERE content_hash = ?', (digest,)).fetchone()
+        if stored is None or not os.path.exists(self._object_path(digest)):
+            codec = 'zstd' if zstd is not None else 'gzip'
+            data = self._compressor.compress(raw) if codec == 'zstd' else gzip.compress(raw)
+            os.makedirs(os.path.dirname(self._object_path(digest)), exist_ok=True)
+            # เขียนไฟล์ชั่วคราวแล้วเปลี่ยนชื่อ ไฟล์จึงไม่เสียถ้าหยุดกลางทาง
+            temp_path = self._object_path(digest) + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._object_path(digest))
+            self.conn.execute(
+                'INSERT OR REPLACE INTO objects (content_hash, codec, size, raw_size, last_access) VALUES (?, ?, ?, ?, ?)',
+                (digest, codec, len(data), len(raw), time.time()))
+            self._size += len(data) - (stored[0] if stored is not None else 0)
+        else:
+            self.conn.execute('UPDATE objects SET last_access = ? WHERE content_hash = ?', (time.time(), digest))
+        self.conn.execute(
+            'INSERT OR REPLACE INTO entries (url, fetch_date, source, content_hash, fetched_at) VALUES (?, ?, ?, ?, ?)',
+            (url, date or today(), source, digest, time.time()))
+        self.conn.commit()
+        self.evict()
+        return digest
+
+    def size(self):
+        """ขนาดรวมของเนื้อหาหลังบีบอัด (ไบต์)"""
+        return self._size
+
+    def evict(self):
+        """ลบเนื้อหาที่ไม่ได้อ่านนานที่สุดจนขนาดรวมไม่เกิน max_bytes คืนจำนวนที่ลบ"""
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return 0
+        removed = []
+        for digest, size in self.conn.execute('SELECT content_hash, size FROM objects ORDER BY last_access'):
+            if excess <= 0:
+                break
+            removed.append(digest)
+            excess -= size
+            self._size -= size
+        for digest in removed:
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+        self.conn.executemany('DELETE FROM entries WHERE content_hash = ?', [(d,) for d in removed])
+        self.conn.executemany('DELETE FROM objects WHERE content_hash = ?', [(d,) for d in removed])
+        self.conn.commit()
+        return len(removed)
+
+    def latest(self, date=None, links=None):
+        """(url, HTML) ล่าสุดของแต่ละ URL (ถึงวันที่ date ถ้าระบุ) เลือก HTML ที่ render แล้วก่อนถ้ามี
+
+        เรียงตาม links ถ้าระบุ (ข้าม URL ที่ไม่มีในแคช) มิฉะนั้นเรียงตามเวลาที่ URL ถูกเก็บครั้งแรก
+        """
+        rows = self.conn.execute(
+            '''SELECT e.url, e.content_hash, o.codec, e.fetched_at FROM entries e JOIN objects o USING (content_hash)
+               WHERE e.fetch_date <= ?
+               ORDER BY e.url, e.fetch_date DESC, e.source = 'browser' DESC''',
+            (date or '9999-12-31',)).fetchall()
+        best, first_seen = {}, {}
+        for url, digest, codec, fetched_at in rows:
+            best.setdefault(url, (digest, codec))
+            first_seen[url] = min(fetched_at, first_seen.get(url, fetched_at))
+        if links is None:
+            urls = sorted(best, key=first_seen.get)
+        else:
+            urls = [link for link in dict.fromkeys(links) if link in best]
+        for url in urls:
+            try:
+                yield url, self._read_object(*best[url])
+            except FileNotFoundError:
+                continue
+
+    def replay(self, parse=parse_program, date=None, links=None):
+        """แยกข้อมูลจาก HTML ในแคชโดยไม่ดึงใหม่ เรียงตาม links ถ้าระบุ (ลำดับเดียวกับการดึงจริง)
+
+        คืน (list ของ (url, ข้อมูล), list ของ (url, error))
+        """
+        records, errors = [], []
+        for url, html in self.latest(date, links):
+            try:
+                records.append((url, parse(html)))
+            except Exception as error:
+                errors.append((url, error))
+        return records, errors
+
+    def stats(self):
+        entries = self.conn.execute('SELECT COUNT(*), COUNT(DISTINCT url) FROM entries').fetchone()
+        objects = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) FROM objects').fetchone()
+        return {'entries': entries[0], 'urls': entries[1], 'objects': objects[0],
+                'bytes': objects[1], 'raw_bytes': objects[2]}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=['stats', 'replay'])
+    parser.add_argument('--cache', default=HTML_CACHE_CONFIG['path'])
+    parser.add_argument('--date', help='ใช้หน้าที่ดึงไม่เกินวันที่นี้ (YYYY-MM-DD)')
+    parser.add_argument('--links', default='../data/major_link.csv',
+                        help='CSV ที่มีคอลัมน์ link ใช้เลือกและเรียงหน้าแบบเดียวกับการดึงจริง ("" = ทุกหน้าในแคช)')
+    parser.add_argument('--output', default='raw.csv')
+    args = parser.parse_args()
+
+    with HtmlCache(args.cache) as cache:
+        if args.command == 'stats':
+            stats = cache.stats()
+            ratio = stats['raw_bytes'] / stats['bytes'] if stats['bytes'] else 0
+            print(f"{stats['urls']} URL, {stats['entries']} รายการ, {stats['objects']} เนื้อหา, "
+                  f"{stats['bytes'] / 1024 / 1024:.1f} MB (บีบอัด {ratio:.1f} เท่า)")
+            return
+
+        links = list(dict.fromkeys(pd.read_csv(args.links)['link'])) if args.links else None
+        start = time.perf_counter()
+        records, errors = cache.replay(date=args.date, links=links)
+        elapsed = time.perf_counter() - start
+        for url, error in errors:
+            print(f'{url}: {error}')
+        pd.DataFrame([record for _, record in records], columns=COLUMNS).to_csv(args.output, index=False)
+        print(f'{len(records)} หน้า ใน {elapsed:.2f} วินาที ({(len(records) + len(errors)) / elapsed:.0f} หน้า/วินาที), '
+              f'ล้มเหลว {len(errors)}')
+        if links is not None and len(records) + len(errors) < len(links):
+            print(f'ไม่มีในแคช {len(links) - len(records) - len(errors)} ลิงก์')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+# program_page.py - แยกข้อมูลหลักสูตรจาก HTML หน้ารายละเอียดของ course.mytcas.com
+#
+# ใช้ร่วมกันระหว่าง collect_raw.py (ทีละหน้า) และ collect_raw_async.py (หลายหน้าพร้อมกัน)
+
+import bs4 as bs
+
+# คอลัมน์ของ raw.csv ตามลำดับเดิม
+COLUMNS = ['มหาวิทยาลัย', 'หลักสูตร', 'หลักสูตรEng', 'ประเภทหลักสูตร', 'วิทยาเขต', 'ค่าใช้จ่าย', 'คณะ', 'สาขา']
+
+# หัวข้อ dt ในหน้าเว็บ -> คอลัมน์
+DETAIL_COLUMNS = {
+    'ชื่อหลักสูตร': 'หลักสูตร',
+    'ชื่อหลักสูตรภาษาอังกฤษ': 'หลักสูตรEng',
+    'ประเภทหลักสูตร': 'ประเภทหลักสูตร',
+    'วิทยาเขต': 'วิทยาเขต',
+    'ค่าใช้จ่าย': 'ค่าใช้จ่าย'
+}
+
+# สร้าง tree เฉพาะ span และ dl (ส่วนอื่นของหน้าไม่ได้ใช้) แยกข้อมูลได้เร็วขึ้นราวสองเท่า
+PARSE_ONLY = bs.SoupStrainer(['span', 'dl'])
+
+def parse_program(html):
+    """ข้อมูลหนึ่งแถวของ raw.csv จาก HTML ที่ render แล้ว (ValueError ถ้าไม่ใช่หน้าหลักสูตร)"""
+    soup = bs.BeautifulSoup(html, 'html.parser', parse_only=PARSE_ONLY)
+    span = soup.find('span', class_='name')
+    dl = soup.find('dl')
+    if span is None or dl is None or span.find('small') is None:
+        raise ValueError('ไม่พบข้อมูลหลักสูตรในหน้า')
+
+    name = span.find('a').text
+    major, specific = span.find('small').find_all('a')[:2]
+    data = dict.fromkeys(COLUMNS, '')
+    data.update({
+        'มหาวิทยาลัย': name.strip(),
+        'คณะ': major.text.strip(),
+        'สาขา': specific.text.strip()
+    })
+
+    # วนลูปดู dt และ dd คู่กัน
+    for dt, dd in zip(dl.find_all('dt'), dl.find_all('dd')):
+        column = DETAIL_COLUMNS.get(dt.get_text(strip=True))
+        if column is not None:
+            data[column] = dd.get_text(strip=True)
+
+    return data
@@ -0,0 +1,23 @@
+# rate_limiter.py - จำกัดจำนวน request ต่อวินาทีต่อ host สำหรับตัวดึงข้อมูลแบบ asyncio
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+class HostRateLimiter:
+    """เว้นระยะ request ไปยัง host เดียวกันอย่างน้อย 1 / rate วินาที"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next = {}
+        self._locks = {}
+
+    async def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        async with self._locks.setdefault(host, asyncio.Lock()):
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+        await asyncio.sleep(start - now)
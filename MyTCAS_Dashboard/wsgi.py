@@ -0,0 +1,15 @@
+# wsgi.py - entry point สำหรับ production server
+#
+# รัน: gunicorn -c gunicorn.conf.py wsgi:server
+#
+# gunicorn.conf.py เปิด preload_app ข้อมูล ดัชนี และแคชจึงถูกสร้างครั้งเดียวใน master
+# แล้ว worker ที่ fork ออกมาใช้หน่วยความจำร่วมกันแบบ copy-on-write
+
+import os
+
+# path ใน DATA_CONFIG เป็น path สัมพัทธ์กับโฟลเดอร์ของแอป
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app
+
+server = app.server